@@ -238,6 +238,8 @@ class MqttThread(QThread):
                     final_screen_timer_idle = int(message) * 1000
                 except ValueError:
                     logger.warning(f"  Invalid final timer value: {message}")
+            elif topic.startswith("FalconGrasp/camera/") and topic.endswith("/health"):
+                self.handle_camera_health(message)
             else:
                 # Handle data messages for camera topics
                 if self.subscribed:
@@ -245,6 +247,18 @@ class MqttThread(QThread):
         except Exception as e:
             logger.warning(f"  Error processing MQTT message: {e}")
     
+    def handle_camera_health(self, message):
+        """Warn the operator when a detection camera stream is not healthy"""
+        try:
+            health = json.loads(message)
+            if health['state'] == "streaming":
+                logger.info(f" Camera {health['camera']} streaming")
+            else:
+                logger.warning(f"  Camera {health['camera']} stream {health['state']} "
+                               f"(last frame {health['last_frame_age']}s ago, {health['reconnects']} reconnects)")
+        except (ValueError, KeyError) as e:
+            logger.warning(f"  Invalid camera health message: {e}")
+
     def handle_data_message(self, msg):
         """Handle data messages from camera topics"""
         try:
@@ -2466,6 +2480,18 @@ class Active_screen(QWidget):
     #     except Exception as e:
     #         logger.warning(f"  Error in media status check: {e}")
     
+    def parse_camera_score(self, message):
+        """Score from a camera message: a plain integer or the detector's JSON payload"""
+        try:
+            return int(message)
+        except ValueError:
+            payload = json.loads(message)
+            if 'sent_time' in payload:
+                logger.debug(f"Camera {payload['camera']} score latency: {(time.time() - payload['sent_time']) * 1000:.0f} ms"
+                             + (f" ({(time.time() - payload['frame_time']) * 1000:.0f} ms since frame)"
+                                if 'frame_time' in payload else ""))
+            return int(payload['score'])
+
     def ReceiveData(self, data):
         """Process FalconGrasp detection data from MQTT"""
         try:
@@ -2479,7 +2505,7 @@ class Active_screen(QWidget):
                 if len(topic_parts) >= 3:
                     try:
                         index = int(topic_parts[2])
-                        score = int(message)
+                        score = self.parse_camera_score(message)
                         
                         if 0 <= index < 5:  # Valid player index (0-4)
                             global list_players_score
@@ -74,7 +74,8 @@ class MQTTConfig:
                 "FalconGrasp/game/timer",
                 "FalconGrasp/game/Activate",
                 "FalconGrasp/game/Deactivate",
-                "FalconGrasp/game/timerfinal"
+                "FalconGrasp/game/timerfinal",
+                "FalconGrasp/camera/+/health"  # Stream state of each detection camera
             ]
 
 
@@ -0,0 +1,104 @@
+#!/usr/bin/env python3
+"""
+Batched detection benchmark (DETECTION_BACKEND = "batch")
+
+Renders one synthetic scene per camera, crops it like the live game and times one
+detection tick for all cameras:
+- per-thread: every camera runs its own detection, concurrently as the camera threads do
+- batch: the crops are copied into one stacked frame and detected in a single pass
+(detection/batch.py). Reports milliseconds per tick and CPU milliseconds per tick, and how
+often the batch finds the same colors as the per-camera detection.
+
+Usage:
+    python batch_benchmark.py --cameras 1 3 5 --resolution 1920x1080 --crop 450 370 820 900
+"""
+
+import argparse
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from detection.batch import StackedFrames, detect_stacked
+from detection.color_detector import standard_detections
+from detection.prefilter import BASELINE_PREFILTER, PREFILTERS, get_prefilter
+from detection.roi import ROIConfig
+from detection.synthetic import SceneConfig, SyntheticScene
+from pyCatch1_2025 import color_table
+
+import cv2
+
+
+def camera_crops(cameras, width, height, crop, scale, frames, seed=0):
+    """Per tick, the list of analysis crops of every camera"""
+    roi = ROIConfig(crop=tuple(crop), scale=scale)
+    scenes = [SyntheticScene(SceneConfig(width=width, height=height, sticks=len(color_table), appear_interval=0.2,
+                                         seed=seed + index), color_table).frames(frames)
+              for index in range(cameras)]
+    return [[roi.apply(frame)[0] for frame in tick] for tick in zip(*scenes)]
+
+
+def detect_one(crop, prefilter, scale):
+    """The per-thread path of one camera"""
+    hsv_frame = cv2.cvtColor(get_prefilter(prefilter)(crop), cv2.COLOR_BGR2HSV)
+    return standard_detections(hsv_frame, color_table, scale)
+
+
+def seen_colors(results):
+    return {color_name for color_name, objects in results if objects}
+
+
+def run(ticks, prefilter, scale):
+    """Time both paths over the same ticks, returns a dict of per-tick costs and the agreement"""
+    cameras = len(ticks[0])
+    pool = ThreadPoolExecutor(cameras)
+    frames = StackedFrames()
+    thread_wall = thread_cpu = batch_wall = batch_cpu = 0.0
+    agree = 0
+    for crops in ticks:
+        wall, cpu = time.perf_counter(), time.process_time()
+        per_thread = list(pool.map(lambda crop: detect_one(crop, prefilter, scale), crops))
+        thread_wall += time.perf_counter() - wall
+        thread_cpu += time.process_time() - cpu
+
+        wall, cpu = time.perf_counter(), time.process_time()
+        for key, crop in enumerate(crops):
+            if not frames.fits(key, crop.shape):
+                frames.layout(key, crop.shape)
+            frames.view(key)[:] = crop
+        batched = detect_stacked(frames, range(cameras), color_table, scale=scale, prefilter=prefilter)
+        batch_wall += time.perf_counter() - wall
+        batch_cpu += time.process_time() - cpu
+
+        agree += sum(seen_colors(per_thread[key]) == seen_colors(batched[key]) for key in range(cameras))
+    pool.shutdown()
+    count = len(ticks)
+    return {
+        'thread_ms': thread_wall / count * 1000, 'thread_cpu_ms': thread_cpu / count * 1000,
+        'batch_ms': batch_wall / count * 1000, 'batch_cpu_ms': batch_cpu / count * 1000,
+        'agreement': agree / (count * cameras),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Compare per-thread and batched detection per tick')
+    parser.add_argument('--cameras', type=int, nargs='+', default=[1, 3, 5], help='Camera counts to compare')
+    parser.add_argument('--resolution', default='1920x1080', help='WIDTHxHEIGHT of every camera')
+    parser.add_argument('--crop', type=int, nargs=4, default=(450, 370, 820, 900), metavar=('X0', 'Y0', 'X1', 'Y1'))
+    parser.add_argument('--scale', type=float, default=1.0, help='Analysis scale (ANALYSIS_SCALE)')
+    parser.add_argument('--prefilter', choices=sorted(PREFILTERS), default=BASELINE_PREFILTER)
+    parser.add_argument('--ticks', type=int, default=50, help='Detection ticks per camera count')
+    args = parser.parse_args()
+
+    width, height = (int(v) for v in args.resolution.lower().split('x'))
+    print(f"{'cameras':>7}  {'thread ms':>9}  {'cpu ms':>7}  {'batch ms':>8}  {'cpu ms':>7}  {'speed-up':>8}  {'agree':>6}")
+    for cameras in args.cameras:
+        ticks = camera_crops(cameras, width, height, args.crop, args.scale, args.ticks)
+        result = run(ticks, args.prefilter, args.scale)
+        print(f"{cameras:>7}  {result['thread_ms']:>9.2f}  {result['thread_cpu_ms']:>7.2f}  "
+              f"{result['batch_ms']:>8.2f}  {result['batch_cpu_ms']:>7.2f}  "
+              f"{result['thread_ms'] / result['batch_ms']:>7.2f}x  {result['agreement']:>6.1%}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -9,6 +9,19 @@ from PyQt5.QtWidgets import (QApplication, QMainWindow, QLabel, QSlider, QVBoxLa
 from PyQt5.QtCore import Qt
 from PyQt5.QtGui import QImage, QPixmap, QFont
 
+from detection.blobs import get_blob_finder
+from detection.calibration import CALIBRATION_FILE, CalibrationStore
+from detection.color_table import ColorTable
+from detection.limits_file import LIMITS_FILE, latest_ranges
+from detection.roi import TOOL_ROI, format_roi_savings, measure_roi_savings
+
+# Print a one-off full-frame vs ROI timing on the first frame (three extra full-frame bilateral passes)
+REPORT_ROI_SAVINGS = False
+
+# Blob extraction: "contours" or "components" (connectedComponentsWithStats, see detection/blobs.py)
+BLOB_METHOD = "contours"
+MAX_ASPECT_RATIO = 10  # Avoid very thin/long objects
+
 class CalibratedColorDetector(QMainWindow):
     def __init__(self):
         super().__init__()
@@ -53,6 +66,7 @@ class CalibratedColorDetector(QMainWindow):
         self.frame_height = None
         self.is_paused = False
         self.paused_frame = None
+        self.roi_reported = False
         # hsv values
 
         # WHITEHSV LIMITS: WHITE
@@ -144,7 +158,8 @@ class CalibratedColorDetector(QMainWindow):
         self.detected_objects = {}
         self.total_objects = 0
         
-        # Try to load updated calibrated ranges from file
+        # Compile the default ranges, then try to load updated calibrated ranges from file
+        self.compile_color_table()
         self.load_calibrated_ranges_from_file()
 
         # Start timer for video processing
@@ -494,6 +509,13 @@ class CalibratedColorDetector(QMainWindow):
             else:
                 print("Error: Could not read frame")
                 return
+        if REPORT_ROI_SAVINGS and not self.roi_reported:
+            print(f"ROI timing: {format_roi_savings(measure_roi_savings(frame, TOOL_ROI))}")
+            self.roi_reported = True
+
+        # Crop to the shared play area first so the filter and conversions only touch the ROI
+        frame, _ = TOOL_ROI.apply(frame)
+
         # Apply bilateral filter for noise reduction while preserving edges
         if ret:
             frame = cv2.bilateralFilter(frame, d=9, sigmaColor=75, sigmaSpace=75)
@@ -516,6 +538,13 @@ class CalibratedColorDetector(QMainWindow):
         self.display_image(self.mask_label, mask)
         self.display_image(self.result_label, result)
 
+    def compile_color_table(self):
+        """Rebuild the compiled color table after the calibrated ranges or area limits change"""
+        # Colors without their own area limits fall back to the current slider values
+        self.color_table = ColorTable(self.calibrated_colors, self.color_bgr_map,
+                                      area_min=self.area_min_slider.value(),
+                                      area_max=self.area_max_slider.value())
+
     def detect_colors(self, frame):
         """Main color detection function using calibrated ranges"""
         method_id = self.detection_method_group.checkedId()
@@ -527,72 +556,49 @@ class CalibratedColorDetector(QMainWindow):
         combined_mask = np.zeros(frame.shape[:2], dtype=np.uint8)
         result_frame = frame.copy()
         detections = {}
+        # Bounds and kernel come precompiled from the color table
+        kernel = self.color_table.kernel()
+        find_blobs = get_blob_finder(BLOB_METHOD)
         
-        for color_name, ranges in self.calibrated_colors.items():
-            color_mask = np.zeros(frame.shape[:2], dtype=np.uint8)
+        for entry in self.color_table:
+            color_name = entry.name
             
             if method_id == 0:  # LAB only
-                lab_lower = np.array(ranges['lab'][0])
-                lab_upper = np.array(ranges['lab'][1])
-                color_mask = cv2.inRange(lab_frame, lab_lower, lab_upper)
+                color_mask = cv2.inRange(lab_frame, entry.lab_lower, entry.lab_upper)
                 
             elif method_id == 1:  # HSV only
-                hsv_lower = np.array(ranges['hsv'][0])
-                hsv_upper = np.array(ranges['hsv'][1])
-                color_mask = cv2.inRange(hsv_frame, hsv_lower, hsv_upper)
+                color_mask = cv2.inRange(hsv_frame, entry.hsv_lower, entry.hsv_upper)
                 
-            elif method_id == 2:  # Hybrid HSV+LAB
+            else:  # Hybrid HSV+LAB
                 # Create masks from both color spaces
-                lab_lower = np.array(ranges['lab'][0])
-                lab_upper = np.array(ranges['lab'][1])
-                hsv_lower = np.array(ranges['hsv'][0])
-                hsv_upper = np.array(ranges['hsv'][1])
-                
-                lab_mask = cv2.inRange(lab_frame, lab_lower, lab_upper)
-                hsv_mask = cv2.inRange(hsv_frame, hsv_lower, hsv_upper)
+                lab_mask = cv2.inRange(lab_frame, entry.lab_lower, entry.lab_upper)
+                hsv_mask = cv2.inRange(hsv_frame, entry.hsv_lower, entry.hsv_upper)
                 
                 # Combine masks (intersection for precision)
                 color_mask = cv2.bitwise_and(lab_mask, hsv_mask)
             
             # Clean up the mask
-            kernel = cv2.getStructuringElement(cv2.MORPH_ELLIPSE, (9, 9))
             # color_mask = cv2.morphologyEx(color_mask, cv2.MORPH_OPEN, kernel)
             color_mask = cv2.morphologyEx(color_mask, cv2.MORPH_CLOSE, kernel)
             
-            # Find and count objects
-            contours, _ = cv2.findContours(color_mask, cv2.RETR_EXTERNAL, cv2.CHAIN_APPROX_SIMPLE)
+            # Find and count objects (area limits and aspect ratio filtered by the blob finder)
+            objects = find_blobs(color_mask, entry.area_min, entry.area_max, max_aspect=MAX_ASPECT_RATIO)
             
-            object_count = 0
-            for contour in contours:
-                area = cv2.contourArea(contour)
+            for x, y, w, h, area in objects:
+                aspect_ratio = max(w, h) / min(w, h)
                 
-                # Get area limits for this color (with fallback to global limits)
-                color_info = self.calibrated_colors.get(color_name, {})
-                area_min = color_info.get('area_min', self.area_min_slider.value())
-                area_max = color_info.get('area_max', self.area_max_slider.value())
+                # Draw detection on result frame
+                color_bgr = entry.display_bgr
                 
-                # Apply area filtering
-                if area_min <= area <= area_max:
-                    # Calculate additional shape metrics
-                    x, y, w, h = cv2.boundingRect(contour)
-                    aspect_ratio = max(w, h) / min(w, h) if min(w, h) > 0 else 0
-                    
-                    # Filter by aspect ratio for more realistic objects
-                    if aspect_ratio < 10:  # Avoid very thin/long objects
-                        object_count += 1
-                        
-                        # Draw detection on result frame
-                        color_bgr = self.color_bgr_map.get(color_name, (255, 255, 255))
-                        
-                        cv2.rectangle(result_frame, (x, y), (x + w, y + h), color_bgr, 2)
-                        cv2.putText(result_frame, f"{color_name.replace('_', ' ').title()}", 
-                                   (x, y - 10), cv2.FONT_HERSHEY_SIMPLEX, 0.6, color_bgr, 2)
-                        
-                        # Add area and aspect ratio info
-                        cv2.putText(result_frame, f"A:{int(area)} R:{aspect_ratio:.1f}", 
-                                   (x, y + h + 20), cv2.FONT_HERSHEY_SIMPLEX, 0.4, color_bgr, 1)
+                cv2.rectangle(result_frame, (x, y), (x + w, y + h), color_bgr, 2)
+                cv2.putText(result_frame, f"{color_name.replace('_', ' ').title()}", 
+                           (x, y - 10), cv2.FONT_HERSHEY_SIMPLEX, 0.6, color_bgr, 2)
+                
+                # Add area and aspect ratio info
+                cv2.putText(result_frame, f"A:{int(area)} R:{aspect_ratio:.1f}", 
+                           (x, y + h + 20), cv2.FONT_HERSHEY_SIMPLEX, 0.4, color_bgr, 1)
             
-            detections[color_name] = object_count
+            detections[color_name] = len(objects)
             combined_mask = cv2.bitwise_or(combined_mask, color_mask)
         
         return combined_mask, result_frame, detections
@@ -767,82 +773,40 @@ class CalibratedColorDetector(QMainWindow):
             
             print(f"Recording saved: {self.recording_filename}")
 
+    def load_calibration_profile(self):
+        """Load the active profile of the calibration store, False when there is none"""
+        store = CalibrationStore(CALIBRATION_FILE)
+        if not store.exists():
+            return False
+        try:
+            name, version, colors = store.profile()
+        except (KeyError, ValueError, OSError) as e:
+            print(f"❌ Calibration profile not loaded: {e}")
+            return False
+        for ranges in colors.values():
+            ranges.setdefault('area_min', 500)  # Default area limits, as for the text file
+            ranges.setdefault('area_max', 50000)
+        self.calibrated_colors = colors
+        self.compile_color_table()
+        print(f"✅ Loaded calibration profile '{name}' (version {version}) from {CALIBRATION_FILE}:")
+        for color in colors.keys():
+            print(f"  - {color.replace('_', ' ').title()}")
+        return True
+
     def load_calibrated_ranges_from_file(self):
-        """Load calibrated color ranges from all_detection_limits.txt"""
+        """Load calibrated color ranges from the active calibration profile, else from all_detection_limits.txt"""
+        if self.load_calibration_profile():
+            return True
         try:
-            with open("all_detection_limits.txt", "r") as file:
-                content = file.read()
-                
-            # Parse the file and extract the latest ranges for each color
-            sessions = content.split("========================================")
-            color_ranges = {}
-            
-            for session in sessions:
-                if "DETECTION SESSION:" in session and "HSV LIMITS:" in session:
-                    lines = session.strip().split('\n')
-                    
-                    # Extract color name (last non-empty line before separator)
-                    color_name = None
-                    for line in reversed(lines):
-                        line = line.strip()
-                        if (line and not line.startswith("DETECTION") and 
-                            not line.startswith("HSV") and not line.startswith("LAB") and 
-                            "Lower:" not in line and "Upper:" not in line and 
-                            "No detection" not in line and "Total Sticks" not in line):
-                            color_name = line.lower().replace(' ', '_')
-                            break
-                    
-                    if color_name:
-                        # Extract HSV and LAB values
-                        hsv_values = {}
-                        lab_values = {}
-                        
-                        for line in lines:
-                            if "H Lower:" in line:
-                                parts = line.split(',')
-                                hsv_values['h_lower'] = int(parts[0].split(':')[1].strip())
-                                hsv_values['h_upper'] = int(parts[1].split(':')[1].strip())
-                            elif "S Lower:" in line:
-                                parts = line.split(',')
-                                hsv_values['s_lower'] = int(parts[0].split(':')[1].strip())
-                                hsv_values['s_upper'] = int(parts[1].split(':')[1].strip())
-                            elif "V Lower:" in line:
-                                parts = line.split(',')
-                                hsv_values['v_lower'] = int(parts[0].split(':')[1].strip())
-                                hsv_values['v_upper'] = int(parts[1].split(':')[1].strip())
-                            elif "L Lower:" in line:
-                                parts = line.split(',')
-                                lab_values['l_lower'] = int(parts[0].split(':')[1].strip())
-                                lab_values['l_upper'] = int(parts[1].split(':')[1].strip())
-                            elif "A Lower:" in line:
-                                parts = line.split(',')
-                                lab_values['a_lower'] = int(parts[0].split(':')[1].strip())
-                                lab_values['a_upper'] = int(parts[1].split(':')[1].strip())
-                            elif "B Lower:" in line:
-                                parts = line.split(',')
-                                lab_values['b_lower'] = int(parts[0].split(':')[1].strip())
-                                lab_values['b_upper'] = int(parts[1].split(':')[1].strip())
-                        
-                        if len(hsv_values) == 6 and len(lab_values) == 6:
-                            # Convert LAB A,B values back to 0-255 range for OpenCV
-                            lab_a_lower = lab_values['a_lower'] + 127
-                            lab_a_upper = lab_values['a_upper'] + 127
-                            lab_b_lower = lab_values['b_lower'] + 127
-                            lab_b_upper = lab_values['b_upper'] + 127
-                            lab_l_lower = int(lab_values['l_lower'] * 2.55)
-                            lab_l_upper = int(lab_values['l_upper'] * 2.55)
-                            
-                            color_ranges[color_name] = {
-                                'hsv': ((hsv_values['h_lower'], hsv_values['s_lower'], hsv_values['v_lower']),
-                                       (hsv_values['h_upper'], hsv_values['s_upper'], hsv_values['v_upper'])),
-                                'lab': ((lab_l_lower, lab_a_lower, lab_b_lower),
-                                       (lab_l_upper, lab_a_upper, lab_b_upper)),
-                                'area_min': 500,  # Default area limits
-                                'area_max': 50000
-                            }
+            # Latest complete ranges per color, indexed once and re-read only when the file changes
+            color_ranges = latest_ranges(LIMITS_FILE)
+            for ranges in color_ranges.values():
+                ranges['area_min'] = 500  # Default area limits
+                ranges['area_max'] = 50000
             
             if color_ranges:
                 self.calibrated_colors = color_ranges
+                self.compile_color_table()
                 print(f"✅ Loaded {len(color_ranges)} calibrated color ranges:")
                 for color in color_ranges.keys():
                     print(f"  - {color.replace('_', ' ').title()}")
@@ -906,6 +870,7 @@ COLOR BREAKDOWN:
         for color_name in self.calibrated_colors.keys():
             self.calibrated_colors[color_name]['area_min'] = min_area
             self.calibrated_colors[color_name]['area_max'] = max_area
+        self.compile_color_table()
         
         print(f"✅ Applied area limits: {min_area} - {max_area} to all colors")
 
@@ -1,9 +1,14 @@
 import sys
 import cv2
-import numpy as np
 from PyQt5 import QtWidgets, QtGui
 from PyQt5.QtCore import QThread, pyqtSignal
 
+from detection.color_table import ColorTable
+from detection.roi import TOOL_ROI, format_roi_savings, measure_roi_savings
+
+# Print a one-off full-frame vs ROI timing on the first frame (three extra full-frame bilateral passes)
+REPORT_ROI_SAVINGS = False
+
 # Define color ranges for detection
 # H Lower: 94, H Upper: 111, S Lower: 141, S Upper: 204, V Lower: 21, V Upper: 255
 # H Lower: 125, H Upper: 162, S Lower: 77, S Upper: 255, V Lower: 90, V Upper: 255
@@ -34,6 +39,14 @@ colors = {
     "purple": ((133,80,0),(144,255,255))
 }
 
+# Bounds compiled once instead of on every frame
+color_table = ColorTable.from_hsv_ranges(colors)
+
+# The contour area threshold was tuned on full frames resized to TUNED_SIZE. It is rescaled to the
+# native resolution of the ROI crop (and TOOL_ROI.scale) so the same sticks are detected.
+MIN_CONTOUR_AREA = 1500
+TUNED_SIZE = (640, 480)
+
 class VideoCaptureWorker(QThread):
     frame_ready = pyqtSignal(QtGui.QImage)  # Signal to send the frame to the main thread
 
@@ -44,6 +57,7 @@ class VideoCaptureWorker(QThread):
 
     def run(self):
         cap = cv2.VideoCapture(self.rtsp_url)
+        roi_reported = False
 
         while self.running:
             ret, frame = cap.read()
@@ -53,9 +67,17 @@ class VideoCaptureWorker(QThread):
                 cap = cv2.VideoCapture(self.rtsp_url)
                 continue
 
-            # Resize frame for faster processing
-            frame = cv2.resize(frame, (640, 480))  # Adjust size as needed
-            processed_frame = self.detect_custom_colors(frame)
+            if REPORT_ROI_SAVINGS and not roi_reported:
+                print(f"ROI timing: {format_roi_savings(measure_roi_savings(frame, TOOL_ROI))}")
+                roi_reported = True
+
+            # Same share of the view as MIN_CONTOUR_AREA at TUNED_SIZE
+            min_area = (MIN_CONTOUR_AREA * (frame.shape[1] / TUNED_SIZE[0]) * (frame.shape[0] / TUNED_SIZE[1])
+                        * TOOL_ROI.scale ** 2)
+
+            # Crop to the shared play area (and analysis scale) before color conversion
+            frame, _ = TOOL_ROI.apply(frame)
+            processed_frame = self.detect_custom_colors(frame, min_area)
 
             # Convert the frame to RGB format for Qt
             rgb_frame = cv2.cvtColor(processed_frame, cv2.COLOR_BGR2RGB)
@@ -68,12 +90,13 @@ class VideoCaptureWorker(QThread):
 
         cap.release()
 
-    def detect_custom_colors(self, frame):
+    def detect_custom_colors(self, frame, min_area=MIN_CONTOUR_AREA):
         hsv_frame = cv2.cvtColor(frame, cv2.COLOR_BGR2HSV)
         detected_colors = set()
 
-        for color_name, (lower, upper) in colors.items():
-            mask = cv2.inRange(hsv_frame, np.array(lower), np.array(upper))
+        for entry in color_table:
+            color_name = entry.name
+            mask = cv2.inRange(hsv_frame, entry.hsv_lower, entry.hsv_upper)
             
             # Find contours in the mask
             contours, _ = cv2.findContours(mask, cv2.RETR_EXTERNAL, cv2.CHAIN_APPROX_SIMPLE)
@@ -95,7 +118,7 @@ class VideoCaptureWorker(QThread):
 
             for contour in contours:
                 area = cv2.contourArea(contour)
-                if area > 1500 :  # Only consider contours with area greater than 200
+                if area > min_area:  # Only consider contours above the rescaled area threshold
                     detected_colors.add(color_name)  # Add color to detected colors
                     # Draw the contour on the original frame
                     print(f"{color_name} area {area}")
@@ -1,9 +1,14 @@
 import sys
 import cv2
-import numpy as np
 from PyQt5 import QtWidgets, QtGui
 from PyQt5.QtCore import QThread, pyqtSignal
 
+from detection.color_table import ColorTable
+from detection.roi import TOOL_ROI, format_roi_savings, measure_roi_savings
+
+# Print a one-off full-frame vs ROI timing on the first frame (three extra full-frame bilateral passes)
+REPORT_ROI_SAVINGS = False
+
 # Define color ranges for detection
 # H Lower: 94, H Upper: 111, S Lower: 141, S Upper: 204, V Lower: 21, V Upper: 255
 # H Lower: 125, H Upper: 162, S Lower: 77, S Upper: 255, V Lower: 90, V Upper: 255
@@ -48,6 +53,9 @@ colors = {
     "purple": ((121,150,56),(132,183,248))#NEW
 }
 
+# Bounds compiled once instead of on every frame
+color_table = ColorTable.from_hsv_ranges(colors)
+
 class VideoCaptureWorker(QThread):
     frame_ready = pyqtSignal(QtGui.QImage)  # Signal to send the frame to the main thread
 
@@ -58,6 +66,7 @@ class VideoCaptureWorker(QThread):
 
     def run(self):
         cap = cv2.VideoCapture(self.rtsp_url)
+        roi_reported = False
 
         while self.running:
             ret, frame = cap.read()
@@ -67,13 +76,12 @@ class VideoCaptureWorker(QThread):
                 cap = cv2.VideoCapture(self.rtsp_url)
                 continue
 
-            # Resize frame for faster processing
-            # frame = cv2.resize(frame, (640, 480))  # Adjust size as needed
-            x_start, y_start = 450, 350  # Example starting coordinates
-            x_end, y_end = 850, 900  # Example ending coordinates
+            if REPORT_ROI_SAVINGS and not roi_reported:
+                print(f"ROI timing: {format_roi_savings(measure_roi_savings(frame, TOOL_ROI))}")
+                roi_reported = True
 
-            # # Crop the frame
-            cropped_frame = frame[y_start:y_end, x_start:x_end]
+            # Crop the frame to the shared play area (detection/roi.py)
+            cropped_frame, _ = TOOL_ROI.apply(frame)
             processed_frame = self.detect_custom_colors(cropped_frame)
 
             # Convert the frame to RGB format for Qt
@@ -91,8 +99,9 @@ class VideoCaptureWorker(QThread):
         hsv_frame = cv2.cvtColor(frame, cv2.COLOR_BGR2HSV)
         detected_colors = set()
 
-        for color_name, (lower, upper) in colors.items():
-            mask = cv2.inRange(hsv_frame, np.array(lower), np.array(upper))
+        for entry in color_table:
+            color_name = entry.name
+            mask = cv2.inRange(hsv_frame, entry.hsv_lower, entry.hsv_upper)
             
             # Find contours in the mask
             contours, _ = cv2.findContours(mask, cv2.RETR_EXTERNAL, cv2.CHAIN_APPROX_SIMPLE)
@@ -0,0 +1 @@
+# Detection package
@@ -0,0 +1,201 @@
+"""
+Batched detection across cameras on one stacked frame
+Every camera's analysis crop is copied into its slot of a preallocated stack, so the
+prefilter, color conversion, thresholds and morphology run once per tick for all cameras.
+Only blob extraction runs per camera, on its slot of the stacked mask.
+"""
+
+import threading
+
+import cv2
+import numpy as np
+
+from detection.blobs import BASELINE_BLOB_METHOD, get_blob_finder
+from detection.color_detector import MASK_FACTORS, STANDARD_MIN_AREA, downsample_mask, lut_detections, to_crop_units
+from detection.prefilter import BASELINE_PREFILTER, get_prefilter
+from detection.profiling import NULL_TIMER
+
+MIN_GAP_ROWS = 16  # Empty rows between slots, wider than the prefilter and morphology reach
+
+
+class StackedFrames:
+    """
+    Preallocated BGR stack with one vertical slot per camera
+
+    Slots are separated by empty rows so filters never mix neighbouring cameras, and
+    padded on the right to the widest crop. Slot views are row-contiguous, no copy is
+    needed to run per-camera steps on them. Slots start on multiples of the largest mask
+    factor, so a mask of the whole stack can be shrunk in one call.
+    """
+
+    def __init__(self, gap_rows=MIN_GAP_ROWS):
+        self.gap_rows = gap_rows
+        self.shapes = {}  # key -> (height, width) of the crop
+        self.rows = {}  # key -> first row of the slot
+        self.stack = None
+
+    def fits(self, key, shape):
+        return self.shapes.get(key) == shape[:2]
+
+    def layout(self, key, shape):
+        """Add or resize a slot, keeping the content of every other slot"""
+        old_stack, old_rows = self.stack, dict(self.rows)
+        self.shapes[key] = shape[:2]
+        width = max(w for _, w in self.shapes.values())
+        row = 0
+        for slot_key in sorted(self.shapes):
+            self.rows[slot_key] = row
+            row += -(-(self.shapes[slot_key][0] + self.gap_rows) // max(MASK_FACTORS)) * max(MASK_FACTORS)
+        self.stack = np.zeros((row, width, 3), dtype=np.uint8)
+        for slot_key, old_row in old_rows.items():
+            if slot_key != key:
+                height, slot_width = self.shapes[slot_key]
+                self.view(slot_key)[:] = old_stack[old_row:old_row + height, :slot_width]
+
+    def view(self, key, image=None, factor=1):
+        """
+        The slot of key in image (the BGR stack by default, or any image of the same layout,
+        shrunk by factor)
+        """
+        image = self.stack if image is None else image
+        height, width = self.shapes[key]
+        row = self.rows[key] // factor
+        return image[row:row + height // factor, :width // factor]
+
+
+def detect_stacked(frames, keys, color_table, use_enhanced=False, color_lut=None, scale=1.0,
+                   prefilter=BASELINE_PREFILTER, blob_method=BASELINE_BLOB_METHOD, timer=NULL_TIMER, mask_factor=1):
+    """
+    Detections for the slots in keys, one vectorized pass over the whole stack
+
+    Returns:
+        {key: [(color_name, [(x, y, w, h, area), ...]), ...]} with the layout of the
+        per-camera detectors in detection/color_detector.py (boxes in crop pixels)
+    """
+    find_blobs = get_blob_finder(blob_method)
+    with timer.stage("prefilter"):
+        filtered = get_prefilter(prefilter)(frames.stack)
+
+    if color_lut is not None:
+        with timer.stage("classify"):
+            labels = color_lut.classify(filtered)
+        return {key: lut_detections(frames.view(key, labels), color_lut, color_table, use_enhanced, scale,
+                                    blob_method, timer, mask_factor) for key in keys}
+
+    with timer.stage("cvtColor"):
+        hsv = cv2.cvtColor(filtered, cv2.COLOR_BGR2HSV)
+        lab = cv2.cvtColor(filtered, cv2.COLOR_BGR2LAB) if use_enhanced else None
+    blob_scale = scale / mask_factor
+    kernel = color_table.kernel(blob_scale)
+    area_scale = blob_scale * blob_scale
+    results = {key: [] for key in keys}
+    for entry in color_table:
+        with timer.stage("inRange"):
+            mask = cv2.inRange(hsv, entry.hsv_lower, entry.hsv_upper)
+            if use_enhanced:
+                mask = cv2.bitwise_and(cv2.inRange(lab, entry.lab_lower, entry.lab_upper), mask)
+        with timer.stage("morphology"):
+            mask = cv2.morphologyEx(downsample_mask(mask, mask_factor), cv2.MORPH_CLOSE, kernel)
+        with timer.stage("blobs"):
+            for key in keys:
+                slot = frames.view(key, mask, mask_factor)
+                if use_enhanced:
+                    blobs = find_blobs(slot, entry.area_min * area_scale, entry.area_max * area_scale)
+                else:
+                    blobs = find_blobs(slot, STANDARD_MIN_AREA * area_scale)
+                results[key].append((entry.name, [to_crop_units(*blob, blob_scale) for blob in blobs]))
+    return results
+
+
+class BatchDetector(threading.Thread):
+    """
+    Detection thread shared by all cameras
+
+    Cameras submit() their crop, which is copied into their slot. A tick starts once every
+    expected camera has submitted or wait_seconds after the first submission, runs
+    detect_stacked over the stack and hands each camera its results through the deliver
+    callback it gave with the crop.
+    """
+
+    def __init__(self, color_table, use_enhanced=False, color_lut=None, scale=1.0, prefilter=BASELINE_PREFILTER,
+                 blob_method=BASELINE_BLOB_METHOD, wait_seconds=0.02, expected=None, mask_factor=1):
+        """
+        Args:
+            wait_seconds: Longest wait for the other cameras once one crop is in
+            expected: Callable returning how many cameras are currently expected to submit
+            mask_factor: Mask downsampling for morphology and blob extraction (see MASK_FACTORS)
+        """
+        super().__init__(daemon=True)
+        self.color_table = color_table
+        self.use_enhanced = use_enhanced
+        self.color_lut = color_lut
+        self.scale = scale
+        self.prefilter = prefilter
+        self.blob_method = blob_method
+        self.wait_seconds = wait_seconds
+        self.mask_factor = mask_factor
+        self.expected = expected if expected is not None else (lambda: 1)
+        self.frames = StackedFrames(max(MIN_GAP_ROWS, color_table.kernel(scale).shape[0]))
+        self.pending = {}  # key -> deliver callback
+        self.busy = set()  # Keys whose slots the running tick reads
+        self.condition = threading.Condition()
+        self.running = False
+        self.ticks = 0
+        self.crops = 0
+        self.stage_timer = NULL_TIMER
+
+    def set_calibration(self, color_table, color_lut=None):
+        """Detect with a new color table (and LUT) from the next tick on"""
+        with self.condition:
+            self.color_table = color_table
+            self.color_lut = color_lut
+
+    def submit(self, key, crop, deliver):
+        """
+        Copy crop into the slot of key and queue it for the next tick
+
+        Returns:
+            False when the crop cannot be taken now (its previous crop is still queued or
+            being processed, or its slot would need a new layout during a tick)
+        """
+        with self.condition:
+            if key in self.pending or key in self.busy:
+                return False
+            if not self.frames.fits(key, crop.shape):
+                if self.busy:
+                    return False
+                self.frames.layout(key, crop.shape)
+            np.copyto(self.frames.view(key), crop)
+            self.pending[key] = deliver
+            self.condition.notify_all()
+            return True
+
+    def run(self):
+        self.running = True
+        while self.running:
+            with self.condition:
+                if not self.pending:
+                    self.condition.wait(0.5)
+                    continue
+                # Give the other cameras a moment to hand in their crop for the same tick
+                self.condition.wait_for(lambda: len(self.pending) >= self.expected() or not self.running,
+                                        self.wait_seconds)
+                batch, self.pending = self.pending, {}
+                self.busy = set(batch)
+                color_table, color_lut = self.color_table, self.color_lut  # Same calibration for the whole tick
+            try:
+                results = detect_stacked(self.frames, list(batch), color_table, self.use_enhanced, color_lut,
+                                         self.scale, self.prefilter, self.blob_method, self.stage_timer,
+                                         self.mask_factor)
+            finally:
+                with self.condition:
+                    self.busy = set()
+            self.ticks += 1
+            self.crops += len(batch)
+            for key, deliver in batch.items():
+                deliver(results[key])
+
+    def stop(self):
+        with self.condition:
+            self.running = False
+            self.condition.notify_all()
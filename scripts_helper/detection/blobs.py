@@ -0,0 +1,80 @@
+"""
+Blob extraction from binary color masks
+Two interchangeable methods with the same filters and result layout:
+- "contours": findContours, then contourArea and boundingRect per blob in Python
+- "components": connectedComponentsWithStats, every area and box from one call, filtered with numpy
+"""
+
+import cv2
+import numpy as np
+
+BASELINE_BLOB_METHOD = "contours"
+BORDER_KERNEL = cv2.getStructuringElement(cv2.MORPH_CROSS, (3, 3))
+
+
+def contour_blobs(mask, area_min=0, area_max=None, min_aspect=None, max_aspect=None):
+    """
+    Blobs of a mask as [(x, y, w, h, area), ...] from the external contours
+
+    Args:
+        area_min, area_max: Inclusive area limits (area_max None = no upper limit)
+        min_aspect, max_aspect: Exclusive limits on max(w, h) / min(w, h) (None = not checked)
+    """
+    contours, _ = cv2.findContours(mask, cv2.RETR_EXTERNAL, cv2.CHAIN_APPROX_SIMPLE)
+    blobs = []
+    for contour in contours:
+        area = cv2.contourArea(contour)
+        if area < area_min or (area_max is not None and area > area_max):
+            continue
+        x, y, w, h = cv2.boundingRect(contour)
+        if min_aspect is not None or max_aspect is not None:
+            aspect_ratio = max(w, h) / min(w, h)
+            if (min_aspect is not None and aspect_ratio <= min_aspect) or \
+                    (max_aspect is not None and aspect_ratio >= max_aspect):
+                continue
+        blobs.append((x, y, w, h, area))
+    return blobs
+
+
+def component_blobs(mask, area_min=0, area_max=None, min_aspect=None, max_aspect=None):
+    """
+    Same as contour_blobs from 8-connected components, without a Python loop over candidates
+
+    contourArea measures the polygon through the boundary pixel centers, so the area is the
+    pixel count less half the boundary pixels and one (Pick's theorem). It equals contourArea
+    for solid blobs (a 40x200 stick: 7761 from 8000 pixels), one pixel wide parts are traced
+    twice by the contour and come out larger here. Holes are not counted, contourArea of an
+    external contour includes them, and a blob inside another blob's hole is reported on its
+    own, RETR_EXTERNAL skips it. Boxes are identical for every blob both methods report.
+    """
+    count, labels, stats, _ = cv2.connectedComponentsWithStats(mask, connectivity=8)
+    # Boundary pixels have a background 4-neighbour (outside the mask counts as background)
+    inner = cv2.erode(mask, BORDER_KERNEL, borderType=cv2.BORDER_CONSTANT, borderValue=0)
+    boundary = np.bincount(labels[cv2.subtract(mask, inner) > 0], minlength=count)
+    areas = (stats[:, cv2.CC_STAT_AREA] - boundary / 2 - 1)[1:]
+    stats = stats[1:]  # Component 0 is the background
+    keep = areas >= area_min
+    if area_max is not None:
+        keep &= areas <= area_max
+    if min_aspect is not None or max_aspect is not None:
+        widths, heights = stats[:, cv2.CC_STAT_WIDTH], stats[:, cv2.CC_STAT_HEIGHT]
+        aspect_ratios = np.maximum(widths, heights) / np.minimum(widths, heights)
+        if min_aspect is not None:
+            keep &= aspect_ratios > min_aspect
+        if max_aspect is not None:
+            keep &= aspect_ratios < max_aspect
+    return [(int(x), int(y), int(w), int(h), float(area)) for (x, y, w, h, _), area in zip(stats[keep], areas[keep])]
+
+
+BLOB_METHODS = {
+    "contours": contour_blobs,
+    "components": component_blobs,
+}
+
+
+def get_blob_finder(name):
+    """Look up a blob method by name (see BLOB_METHODS)"""
+    try:
+        return BLOB_METHODS[name]
+    except KeyError:
+        raise ValueError(f"Unknown blob method '{name}', expected one of: {', '.join(BLOB_METHODS)}") from None
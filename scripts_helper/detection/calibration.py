@@ -0,0 +1,171 @@
+"""
+Versioned calibration profiles shared by the calibration tools and the game
+One JSON file holds one calibrated color dict per lighting condition. Every write bumps the
+store version and replaces the file atomically, so a reader never sees a half-written file.
+
+File layout:
+    {
+        "format": 1,
+        "version": 7,                       # Bumped on every write
+        "active": "evening",                # Profile used when none is named
+        "profiles": {
+            "evening": {
+                "version": 7,               # Store version of the profile's last change
+                "updated": "2025-09-18 16:38:14",
+                "colors": {"pink": {"hsv": [[149, 30, 115], [170, 185, 255]],
+                                    "lab": [[38, 153, 108], [255, 188, 132]],
+                                    "area_min": 100, "area_max": 50000}, ...}
+            }
+        }
+    }
+
+Bounds are in OpenCV units (LAB L scaled to 0-255, A and B offset by 127), the same as the
+calibrated_colors dicts ColorTable compiles.
+"""
+
+import json
+import os
+from datetime import datetime
+
+CALIBRATION_FILE = "calibration_profiles.json"
+DEFAULT_PROFILE = "default"
+STORE_FORMAT = 1
+
+
+def _bounds(value, name, key):
+    """((lower), (upper)) int tuples from JSON lists, checked for shape and range"""
+    try:
+        lower, upper = (tuple(int(v) for v in bound) for bound in value)
+    except (TypeError, ValueError):
+        raise ValueError(f"Color '{name}': '{key}' must be [[lower x3], [upper x3]]") from None
+    if len(lower) != 3 or len(upper) != 3 or not all(0 <= v <= 255 for v in lower + upper):
+        raise ValueError(f"Color '{name}': '{key}' must hold three values from 0 to 255 per bound")
+    return lower, upper
+
+
+def colors_from_json(colors):
+    """calibrated_colors dict (tuple bounds) from the JSON form, ValueError when malformed"""
+    if not isinstance(colors, dict) or not colors:
+        raise ValueError("A profile needs at least one color")
+    calibrated_colors = {}
+    for name, ranges in colors.items():
+        if not isinstance(ranges, dict):
+            raise ValueError(f"Color '{name}' must be an object with 'hsv' bounds")
+        if 'hsv' not in ranges:
+            raise ValueError(f"Color '{name}' has no 'hsv' bounds")
+        entry = {'hsv': _bounds(ranges['hsv'], name, 'hsv')}
+        if ranges.get('lab') is not None:
+            entry['lab'] = _bounds(ranges['lab'], name, 'lab')
+        for key in ('area_min', 'area_max'):
+            if key in ranges:
+                try:
+                    entry[key] = float(ranges[key])
+                except (TypeError, ValueError):
+                    raise ValueError(f"Color '{name}': '{key}' must be a number") from None
+        calibrated_colors[name] = entry
+    return calibrated_colors
+
+
+def colors_to_json(calibrated_colors):
+    """JSON form of a calibrated_colors dict (bounds as lists of ints)"""
+    colors = {}
+    for name, ranges in calibrated_colors.items():
+        entry = {'hsv': [[int(v) for v in bound] for bound in ranges['hsv']]}
+        if ranges.get('lab') is not None:
+            entry['lab'] = [[int(v) for v in bound] for bound in ranges['lab']]
+        for key in ('area_min', 'area_max'):
+            if key in ranges:
+                entry[key] = ranges[key]
+        colors[name] = entry
+    return colors
+
+
+class CalibrationStore:
+    """
+    Read and write calibration profiles in one JSON file
+
+    Reads go to the file every time, so a running game sees what a calibration tool
+    saved as soon as it is asked to reload.
+    """
+
+    def __init__(self, path=CALIBRATION_FILE):
+        self.path = path
+
+    def exists(self):
+        return os.path.exists(self.path)
+
+    def load(self):
+        """The whole store, an empty one when the file does not exist yet"""
+        if not self.exists():
+            return {'format': STORE_FORMAT, 'version': 0, 'active': None, 'profiles': {}}
+        with open(self.path, 'r') as f:
+            data = json.load(f)
+        if data.get('format') != STORE_FORMAT:
+            raise ValueError(f"{self.path}: unsupported calibration format {data.get('format')}")
+        return data
+
+    def profile_names(self):
+        return sorted(self.load()['profiles'])
+
+    def active_profile(self):
+        return self.load()['active']
+
+    def profile(self, name=None):
+        """
+        Colors of a profile, the active one when name is None
+
+        Returns:
+            (profile name, profile version, calibrated_colors dict)
+        """
+        data = self.load()
+        name = name or data['active']
+        if name is None:
+            raise KeyError(f"{self.path}: no profile named and no active profile")
+        if name not in data['profiles']:
+            raise KeyError(f"{self.path}: unknown profile '{name}' (have {', '.join(sorted(data['profiles']))})")
+        profile = data['profiles'][name]
+        return name, profile['version'], colors_from_json(profile['colors'])
+
+    def save_profile(self, name, calibrated_colors, activate=False):
+        """Replace a profile's colors, returns the new store version"""
+        colors = colors_to_json(colors_from_json(calibrated_colors))  # Never write what the game would refuse
+        data = self.load()
+        version = data['version'] + 1
+        data['profiles'][name] = {'version': version, 'updated': datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+                                  'colors': colors}
+        if activate or data['active'] is None:
+            data['active'] = name
+        return self._write(data, version)
+
+    def save_color(self, name, color, ranges, base_colors=None, activate=False):
+        """
+        Update one color of a profile, keeping the others and the color's own area limits
+
+        Args:
+            base_colors: Colors a new profile starts from (the caller's current calibration)
+        """
+        data = self.load()
+        if name in data['profiles']:
+            calibrated_colors = colors_from_json(data['profiles'][name]['colors'])
+        else:
+            calibrated_colors = dict(base_colors or {})
+        previous = calibrated_colors.get(color, {})
+        calibrated_colors[color] = {**{key: previous[key] for key in ('area_min', 'area_max') if key in previous},
+                                    **ranges}
+        return self.save_profile(name, calibrated_colors, activate)
+
+    def activate(self, name):
+        """Make a profile the one used when none is named"""
+        data = self.load()
+        if name not in data['profiles']:
+            raise KeyError(f"{self.path}: unknown profile '{name}'")
+        data['active'] = name
+        return self._write(data, data['version'] + 1)
+
+    def _write(self, data, version):
+        data['version'] = version
+        temporary = f"{self.path}.tmp"
+        with open(temporary, 'w') as f:
+            json.dump(data, f, indent=2)
+        os.replace(temporary, self.path)  # Atomic on the same filesystem
+        return version
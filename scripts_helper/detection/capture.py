@@ -0,0 +1,131 @@
+"""
+Capture layer for the camera threads and frame grabbers
+Opens files, RTSP streams and synthetic scenes with configurable backend, low-latency
+FFmpeg options, buffer size, hardware decoding and substreams, plus reconnect backoff
+"""
+
+import os
+import threading
+from dataclasses import dataclass
+from typing import Optional, Tuple
+
+import cv2
+
+from detection.synthetic import is_synthetic_source, open_synthetic
+
+FFMPEG_OPTIONS_VARIABLE = "OPENCV_FFMPEG_CAPTURE_OPTIONS"
+NETWORK_SCHEMES = ("rtsp://", "rtsps://", "http://", "https://", "udp://", "tcp://")
+
+BACKENDS = {
+    'any': cv2.CAP_ANY,
+    'ffmpeg': cv2.CAP_FFMPEG,
+    'gstreamer': cv2.CAP_GSTREAMER,
+}
+
+# OpenCV reads FFmpeg options from the process environment, cameras opening from parallel
+# threads set them and open one after the other
+_open_lock = threading.Lock()
+
+
+@dataclass
+class CaptureConfig:
+    """How a camera thread opens its source"""
+    backend: str = "any"  # Key of BACKENDS
+    rtsp_transport: Optional[str] = None  # "tcp" or "udp" (FFmpeg only), None = FFmpeg default
+    low_latency: bool = False  # FFmpeg: no input buffering, low-delay decoding
+    buffer_size: Optional[int] = None  # Frames queued inside the capture (CAP_PROP_BUFFERSIZE)
+    hw_acceleration: bool = False  # Let OpenCV pick any available hardware decoder
+    stream_path: Optional[str] = None  # Appended to RTSP URLs without a path, e.g. a camera substream
+    frame_size: Optional[Tuple[int, int]] = None  # Requested (width, height), honoured by some backends only
+    open_timeout: Optional[float] = None  # Seconds before opening a stream gives up
+    read_timeout: Optional[float] = None  # Seconds before a stalled read() returns False
+
+    def ffmpeg_options(self):
+        """Value for OPENCV_FFMPEG_CAPTURE_OPTIONS ("key;value|key;value"), empty when nothing is set"""
+        options = []
+        if self.rtsp_transport:
+            options.append(("rtsp_transport", self.rtsp_transport))
+        if self.low_latency:
+            options += [("fflags", "nobuffer"), ("flags", "low_delay")]
+        return "|".join(f"{key};{value}" for key, value in options)
+
+    def open_params(self):
+        """Flat [property, value, ...] list passed to cv2.VideoCapture when opening"""
+        params = []
+        if self.hw_acceleration:
+            params += [cv2.CAP_PROP_HW_ACCELERATION, cv2.VIDEO_ACCELERATION_ANY]
+        if self.open_timeout:
+            params += [cv2.CAP_PROP_OPEN_TIMEOUT_MSEC, int(self.open_timeout * 1000)]
+        if self.read_timeout:
+            params += [cv2.CAP_PROP_READ_TIMEOUT_MSEC, int(self.read_timeout * 1000)]
+        return params
+
+
+def is_network_source(source):
+    return isinstance(source, str) and source.lower().startswith(NETWORK_SCHEMES)
+
+
+def stream_url(source, stream_path=None):
+    """Source URL with stream_path appended when the URL has no path of its own"""
+    if not stream_path or not is_network_source(source):
+        return source
+    address = source.split("://", 1)[1]
+    if "/" in address.rstrip("/"):
+        return source
+    return source.rstrip("/") + "/" + stream_path.lstrip("/")
+
+
+def open_capture(source, config=None):
+    """
+    Open a capture for a file, stream or "synthetic://" scene
+
+    Without a config this is a plain cv2.VideoCapture(source). FFmpeg options only
+    apply to network streams. They are read from the environment when a capture opens,
+    so they are set for this open only and the previous value is restored afterwards.
+    """
+    if is_synthetic_source(source):
+        return open_synthetic(source)
+    if config is None:
+        return cv2.VideoCapture(source)
+
+    options = ""
+    if is_network_source(source):
+        source = stream_url(source, config.stream_path)
+        options = config.ffmpeg_options()
+    with _open_lock:
+        previous = os.environ.get(FFMPEG_OPTIONS_VARIABLE)
+        if options:
+            os.environ[FFMPEG_OPTIONS_VARIABLE] = options
+        try:
+            cap = cv2.VideoCapture(source, BACKENDS[config.backend], config.open_params())
+        finally:
+            if options:
+                if previous is None:
+                    del os.environ[FFMPEG_OPTIONS_VARIABLE]
+                else:
+                    os.environ[FFMPEG_OPTIONS_VARIABLE] = previous
+    if config.buffer_size is not None:
+        cap.set(cv2.CAP_PROP_BUFFERSIZE, config.buffer_size)
+    if config.frame_size is not None:
+        cap.set(cv2.CAP_PROP_FRAME_WIDTH, config.frame_size[0])
+        cap.set(cv2.CAP_PROP_FRAME_HEIGHT, config.frame_size[1])
+    return cap
+
+
+class Backoff:
+    """Exponential reconnect delay: minimum, doubled per failure up to maximum, reset on success"""
+
+    def __init__(self, minimum=0.5, maximum=30.0, factor=2.0):
+        self.minimum = minimum
+        self.maximum = maximum
+        self.factor = factor
+        self.failures = 0
+
+    def next_delay(self):
+        """Seconds to wait before the next attempt, counting one more failure"""
+        delay = min(self.maximum, self.minimum * self.factor ** self.failures)
+        self.failures += 1
+        return delay
+
+    def reset(self):
+        self.failures = 0
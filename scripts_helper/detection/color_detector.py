@@ -0,0 +1,179 @@
+"""
+Frame-level color detection shared by the camera threads and worker processes
+Functions here only compute detections, scoring and MQTT publishing stay with the caller
+"""
+
+import cv2
+import numpy as np
+
+from detection.blobs import BASELINE_BLOB_METHOD, get_blob_finder
+from detection.prefilter import BASELINE_PREFILTER, get_prefilter
+from detection.profiling import NULL_TIMER
+
+# Minimum contour area of a stick in standard (HSV only) mode
+STANDARD_MIN_AREA = 5000
+
+# Mask downsampling factors for morphology and blob extraction (1 = analysis resolution)
+MASK_FACTORS = (1, 2, 4)
+
+
+def to_crop_units(x, y, w, h, area, scale):
+    """Map a box and area measured at analysis resolution back to crop pixels"""
+    if scale == 1.0:
+        return x, y, w, h, area
+    return int(x / scale), int(y / scale), int(w / scale), int(h / scale), area / (scale * scale)
+
+
+def downsample_mask(mask, factor, out=None):
+    """
+    Shrink a 0/255 mask by an integer factor, a pixel stays set when at least half of its block is set
+
+    A half-block rule rather than any-pixel keeps pixel-count areas unbiased once they are
+    scaled back up. Contour areas (polygon through the boundary pixel centers) come out about
+    half a perimeter times (factor - 1) smaller than at full resolution.
+    """
+    if factor == 1:
+        return mask
+    if factor not in MASK_FACTORS:
+        raise ValueError(f"Mask factor must be one of {MASK_FACTORS}, got {factor}")
+    # Halving steps average the same blocks, OpenCV only has a fast INTER_AREA path for 2x
+    small = mask
+    while factor > 2:
+        small = cv2.resize(small, None, fx=0.5, fy=0.5, interpolation=cv2.INTER_AREA)
+        factor //= 2
+    small = cv2.resize(small, None, dst=out, fx=0.5, fy=0.5, interpolation=cv2.INTER_AREA)
+    cv2.threshold(small, 127, 255, cv2.THRESH_BINARY, dst=small)
+    return small
+
+
+def standard_detections(hsv_frame, color_table, scale=1.0, blob_method=BASELINE_BLOB_METHOD, timer=NULL_TIMER,
+                        mask_factor=1):
+    """
+    Standard color detection using original HSV ranges
+
+    Args:
+        color_table: Compiled ColorTable (bounds and kernels are reused across frames)
+        scale: Analysis scale of hsv_frame relative to the crop, areas and boxes are reported in crop pixels
+        blob_method: "contours" or "components" (see detection/blobs.py)
+        timer: StageTimer for the inRange, morphology and blobs stages (benchmarks only)
+        mask_factor: Run morphology and blob extraction on masks shrunk by this factor (see
+            MASK_FACTORS), kernel and area limits follow so results stay in crop pixels
+
+    Returns:
+        List of (color_name, [(x, y, w, h, area), ...]) in color table order
+    """
+    find_blobs = get_blob_finder(blob_method)
+    blob_scale = scale / mask_factor
+    min_area = STANDARD_MIN_AREA * blob_scale * blob_scale
+    kernel = color_table.kernel(blob_scale)
+    results = []
+    for entry in color_table:
+        # Create HSV mask
+        with timer.stage("inRange"):
+            hsv_mask = cv2.inRange(hsv_frame, entry.hsv_lower, entry.hsv_upper)
+
+        # Clean up the mask with morphological operations
+        with timer.stage("morphology"):
+            color_mask = cv2.morphologyEx(downsample_mask(hsv_mask, mask_factor), cv2.MORPH_CLOSE, kernel)
+
+        with timer.stage("blobs"):
+            objects = [to_crop_units(*blob, blob_scale) for blob in find_blobs(color_mask, min_area)]
+        results.append((entry.name, objects))
+    return results
+
+
+def enhanced_detections(hsv_frame, lab_frame, color_table, scale=1.0, blob_method=BASELINE_BLOB_METHOD,
+                        timer=NULL_TIMER, mask_factor=1):
+    """Enhanced color detection using calibrated HSV+LAB hybrid approach (same result layout)"""
+    find_blobs = get_blob_finder(blob_method)
+    blob_scale = scale / mask_factor
+    kernel = color_table.kernel(blob_scale)
+    area_scale = blob_scale * blob_scale
+    results = []
+    for entry in color_table:
+        with timer.stage("inRange"):
+            # Create masks from both color spaces
+            lab_mask = cv2.inRange(lab_frame, entry.lab_lower, entry.lab_upper)
+            hsv_mask = cv2.inRange(hsv_frame, entry.hsv_lower, entry.hsv_upper)
+
+            # Combine masks (intersection for precision)
+            color_mask = cv2.bitwise_and(lab_mask, hsv_mask)
+
+        # Clean up the mask with morphological operations
+        with timer.stage("morphology"):
+            color_mask = cv2.morphologyEx(downsample_mask(color_mask, mask_factor), cv2.MORPH_CLOSE, kernel)
+
+        with timer.stage("blobs"):
+            blobs = find_blobs(color_mask, entry.area_min * area_scale, entry.area_max * area_scale)
+            objects = [to_crop_units(*blob, blob_scale) for blob in blobs]
+        results.append((entry.name, objects))
+    return results
+
+
+def lut_detections(labels, color_lut, color_table, use_enhanced=False, scale=1.0,
+                   blob_method=BASELINE_BLOB_METHOD, timer=NULL_TIMER, mask_factor=1):
+    """
+    Color detection on a single LUT label image (one classification pass for all colors)
+
+    labels is a label image, or a uint16 color bitmask image from a packed ColorLUT. The
+    mask and closing buffers are allocated once per frame and reused for every color.
+    """
+    find_blobs = get_blob_finder(blob_method)
+    label_counts = color_lut.label_counts(labels)
+    blob_scale = scale / mask_factor
+    kernel = color_table.kernel(blob_scale)
+    area_scale = blob_scale * blob_scale
+    mask = np.empty(labels.shape[:2], dtype=np.uint8)
+    small_mask = None  # Shrunk mask buffer when mask_factor > 1, sized by the first resize
+    color_mask = None
+    scratch = np.empty_like(labels) if color_lut.packed else None
+    results = []
+    for entry in color_table:
+        objects = []
+        # Colors without a single labeled pixel skip morphology and blob extraction entirely
+        if label_counts[entry.label] > 0:
+            with timer.stage("morphology"):
+                color_lut.mask(labels, entry.label, mask, scratch)
+                small_mask = downsample_mask(mask, mask_factor, small_mask)
+                color_mask = cv2.morphologyEx(small_mask, cv2.MORPH_CLOSE, kernel, dst=color_mask)
+            with timer.stage("blobs"):
+                # Same area rules as the per-color paths
+                if use_enhanced:
+                    blobs = find_blobs(color_mask, entry.area_min * area_scale, entry.area_max * area_scale)
+                else:
+                    blobs = find_blobs(color_mask, STANDARD_MIN_AREA * area_scale)
+                objects = [to_crop_units(*blob, blob_scale) for blob in blobs]
+        results.append((entry.name, objects))
+    return results
+
+
+def find_color_detections(frame, color_table, use_enhanced=False, color_lut=None, scale=1.0,
+                          prefilter=BASELINE_PREFILTER, blob_method=BASELINE_BLOB_METHOD, timer=NULL_TIMER,
+                          mask_factor=1):
+    """
+    Full pipeline on a cropped BGR frame: denoise prefilter, color conversion and detection
+
+    Args:
+        frame: Cropped frame, already downscaled by scale (see ROIConfig.apply)
+        scale: Analysis scale, detections are returned in full-resolution crop pixels
+        prefilter: Name of the denoise stage (see detection/prefilter.py)
+        blob_method: Blob extraction method (see detection/blobs.py)
+        timer: StageTimer collecting per-stage times (benchmarks only)
+        mask_factor: Mask downsampling for morphology and blob extraction (see MASK_FACTORS)
+    """
+    # Denoise before color conversion (bilateral by default, cheaper filters are selectable)
+    with timer.stage("prefilter"):
+        filtered_frame = get_prefilter(prefilter)(frame)
+
+    # LUT mode labels all colors in one pass, no color space conversion needed
+    if color_lut is not None:
+        with timer.stage("classify"):
+            labels = color_lut.classify(filtered_frame)
+        return lut_detections(labels, color_lut, color_table, use_enhanced, scale, blob_method, timer, mask_factor)
+
+    with timer.stage("cvtColor"):
+        hsv_frame = cv2.cvtColor(filtered_frame, cv2.COLOR_BGR2HSV)
+        lab_frame = cv2.cvtColor(filtered_frame, cv2.COLOR_BGR2LAB) if use_enhanced else None
+    if use_enhanced:
+        return enhanced_detections(hsv_frame, lab_frame, color_table, scale, blob_method, timer, mask_factor)
+    return standard_detections(hsv_frame, color_table, scale, blob_method, timer, mask_factor)
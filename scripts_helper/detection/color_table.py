@@ -0,0 +1,94 @@
+"""
+Compiled color table shared by every stick detector
+Bounds, kernels, area limits and display colors are built once per calibration, not per frame
+"""
+
+from dataclasses import dataclass
+from typing import Optional, Tuple
+
+import cv2
+import numpy as np
+
+DEFAULT_DISPLAY_BGR = (255, 255, 255)
+
+
+@dataclass
+class ColorEntry:
+    """One calibrated color with its bounds ready for cv2.inRange"""
+    name: str
+    label: int  # 1-based position in the table (0 is background in label images)
+    hsv_lower: np.ndarray
+    hsv_upper: np.ndarray
+    lab_lower: Optional[np.ndarray]
+    lab_upper: Optional[np.ndarray]
+    area_min: float
+    area_max: float
+    display_bgr: Tuple[int, int, int]
+
+
+class ColorTable:
+    """
+    Immutable, precompiled view of a calibrated color dict
+
+    Detectors iterate over the entries instead of the raw dict, so the numpy
+    bounds and structuring elements are allocated once. Build a new table when
+    the calibration changes and swap the reference, never mutate one in place.
+    """
+
+    def __init__(self, calibrated_colors, display_colors=None, area_min=1000, area_max=50000, kernel_size=9):
+        """
+        Args:
+            calibrated_colors: Dict of color name -> {'hsv': (lower, upper), 'lab': (lower, upper),
+                'area_min': ..., 'area_max': ...}, 'lab' and the area limits are optional
+            display_colors: Dict of color name -> BGR used to draw detections
+            area_min, area_max: Limits for colors that do not define their own
+            kernel_size: Side of the elliptical morphology kernel at full resolution
+        """
+        display_colors = display_colors or {}
+        self.kernel_size = kernel_size
+        self.entries = []
+        for label, (name, ranges) in enumerate(calibrated_colors.items(), start=1):
+            lab = ranges.get('lab')
+            self.entries.append(ColorEntry(
+                name=name,
+                label=label,
+                hsv_lower=np.array(ranges['hsv'][0]),
+                hsv_upper=np.array(ranges['hsv'][1]),
+                lab_lower=np.array(lab[0]) if lab is not None else None,
+                lab_upper=np.array(lab[1]) if lab is not None else None,
+                area_min=ranges.get('area_min', area_min),
+                area_max=ranges.get('area_max', area_max),
+                display_bgr=display_colors.get(name, DEFAULT_DISPLAY_BGR),
+            ))
+        self.names = [entry.name for entry in self.entries]
+        self._by_name = {entry.name: entry for entry in self.entries}
+        self._kernels = {}
+
+    @classmethod
+    def from_hsv_ranges(cls, hsv_ranges, **kwargs):
+        """Build a table from the older {name: (hsv_lower, hsv_upper)} dicts"""
+        return cls({name: {'hsv': bounds} for name, bounds in hsv_ranges.items()}, **kwargs)
+
+    def kernel(self, scale=1.0, size=None):
+        """
+        Elliptical kernel for the analysis scale, shrunk so it covers the same area
+
+        Args:
+            size: Full-resolution side, defaults to the table's kernel_size
+        """
+        key = (size, scale)
+        kernel = self._kernels.get(key)
+        if kernel is None:
+            side = max(3, int(round((size or self.kernel_size) * scale)) | 1)
+            kernel = cv2.getStructuringElement(cv2.MORPH_ELLIPSE, (side, side))
+            self._kernels[key] = kernel
+        return kernel
+
+    def __iter__(self):
+        return iter(self.entries)
+
+    def __len__(self):
+        return len(self.entries)
+
+    def __getitem__(self, name):
+        return self._by_name[name]
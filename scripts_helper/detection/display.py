@@ -0,0 +1,96 @@
+"""
+Double-buffered display frames for the camera viewer
+The camera thread draws overlays into the back buffer and swaps it in, the viewer shows
+the front buffer, so neither side allocates or copies a frame for the other.
+MosaicView composites every camera's front buffer into one downscaled window.
+"""
+
+import math
+import threading
+from contextlib import contextmanager
+
+import cv2
+import numpy as np
+
+
+class DisplayBuffer:
+    """
+    Two preallocated frames shared between one camera thread and the viewer
+
+    The camera thread copies the decoded frame into the back buffer (the only copy,
+    needed because the grabber ring reuses its slots), draws on it and calls swap().
+    The viewer reads the front buffer inside front(), which holds the lock so a swap
+    never hands the buffer being shown back to the writer mid-imshow.
+    """
+
+    def __init__(self):
+        self.buffers = [None, None]
+        self.front_index = 0
+        self.lock = threading.Lock()
+        self.frames = 0
+        self.bytes_copied = 0
+
+    def back(self, frame):
+        """Copy frame into the back buffer (reallocated only when the shape changes) and return it"""
+        back_index = 1 - self.front_index
+        buffer = self.buffers[back_index]
+        if buffer is None or buffer.shape != frame.shape or buffer.dtype != frame.dtype:
+            buffer = self.buffers[back_index] = np.empty_like(frame)
+        np.copyto(buffer, frame)
+        self.bytes_copied += frame.nbytes
+        return buffer
+
+    def swap(self):
+        """Publish the back buffer to the viewer"""
+        with self.lock:
+            self.front_index = 1 - self.front_index
+            self.frames += 1
+
+    @contextmanager
+    def front(self):
+        """The newest complete display frame (None before the first swap), valid inside the with block"""
+        with self.lock:
+            yield self.buffers[self.front_index] if self.frames else None
+
+    def stats(self):
+        return {'display_frames': self.frames, 'display_bytes': self.bytes_copied}
+
+
+class MosaicView:
+    """
+    All cameras in one window: each front buffer is downscaled into its tile of a preallocated canvas
+
+    Tiles are only redrawn when their camera swapped in a new frame since the last render.
+    """
+
+    WINDOW_NAME = "FalconGrasp - Cameras"
+
+    def __init__(self, count, tile_size=(640, 360), columns=3):
+        """
+        Args:
+            count: Number of cameras
+            tile_size: (width, height) of one camera tile
+            columns: Tiles per row (fewer when there are fewer cameras)
+        """
+        self.tile_size = tile_size
+        width, height = tile_size
+        columns = max(1, min(columns, count))
+        rows = math.ceil(count / columns)
+        self.canvas = np.zeros((rows * height, columns * width, 3), dtype=np.uint8)
+        # Views into the canvas, cv2.resize writes straight into them
+        self.tiles = [self.canvas[(i // columns) * height:(i // columns + 1) * height,
+                                  (i % columns) * width:(i % columns + 1) * width] for i in range(count)]
+        self.rendered = [0] * count  # DisplayBuffer.frames at the last redraw of each tile
+        for index, tile in enumerate(self.tiles):
+            cv2.putText(tile, f"Camera {index} - waiting for frames", (10, height // 2),
+                        cv2.FONT_HERSHEY_SIMPLEX, 0.6, (200, 200, 200), 1)
+
+    def render(self, displays):
+        """Update the tiles of cameras with new frames and return the canvas"""
+        for index, (display, tile) in enumerate(zip(displays, self.tiles)):
+            with display.front() as frame:
+                if frame is None or display.frames == self.rendered[index]:
+                    continue
+                cv2.resize(frame, self.tile_size, dst=tile, interpolation=cv2.INTER_AREA)
+                self.rendered[index] = display.frames
+        return self.canvas
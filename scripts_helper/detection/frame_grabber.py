@@ -0,0 +1,173 @@
+"""
+Decoupled frame grabbing for the camera threads
+A grabber thread decodes into a preallocated ring so slow detection never backs up the decoder
+"""
+
+import threading
+import time
+
+import cv2
+
+from detection.capture import Backoff, open_capture
+from detection.health import frame_signature
+from detection.profiling import NULL_TIMER
+
+
+class FrameRing:
+    """
+    Fixed-size ring of preallocated frame slots with latest-frame-wins semantics
+
+    Three slots rotate between the writer (being decoded into), the ready slot
+    (newest complete frame) and the reader (being processed). Publishing a new
+    frame while the ready one was never taken counts it as dropped, so the
+    reader is never more than one frame behind the decoder.
+    """
+
+    SLOTS = 3
+
+    def __init__(self):
+        self.slots = [None] * self.SLOTS
+        self.write_index = 0
+        self.ready_index = 1
+        self.read_index = 2
+        self.fresh = False  # True while the ready slot holds an unread frame
+        self.sequence = 0  # Sequence number of the newest published frame
+        self.published = 0
+        self.dropped = 0
+        self.consumed = 0
+        self.closed = False
+        self.condition = threading.Condition()
+
+    def write_slot(self):
+        """Buffer the writer should decode into (None until the first frame sets the shape)"""
+        return self.slots[self.write_index]
+
+    def publish(self, frame):
+        """Hand the freshly decoded frame over to the reader, dropping any unread one"""
+        with self.condition:
+            # cap.read() reallocates when the stream resolution changes, keep whatever it returned
+            self.slots[self.write_index] = frame
+            if self.fresh:
+                self.dropped += 1
+            self.write_index, self.ready_index = self.ready_index, self.write_index
+            self.fresh = True
+            self.sequence += 1
+            self.published += 1
+            self.condition.notify()
+
+    def latest(self, timeout=None):
+        """
+        Take the newest frame, waiting up to timeout seconds for one
+
+        Returns:
+            (frame, sequence) or (None, sequence) on timeout/close. The frame stays
+            valid until the next call, the writer never touches the reader's slot.
+        """
+        with self.condition:
+            if not self.fresh and not self.closed:
+                self.condition.wait(timeout)
+            if not self.fresh:
+                return None, self.sequence
+            self.read_index, self.ready_index = self.ready_index, self.read_index
+            self.fresh = False
+            self.consumed += 1
+            return self.slots[self.read_index], self.sequence
+
+    def close(self):
+        """Wake up any waiting reader for shutdown"""
+        with self.condition:
+            self.closed = True
+            self.condition.notify_all()
+
+    def stats(self):
+        with self.condition:
+            return {'published': self.published, 'dropped': self.dropped, 'processed': self.consumed}
+
+
+class FrameGrabber(threading.Thread):
+    """Per-camera decode thread feeding a FrameRing"""
+
+    def __init__(self, source, camera_index, ring=None, is_video_file=False, capture_config=None, backoff=None,
+                 health=None):
+        super().__init__(daemon=True)
+        self.source = source
+        self.camera_index = camera_index
+        self.ring = ring if ring is not None else FrameRing()
+        self.is_video_file = is_video_file
+        self.capture_config = capture_config  # CaptureConfig, None = plain cv2.VideoCapture
+        self.backoff = backoff if backoff is not None else Backoff()
+        self.wakeup = threading.Event()  # Cuts a reconnect wait short on stop()
+        self.reconnects = 0
+        self.health = health  # StreamHealth fed with every frame and failure
+        self.running = False
+        self.fps = 30  # Updated from the capture for video files
+        self.playback_speed_multiplier = 1.0
+        self.stage_timer = NULL_TIMER  # Own StageTimer when the camera thread profiles stages
+
+    def open_capture(self):
+        return open_capture(self.source, self.capture_config)
+
+    def reconnect(self, cap):
+        """Release cap and open a new capture after the backoff delay (None when stopped while waiting)"""
+        cap.release()
+        delay = self.backoff.next_delay()
+        print(f"Camera {self.camera_index} - Reconnecting in {delay:.1f}s...")
+        self.wakeup.wait(delay)
+        if not self.running:
+            return None
+        self.reconnects += 1
+        if self.health is not None:
+            self.health.reconnecting()
+        return self.open_capture()
+
+    def run(self):
+        self.running = True
+        cap = self.open_capture()
+
+        if self.is_video_file and cap.isOpened():
+            self.fps = cap.get(cv2.CAP_PROP_FPS)
+            if self.fps <= 0:  # Some videos don't report FPS correctly
+                self.fps = 25
+
+        while self.running:
+            # Decode straight into the preallocated writer slot
+            with self.stage_timer.stage("decode"):
+                ret, frame = cap.read(self.ring.write_slot())
+            self.stage_timer.end_frame()
+            if not ret:
+                if self.is_video_file and cap.isOpened():
+                    # For video files, loop back to beginning
+                    print(f"Camera {self.camera_index} - Video ended, looping back to start")
+                    cap.set(cv2.CAP_PROP_POS_FRAMES, 0)
+                    continue
+                # For RTSP streams (and missing files), reconnect after an exponentially growing delay
+                print(f"Camera {self.camera_index} failed to read frame")
+                if self.health is not None:
+                    self.health.failure()
+                cap = self.reconnect(cap)
+                if cap is None:
+                    break
+                continue
+
+            # Streams that keep returning the same frame have stalled, video files may hold still
+            if self.health is not None and self.health.frame(None if self.is_video_file else frame_signature(frame)):
+                print(f"Camera {self.camera_index} - Stream stalled (repeated frames)")
+                cap = self.reconnect(cap)
+                if cap is None:
+                    break
+                continue
+
+            self.backoff.reset()
+            self.ring.publish(frame)
+
+            if self.is_video_file:
+                # Video files have no natural pacing, emulate the source frame rate
+                time.sleep((1.0 / self.fps) / self.playback_speed_multiplier)
+
+        if cap is not None:
+            cap.release()
+        self.ring.close()
+
+    def stop(self):
+        self.running = False
+        self.wakeup.set()
@@ -0,0 +1,125 @@
+"""
+Per-camera stream health state machine
+Tracks connecting/streaming/degraded/offline from the decode loop, detects stalled
+streams that keep returning the same frame, and reports every state change
+"""
+
+import time
+
+CONNECTING = "connecting"
+STREAMING = "streaming"
+DEGRADED = "degraded"
+OFFLINE = "offline"
+
+SIGNATURE_STEP = 64  # Pixel stride of the stale-frame signature (about 500 pixels at 1080p)
+
+
+def frame_signature(frame):
+    """Cheap fingerprint of a frame, identical for repeated stale frames"""
+    return frame[::SIGNATURE_STEP, ::SIGNATURE_STEP].tobytes()
+
+
+class StreamHealth:
+    """
+    Health of one camera stream
+
+        connecting --frame--> streaming --read failure / stall--> degraded
+        degraded --frame--> streaming
+        any state --offline_failures consecutive failed reconnects--> offline
+        offline --frame--> streaming
+
+    The decode loop reports frames and failures, the camera thread calls check()
+    as a watchdog when no frame arrives at all (a read blocked inside the capture).
+    """
+
+    def __init__(self, camera_index, stall_seconds=3.0, offline_failures=3, on_change=None, clock=time.monotonic):
+        """
+        Args:
+            camera_index: Camera number, reported in snapshots
+            stall_seconds: No new frame (or only identical frames) for this long degrades the stream
+            offline_failures: Consecutive failed reads/reconnects before the camera counts as offline
+            on_change: Called with this object after every state change
+            clock: Time source in seconds
+        """
+        self.camera_index = camera_index
+        self.stall_seconds = stall_seconds
+        self.offline_failures = offline_failures
+        self.on_change = on_change
+        self.clock = clock
+        self.state = CONNECTING
+        self.since = clock()
+        self.failures = 0
+        self.reconnects = 0
+        self.frames = 0
+        self.last_frame_time = None
+        self.last_signature = None
+        self.stale_since = None
+
+    def set_state(self, state):
+        if state == self.state:
+            return
+        self.state = state
+        self.since = self.clock()
+        if self.on_change is not None:
+            self.on_change(self)
+
+    def frame(self, signature=None):
+        """
+        A frame was decoded
+
+        Args:
+            signature: frame_signature() of the frame, enables stale-frame detection
+
+        Returns:
+            True when the stream has been returning the same frame for stall_seconds
+            and should be reconnected
+        """
+        now = self.clock()
+        if signature is not None and signature == self.last_signature:
+            if self.stale_since is None:
+                self.stale_since = now
+            if now - self.stale_since >= self.stall_seconds:
+                self.set_state(DEGRADED)
+                self.stale_since = None
+                self.last_signature = None
+                return True
+            return False
+        self.last_signature = signature
+        self.stale_since = None
+        self.last_frame_time = now
+        self.failures = 0
+        self.frames += 1
+        self.set_state(STREAMING)
+        return False
+
+    def failure(self):
+        """A read or reconnect attempt failed"""
+        self.failures += 1
+        if self.failures >= self.offline_failures:
+            self.set_state(OFFLINE)
+        elif self.state == STREAMING:
+            self.set_state(DEGRADED)
+
+    def reconnecting(self):
+        """A new capture is being opened"""
+        self.reconnects += 1
+        self.last_signature = None
+        self.stale_since = None
+
+    def check(self):
+        """Watchdog: degrade a streaming camera that has not delivered a frame for stall_seconds"""
+        if self.state == STREAMING and self.clock() - self.last_frame_time >= self.stall_seconds:
+            self.set_state(DEGRADED)
+
+    def snapshot(self):
+        """JSON-ready state for the health topic"""
+        now = self.clock()
+        return {
+            'camera': self.camera_index,
+            'state': self.state,
+            'seconds_in_state': round(now - self.since, 1),
+            'failures': self.failures,
+            'reconnects': self.reconnects,
+            'frames': self.frames,
+            'last_frame_age': round(now - self.last_frame_time, 1) if self.last_frame_time is not None else None,
+        }
@@ -0,0 +1,205 @@
+"""
+Indexed reader for all_detection_limits.txt, the append-only log of the calibration tools
+Every "Save All Limits" appends one session:
+
+    ========================================
+    DETECTION SESSION: 2025-09-18 16:38:14
+    Detection Method: Hybrid HSV+LAB
+    Total Sticks Detected: 1
+    ========================================
+
+    HSV LIMITS:
+    H Lower: 149, H Upper: 170
+    ...
+    LAB LIMITS:
+    L Lower: 15, L Upper: 100            (L in percent, A and B offset around 0)
+    ...
+    DETECTION RESULTS:
+    Pink: 1                              (the last result line names the calibrated color)
+
+    ========================================
+
+The first read indexes the byte offset and color of every session. Later reads check the
+file size and mtime: unchanged returns the cached ranges, appended sessions are indexed from
+the previous end only. The ranges of a color are parsed from its newest complete session,
+found by walking the index from the end and seeking to it.
+"""
+
+import os
+import threading
+
+LIMITS_FILE = "all_detection_limits.txt"
+SEPARATOR = b"=" * 40
+SESSION_HEADER = b"DETECTION SESSION:"
+
+# Lines that never name the calibrated color
+_NOT_A_COLOR = (b"DETECTION", b"HSV", b"LAB", b"Detection Method:", b"Total Sticks", b"Unique Colors",
+                b"No detection", b"No sticks")
+_LIMIT_KEYS = {b"H": ('hsv', 0), b"S": ('hsv', 1), b"V": ('hsv', 2),
+               b"L": ('lab', 0), b"A": ('lab', 1), b"B": ('lab', 2)}
+
+
+def color_name(line):
+    """Color key of a result line ("Light Green: 2" -> "light_green"), None for any other line"""
+    line = line.strip()
+    if not line or line.startswith(SEPARATOR) or line.startswith(_NOT_A_COLOR) or b"Lower:" in line or b"Upper:" in line:
+        return None
+    name, _, count = line.partition(b":")
+    if count.strip().isdigit():
+        line = name
+    return line.decode(errors='replace').strip().lower().replace(' ', '_')
+
+
+def session_color(data):
+    """Color a session names, looked for from its last line up (it ends with the results)"""
+    data = data.rstrip()
+    if data.endswith(SEPARATOR):
+        data = data[:-len(SEPARATOR)].rstrip()
+    while data:
+        line_start = data.rfind(b"\n") + 1
+        name = color_name(data[line_start:])
+        if name is not None or line_start == 0:
+            return name
+        data = data[:line_start].rstrip()
+    return None
+
+
+def parse_session(data):
+    """
+    Ranges of one session's bytes in OpenCV units, None when a limit line is missing
+
+    Returns:
+        {'hsv': ((h, s, v), (h, s, v)), 'lab': ((l, a, b), (l, a, b))}
+    """
+    lower = {'hsv': [None] * 3, 'lab': [None] * 3}
+    upper = {'hsv': [None] * 3, 'lab': [None] * 3}
+    for line in data.splitlines():
+        line = line.strip()
+        key = _LIMIT_KEYS.get(line[:1])
+        if key is None or not line.startswith(line[:1] + b" Lower:"):
+            continue
+        try:
+            low, high = (int(part.split(b":")[1]) for part in line.split(b",")[:2])
+        except (IndexError, ValueError):
+            return None
+        space, channel = key
+        lower[space][channel], upper[space][channel] = low, high
+    if None in lower['hsv'] + lower['lab']:
+        return None
+    # The file keeps L in percent and A, B around 0, OpenCV scales L to 0-255 and offsets A, B by 127
+    lab_lower, lab_upper = lower['lab'], upper['lab']
+    return {
+        'hsv': (tuple(lower['hsv']), tuple(upper['hsv'])),
+        'lab': ((int(lab_lower[0] * 2.55), lab_lower[1] + 127, lab_lower[2] + 127),
+                (int(lab_upper[0] * 2.55), lab_upper[1] + 127, lab_upper[2] + 127)),
+    }
+
+
+class LimitsIndex:
+    """
+    Session index and latest ranges of one limits file
+
+    Attributes:
+        offsets: Byte offset where each session starts, in file order
+        colors: Color named by each session (None when it names none)
+        scanned_bytes: Bytes read while indexing, for checking that appends are read incrementally
+        parsed_sessions: Sessions whose limits were parsed
+    """
+
+    def __init__(self, path=LIMITS_FILE):
+        self.path = path
+        self.offsets = []
+        self.colors = []
+        self.end = 0  # Indexed length of the file
+        self.key = None  # (size, mtime) of the cached ranges
+        self.ranges = {}
+        self.scanned_bytes = 0
+        self.parsed_sessions = 0
+        self.lock = threading.Lock()
+
+    def latest_ranges(self):
+        """
+        Newest complete ranges of every color, FileNotFoundError when the file does not exist
+
+        Returns:
+            {color: {'hsv': (lower, upper), 'lab': (lower, upper)}}, fresh dicts the caller may change
+        """
+        with self.lock:
+            stat = os.stat(self.path)
+            key = (stat.st_size, stat.st_mtime_ns)
+            if key != self.key:
+                with open(self.path, 'rb') as f:
+                    self.update_index(f, stat.st_size)
+                    self.ranges = self.resolve(f)
+                self.key = key
+            return {color: dict(ranges) for color, ranges in self.ranges.items()}
+
+    def update_index(self, f, size):
+        """Index the sessions appended since the last read, or the whole file when it was rewritten"""
+        if not self.appended(f, size):
+            self.offsets, self.colors, self.end = [], [], 0
+        elif self.offsets:
+            # The last session may have been cut short while it was being written, read it again
+            self.end = self.offsets.pop()
+            self.colors.pop()
+        f.seek(self.end)
+        data = f.read(size - self.end)
+        self.scanned_bytes += len(data)
+        starts = []
+        header = data.find(SESSION_HEADER)
+        while header != -1:
+            line_start = data.rfind(b"\n", 0, header) + 1
+            if not data[line_start:header].strip():
+                starts.append(self.session_start(data, line_start))
+            header = data.find(SESSION_HEADER, header + len(SESSION_HEADER))
+        for start, end in zip(starts, starts[1:] + [len(data)]):
+            self.offsets.append(self.end + start)
+            self.colors.append(session_color(data[start:end]))
+        self.end = size
+
+    @staticmethod
+    def session_start(data, line_start):
+        """Offset of the separator line written just before a header line, else of the header line"""
+        separator = data.rfind(SEPARATOR, 0, line_start)
+        if separator == -1 or data[separator + len(SEPARATOR):line_start].strip():
+            return line_start
+        separator_line = data.rfind(b"\n", 0, separator) + 1
+        return separator_line if not data[separator_line:separator].strip() else line_start
+
+    def appended(self, f, size):
+        """Whether the file only grew since the last read (the last indexed session is still in place)"""
+        if size <= self.end:
+            return False  # Truncated, or rewritten in place with a new mtime
+        if not self.offsets:
+            return True
+        f.seek(self.offsets[-1])
+        head = f.readline().strip()
+        return head == SEPARATOR or head.startswith(SESSION_HEADER)
+
+    def resolve(self, f):
+        """Parse the newest complete session of each color, walking the index from the end"""
+        ranges = {}
+        ends = self.offsets[1:] + [self.end]
+        for index in range(len(self.offsets) - 1, -1, -1):
+            color = self.colors[index]
+            if color is None or color in ranges:
+                continue
+            f.seek(self.offsets[index])
+            session = parse_session(f.read(ends[index] - self.offsets[index]))
+            self.parsed_sessions += 1
+            if session is not None:
+                ranges[color] = session
+        # Colors in the order they were first calibrated, as a full parse would list them
+        order = {color: index for index, color in reversed(list(enumerate(self.colors)))}
+        return dict(sorted(ranges.items(), key=lambda item: order[item[0]]))
+
+
+_indexes = {}
+_indexes_lock = threading.Lock()
+
+
+def latest_ranges(path=LIMITS_FILE):
+    """Latest ranges per color of a limits file, through one cached LimitsIndex per path"""
+    with _indexes_lock:
+        index = _indexes.setdefault(os.path.abspath(path), LimitsIndex(path))
+    return index.latest_ranges()
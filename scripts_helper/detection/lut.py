@@ -0,0 +1,111 @@
+"""
+Lookup-table color classifier for the stick detectors
+Precomputes a BGR -> color label (or color bitmask) table once so each frame is labeled
+in a single pass
+"""
+
+import cv2
+import numpy as np
+
+
+class ColorLUT:
+    """
+    Single-pass multi-color classifier built from a calibrated color table
+
+    Every quantized BGR value is converted to HSV (and LAB) once at startup and
+    tested against all calibrated ranges. The result is a 3D table of labels, so
+    classifying a frame is one gather instead of two cvtColor calls plus one
+    inRange per color. Label 0 is background, label i is the i-th color of the
+    table. Where ranges overlap, the first color in table order wins.
+
+    With packed=True the table holds a uint16 bitmask instead (bit i - 1 set when
+    color i matches), so overlapping ranges give exactly the per-color inRange masks
+    and the classified frame is one 2-byte image for up to 16 colors.
+    """
+
+    def __init__(self, color_table, use_lab=False, bits=8, packed=False):
+        """
+        Args:
+            color_table: Compiled ColorTable (see detection/color_table.py)
+            use_lab: Require both the HSV and LAB ranges to match (enhanced/hybrid mode)
+            bits: Bits kept per channel (8 = exact, fewer = smaller table, coarser edges)
+            packed: Classify to a per-pixel color bitmask instead of a single label
+        """
+        if not 1 <= bits <= 8:
+            raise ValueError(f"bits must be between 1 and 8, got {bits}")
+        self.color_names = list(color_table.names)
+        if packed and len(self.color_names) > 16:
+            raise ValueError("A packed ColorLUT supports at most 16 colors")
+        if len(self.color_names) > 254:
+            raise ValueError("ColorLUT supports at most 254 colors")
+        self.use_lab = use_lab
+        self.packed = packed
+        self.bits = bits
+        self.shift = 8 - bits
+        self.table = self._build_table(color_table)
+
+    def _build_table(self, color_table):
+        levels = 1 << self.bits
+        # Sample each quantization bin at its center so edges round evenly
+        values = (np.arange(levels, dtype=np.uint16) << self.shift) + ((1 << self.shift) >> 1)
+        values = values.astype(np.uint8)
+        b, g, r = np.meshgrid(values, values, values, indexing='ij')
+        bgr = np.stack((b.ravel(), g.ravel(), r.ravel()), axis=-1).reshape(-1, 1, 3)
+
+        hsv = cv2.cvtColor(bgr, cv2.COLOR_BGR2HSV)
+        lab = cv2.cvtColor(bgr, cv2.COLOR_BGR2LAB) if self.use_lab else None
+
+        table = np.zeros(levels ** 3, dtype=np.uint16 if self.packed else np.uint8)
+        # Paint in reverse so the first color in table order wins on overlaps
+        for entry in reversed(color_table.entries):
+            mask = cv2.inRange(hsv, entry.hsv_lower, entry.hsv_upper)
+            if lab is not None:
+                lab_mask = cv2.inRange(lab, entry.lab_lower, entry.lab_upper)
+                mask = cv2.bitwise_and(mask, lab_mask)
+            if self.packed:
+                table[mask.ravel() > 0] |= self.bit(entry.label)
+            else:
+                table[mask.ravel() > 0] = entry.label
+        return table
+
+    @staticmethod
+    def bit(label):
+        """Bitmask value of a label in a packed classification"""
+        return 1 << (label - 1)
+
+    def classify(self, frame):
+        """Label a BGR frame in one vectorized pass (uint8 label image, or uint16 bitmask image when packed)"""
+        channels = frame if self.shift == 0 else np.right_shift(frame, self.shift)
+        # Build the index in place as intp, the type np.take would convert it to anyway
+        index = channels[..., 0].astype(np.intp)
+        index <<= self.bits
+        index |= channels[..., 1]
+        index <<= self.bits
+        index |= channels[..., 2]
+        return np.take(self.table, index)
+
+    def label_counts(self, labels):
+        """Pixel count per label (index 0 is background, pixels matching no color)"""
+        counts = np.bincount(labels.ravel(), minlength=len(self.color_names) + 1)
+        if not self.packed:
+            return counts
+        # One histogram of the bitmask values, then per bit the counts of the values having it
+        values = np.flatnonzero(counts)
+        label_counts = np.zeros(len(self.color_names) + 1, dtype=counts.dtype)
+        label_counts[0] = counts[0]
+        for label in range(1, len(self.color_names) + 1):
+            label_counts[label] = counts[values[(values & self.bit(label)) != 0]].sum()
+        return label_counts
+
+    def mask(self, labels, label, out=None, scratch=None):
+        """
+        Binary 0/255 mask of a single label, ready for morphology and findContours
+
+        Args:
+            out: uint8 image of the labels' shape to write the mask into (allocated if None)
+            scratch: uint16 image of the same shape for the bit test of a packed
+                classification (allocated if None)
+        """
+        if not self.packed:
+            return cv2.compare(labels, label, cv2.CMP_EQ, dst=out)
+        return cv2.compare(np.bitwise_and(labels, self.bit(label), out=scratch), 0, cv2.CMP_NE, dst=out)
@@ -0,0 +1,139 @@
+"""
+Motion gate in front of color detection
+A low-resolution difference against the last detected crop decides whether detection can reuse
+the previous results, rerun on the changed tiles only, or has to process the whole crop
+"""
+
+import cv2
+import numpy as np
+
+# Thumbnail pixels per tile side, a tile changes when any of its thumbnail pixels does
+TILE_THUMBNAIL_PIXELS = 4
+
+
+class MotionGate:
+    """
+    Tile-level change detector for one camera crop
+
+    The crop is divided into a grid of tiles. Each check shrinks the crop to a
+    thumbnail with INTER_AREA (which averages away sensor noise) and compares it
+    with the thumbnail of the last crop that was actually detected. Reference
+    updates only happen on detection, so slow drift still accumulates until it
+    crosses the threshold.
+    """
+
+    def __init__(self, grid=(8, 8), pixel_threshold=20, full_fraction=0.5):
+        """
+        Args:
+            grid: (columns, rows) of tiles over the crop
+            pixel_threshold: Thumbnail level change (any channel) that counts as motion
+            full_fraction: Above this fraction of the crop area a partial pass is not worth it
+        """
+        self.columns, self.rows = grid
+        self.pixel_threshold = pixel_threshold
+        self.full_fraction = full_fraction
+        self.reference = None
+        self.checks = 0
+        self.reused = 0
+        self.partial = 0
+        self.full = 0
+
+    def thumbnail(self, frame):
+        size = (self.columns * TILE_THUMBNAIL_PIXELS, self.rows * TILE_THUMBNAIL_PIXELS)
+        return cv2.resize(frame, size, interpolation=cv2.INTER_AREA)
+
+    def changed_tiles(self, thumbnail):
+        """Boolean (rows, columns) array of tiles that moved since the reference"""
+        difference = cv2.absdiff(thumbnail, self.reference).max(axis=2) > self.pixel_threshold
+        tiles = difference.reshape(self.rows, TILE_THUMBNAIL_PIXELS, self.columns, TILE_THUMBNAIL_PIXELS)
+        return tiles.any(axis=(1, 3))
+
+    def check(self, frame, previous_boxes=()):
+        """
+        Decide how much of the crop has to be detected again
+
+        Args:
+            frame: Analysis crop (the same shape on every call)
+            previous_boxes: (x, y, w, h) boxes of the last results in frame pixels, a dirty
+                region touching one of them grows to cover it so no object is cut in half
+
+        Returns:
+            None when nothing changed (reuse the last results), otherwise the
+            (x_start, y_start, x_end, y_end) region of frame to detect on. The region
+            is the whole frame when there is no reference or too much changed.
+        """
+        self.checks += 1
+        height, width = frame.shape[:2]
+        whole = (0, 0, width, height)
+        thumbnail = self.thumbnail(frame)
+
+        if self.reference is None or self.reference.shape != thumbnail.shape:
+            self.reference = thumbnail
+            self.full += 1
+            return whole
+
+        changed = self.changed_tiles(thumbnail)
+        if not changed.any():
+            self.reused += 1
+            return None
+
+        # Bounding box of the changed tiles plus one tile of margin for the filter and closing kernel
+        rows, columns = np.nonzero(changed)
+        tile_w, tile_h = width / self.columns, height / self.rows
+        x_start = int((max(columns.min() - 1, 0)) * tile_w)
+        y_start = int((max(rows.min() - 1, 0)) * tile_h)
+        x_end = min(int(np.ceil((columns.max() + 2) * tile_w)), width)
+        y_end = min(int(np.ceil((rows.max() + 2) * tile_h)), height)
+
+        # Grow over every previous object the region touches, until nothing else overlaps
+        grown = True
+        while grown:
+            grown = False
+            for x, y, w, h in previous_boxes:
+                if x < x_end and x + w > x_start and y < y_end and y + h > y_start:
+                    if x < x_start or y < y_start or x + w > x_end or y + h > y_end:
+                        x_start, y_start = min(x_start, x), min(y_start, y)
+                        x_end, y_end = max(x_end, x + w), max(y_end, y + h)
+                        grown = True
+        region = (max(x_start, 0), max(y_start, 0), min(x_end, width), min(y_end, height))
+
+        self.reference = thumbnail
+        if (region[2] - region[0]) * (region[3] - region[1]) > self.full_fraction * width * height:
+            self.full += 1
+            return whole
+        self.partial += 1
+        return region
+
+    def reset(self):
+        """Drop the reference, the next check always processes the whole crop"""
+        self.reference = None
+
+    def stats(self):
+        """Gate counters, hit_rate is the share of checks that reused the previous results"""
+        return {'gate_checks': self.checks, 'gate_reused': self.reused, 'gate_partial': self.partial,
+                'gate_full': self.full, 'gate_hit_rate': self.reused / self.checks if self.checks else 0.0}
+
+
+def merge_detections(previous, fresh, region, scale=1.0):
+    """
+    Combine the last results with a partial pass over region
+
+    Args:
+        previous: Last per-color results, boxes in crop pixels
+        fresh: Results of the pass over region, boxes in crop pixels relative to the region
+        region: (x_start, y_start, x_end, y_end) in analysis pixels
+        scale: Analysis scale, converts region to crop pixels
+
+    Returns:
+        Per-color results in table order: previous objects outside the region plus the fresh ones
+    """
+    x_start, y_start = int(region[0] / scale), int(region[1] / scale)
+    x_end, y_end = int(region[2] / scale), int(region[3] / scale)
+    previous_objects = dict(previous)
+    merged = []
+    for color_name, objects in fresh:
+        kept = [obj for obj in previous_objects.get(color_name, [])
+                if obj[0] + obj[2] <= x_start or obj[0] >= x_end or obj[1] + obj[3] <= y_start or obj[1] >= y_end]
+        moved = [(x + x_start, y + y_start, w, h, area) for x, y, w, h, area in objects]
+        merged.append((color_name, kept + moved))
+    return merged
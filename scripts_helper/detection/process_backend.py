@@ -0,0 +1,144 @@
+"""
+Multiprocessing detection backend
+Each camera's detection runs in its own process so the camera threads stop competing for the GIL.
+Frames travel through shared memory, only small detection lists are pickled back.
+"""
+
+import multiprocessing
+import queue
+import signal
+from multiprocessing import shared_memory
+
+import numpy as np
+
+from detection.blobs import BASELINE_BLOB_METHOD
+from detection.color_detector import find_color_detections
+from detection.color_table import ColorTable
+from detection.lut import ColorLUT
+from detection.prefilter import BASELINE_PREFILTER
+
+
+def _attach_shared_memory(name):
+    """Attach to the parent's block, the parent alone is responsible for unlinking it"""
+    try:
+        return shared_memory.SharedMemory(name=name, track=False)  # Python 3.13+
+    except TypeError:
+        # Older versions register the block with the resource tracker the spawned
+        # worker shares with its parent, which is a no-op for an already tracked name
+        return shared_memory.SharedMemory(name=name)
+
+
+def _detection_worker(shm_name, frame_shape, requests, results, calibrated_colors, use_enhanced, use_lut, lut_packed,
+                      scale, prefilter, blob_method, mask_factor):
+    """Worker loop: wait for a frame sequence number, detect on the shared frame, send the result back"""
+    # Ctrl+C is handled by the parent, which shuts workers down cleanly
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+
+    shm = _attach_shared_memory(shm_name)
+    frame = np.ndarray(frame_shape, dtype=np.uint8, buffer=shm.buf)
+    # Compile the table once in the worker, only the plain dict crosses the process boundary
+    color_table = ColorTable(calibrated_colors)
+    color_lut = ColorLUT(color_table, use_lab=use_enhanced, packed=lut_packed) if use_lut else None
+
+    try:
+        while True:
+            sequence = requests.get()
+            if sequence is None:
+                break
+            detections = find_color_detections(frame, color_table, use_enhanced, color_lut, scale, prefilter,
+                                               blob_method, mask_factor=mask_factor)
+            results.put((sequence, detections))
+    finally:
+        del frame
+        shm.close()
+
+
+class ProcessDetector:
+    """
+    Detection worker process for one camera
+
+    The caller copies the cropped frame into a shared memory block and blocks on
+    the result queue, which releases the GIL for the other camera threads while
+    the worker does the OpenCV and Python-level work.
+    """
+
+    def __init__(self, camera_index, frame_shape, calibrated_colors, use_enhanced=False, use_lut=False, lut_packed=False,
+                 scale=1.0, prefilter=BASELINE_PREFILTER, blob_method=BASELINE_BLOB_METHOD, mask_factor=1, timeout=2.0):
+        self.camera_index = camera_index
+        self.frame_shape = tuple(frame_shape)
+        self.timeout = timeout
+        self.sequence = 0
+        self.pending = None  # Sequence the worker has not answered yet, it may still read the frame
+        self.skipped = 0  # Frames not sent because the worker was still on a timed-out one
+
+        # Spawn keeps the worker independent of the parent's threads and MQTT loop
+        context = multiprocessing.get_context("spawn")
+        self.shm = shared_memory.SharedMemory(create=True, size=int(np.prod(self.frame_shape)))
+        self.frame = np.ndarray(self.frame_shape, dtype=np.uint8, buffer=self.shm.buf)
+        self.requests = context.Queue(maxsize=1)
+        self.results = context.Queue()
+        self.process = context.Process(
+            target=_detection_worker,
+            args=(self.shm.name, self.frame_shape, self.requests, self.results,
+                  calibrated_colors, use_enhanced, use_lut, lut_packed, scale, prefilter, blob_method,
+                  mask_factor),
+            name=f"detector-camera-{camera_index}",
+            daemon=True,
+        )
+        self.process.start()
+        print(f"Camera {camera_index} - Detection worker process started (pid {self.process.pid})")
+
+    def detect(self, frame):
+        """
+        Detect colors on a cropped frame in the worker process
+
+        Returns:
+            The worker's per-color detection list, or None if it did not answer in time
+            or is still busy with a frame that timed out earlier
+        """
+        if self.pending is not None:
+            # Overwriting the shared frame while the worker reads it would tear it, take the
+            # late answer first and skip this frame while there is none
+            answered, _ = self.wait_result(timeout=None)
+            if not answered:
+                self.skipped += 1
+                return None
+        np.copyto(self.frame, frame)
+        self.sequence += 1
+        self.pending = self.sequence
+        self.requests.put(self.sequence)
+        return self.wait_result(self.timeout)[1]
+
+    def wait_result(self, timeout):
+        """
+        Wait for the answer to the pending frame (timeout None = only take one already there)
+
+        Returns:
+            (answered, detections), answered is False when the worker has not finished the frame
+        """
+        while True:
+            try:
+                if timeout is None:
+                    sequence, detections = self.results.get_nowait()
+                else:
+                    sequence, detections = self.results.get(timeout=timeout)
+            except queue.Empty:
+                return False, None
+            # The worker answers in order, only the pending frame is still outstanding
+            if sequence == self.pending:
+                self.pending = None
+                return True, detections
+
+    def close(self):
+        """Stop the worker and release the shared memory block"""
+        try:
+            self.requests.put(None, timeout=self.timeout)
+        except queue.Full:
+            pass
+        self.process.join(timeout=self.timeout)
+        if self.process.is_alive():
+            self.process.terminate()
+            self.process.join()
+        del self.frame
+        self.shm.close()
+        self.shm.unlink()
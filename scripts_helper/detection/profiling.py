@@ -0,0 +1,83 @@
+"""
+Lightweight stage timing for the detection pipeline
+"""
+
+import time
+from collections import defaultdict, deque
+from contextlib import contextmanager, nullcontext
+
+import numpy as np
+
+
+class StageTimer:
+    """Accumulates wall time per named pipeline stage using perf_counter_ns"""
+
+    def __init__(self, keep_samples=False, window=None):
+        """
+        Args:
+            keep_samples: Also keep one sample per stage and frame (see end_frame) for percentiles
+            window: Keep only the last window samples per stage (rolling percentiles), None = all
+        """
+        self.totals_ns = defaultdict(int)
+        self.counts = defaultdict(int)
+        self.keep_samples = keep_samples
+        self.window = window
+        self.samples_ns = defaultdict(list) if window is None else defaultdict(lambda: deque(maxlen=window))
+        self._frame_ns = defaultdict(int)
+
+    @contextmanager
+    def stage(self, name):
+        start = time.perf_counter_ns()
+        try:
+            yield
+        finally:
+            elapsed = time.perf_counter_ns() - start
+            self.totals_ns[name] += elapsed
+            self.counts[name] += 1
+            if self.keep_samples:
+                self._frame_ns[name] += elapsed
+
+    def end_frame(self):
+        """Close the current frame: every stage that ran adds its summed time as one sample"""
+        for name, elapsed in self._frame_ns.items():
+            self.samples_ns[name].append(elapsed)
+        self._frame_ns.clear()
+
+    def mean_ms(self, name):
+        """Mean duration of a stage in milliseconds (0.0 if it never ran)"""
+        count = self.counts.get(name, 0)
+        return self.totals_ns[name] / count / 1e6 if count else 0.0
+
+    def percentiles_ms(self, name, percentiles=(50, 95, 99)):
+        """Per-frame percentiles of a stage in milliseconds (zeros without samples)"""
+        samples = list(self.samples_ns.get(name, ()))  # Copied in one step, a grabber thread may be appending
+        if not samples:
+            return tuple(0.0 for _ in percentiles)
+        return tuple(np.percentile(samples, percentiles) / 1e6)
+
+    def rolling_summary(self, percentiles=(50, 95, 99)):
+        """Per-stage {'p50': ms, ...} over the kept samples, in first-seen order"""
+        return {name: {f"p{p}": round(value, 3) for p, value in zip(percentiles, self.percentiles_ms(name, percentiles))}
+                for name in list(self.samples_ns)}
+
+    def summary(self):
+        """Mean milliseconds per stage, in first-seen order"""
+        return {name: self.mean_ms(name) for name in self.counts}
+
+
+class NullTimer:
+    """StageTimer stand-in that measures nothing, the default outside of benchmarks"""
+
+    _null_stage = nullcontext()
+
+    def stage(self, name):
+        return self._null_stage
+
+    def end_frame(self):
+        pass
+
+    def rolling_summary(self, percentiles=(50, 95, 99)):
+        return {}
+
+
+NULL_TIMER = NullTimer()
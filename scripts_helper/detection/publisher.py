@@ -0,0 +1,71 @@
+"""
+Publish-on-change for camera score messages
+A score is only sent when it differs from the last one sent, and changes that follow
+each other within the coalescing window go out as one message carrying the newest value
+"""
+
+
+class ScorePublisher:
+    """
+    Leading- and trailing-edge throttle for one camera's score
+
+    The first change after a quiet period is sent at once. Further changes within
+    coalesce_seconds are held and only the newest is sent when the window has passed,
+    on the next update() or poll(). Scores equal to the last one sent are dropped.
+    Times are the caller's timestamps (media time or monotonic clock).
+    """
+
+    def __init__(self, send, coalesce_seconds=0.2):
+        """
+        Args:
+            send: Called as send(score, colors, timestamp) for every message that goes out
+            coalesce_seconds: Minimum time between two messages
+        """
+        self.send = send
+        self.coalesce_seconds = coalesce_seconds
+        self.last_score = None
+        self.last_sent_time = None
+        self.pending = None  # (score, colors, timestamp) waiting for the window to pass
+        self.sent = 0
+        self.unchanged = 0  # Updates dropped because the score did not change
+        self.coalesced = 0  # Held updates replaced by a newer one before going out
+
+    def reset(self):
+        """Forget the last score (a new round must announce its first score again)"""
+        self.last_score = None
+        self.last_sent_time = None
+        self.pending = None
+
+    def update(self, score, colors, timestamp):
+        """Offer the current score, sending it now or holding it for the coalescing window"""
+        if self.pending is not None:
+            self.coalesced += 1
+            self.pending = None
+        if score == self.last_score:
+            self.unchanged += 1
+            return
+        self.pending = (score, colors, timestamp)
+        self.poll(timestamp)
+
+    def poll(self, timestamp):
+        """Send the held score once the coalescing window has passed (call once per frame)"""
+        if self.pending is None:
+            return
+        # A clock that went backwards (looping clip) does not hold the score forever
+        if self.last_sent_time is not None and 0.0 <= timestamp - self.last_sent_time < self.coalesce_seconds - 1e-9:
+            return
+        self.flush(timestamp)
+
+    def flush(self, timestamp=None):
+        """Send the held score immediately, if any (timestamp defaults to the held score's own)"""
+        if self.pending is None:
+            return
+        score, colors, frame_timestamp = self.pending
+        self.pending = None
+        self.last_score = score
+        self.last_sent_time = timestamp if timestamp is not None else frame_timestamp
+        self.sent += 1
+        self.send(score, colors, frame_timestamp)
+
+    def stats(self):
+        return {'scores_sent': self.sent, 'scores_unchanged': self.unchanged, 'scores_coalesced': self.coalesced}
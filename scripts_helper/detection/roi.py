@@ -0,0 +1,97 @@
+"""
+Shared region-of-interest configuration for every detector entry point
+Frames are cropped (and optionally downscaled) before blur, color conversion and masks
+"""
+
+from dataclasses import dataclass
+from typing import Optional, Tuple
+
+import cv2
+
+from detection.profiling import StageTimer
+
+
+@dataclass
+class ROIConfig:
+    """Play-area crop plus analysis resolution for one video source"""
+    crop: Optional[Tuple[int, int, int, int]] = None  # (x_start, y_start, x_end, y_end), None = full frame
+    scale: float = 1.0  # Analysis downscale factor (0.5 = half resolution)
+
+    def crop_frame(self, frame):
+        """
+        Crop a full frame to the play area
+
+        Returns:
+            (cropped_frame, (x_offset, y_offset)), the crop is a view, no copy is made
+        """
+        if self.crop is None:
+            return frame, (0, 0)
+        x_start, y_start, x_end, y_end = self.crop
+        return frame[y_start:y_end, x_start:x_end], (x_start, y_start)
+
+    def downscale(self, frame):
+        """Resize a cropped frame to the analysis resolution (no-op at scale 1.0)"""
+        if self.scale == 1.0:
+            return frame
+        return cv2.resize(frame, None, fx=self.scale, fy=self.scale, interpolation=cv2.INTER_AREA)
+
+    def apply(self, frame):
+        """Crop then downscale, returning (analysis_frame, (x_offset, y_offset))"""
+        cropped, offset = self.crop_frame(frame)
+        return self.downscale(cropped), offset
+
+    def to_frame_box(self, x, y, w, h):
+        """Map a box from analysis coordinates back to full-frame coordinates"""
+        x_offset, y_offset = self.crop[:2] if self.crop is not None else (0, 0)
+        return (int(x / self.scale) + x_offset, int(y / self.scale) + y_offset,
+                int(w / self.scale), int(h / self.scale))
+
+    def draw(self, frame, color=(0, 255, 0)):
+        """Outline the play area on a display frame"""
+        if self.crop is not None:
+            x_start, y_start, x_end, y_end = self.crop
+            cv2.rectangle(frame, (x_start, y_start), (x_end, y_end), color, 2)
+
+
+# Play-area crop for each station camera (same order as the RTSP URL list)
+STATION_ROIS = [
+    ROIConfig(crop=(450, 370, 820, 900)),  # Camera 1
+    ROIConfig(crop=(450, 370, 840, 900)),  # Camera 2
+    ROIConfig(crop=(450, 370, 830, 900)),  # Camera 3
+    ROIConfig(crop=(460, 350, 840, 700)),  # Camera 4
+    ROIConfig(crop=(450, 350, 830, 720)),  # Camera 5
+]
+
+# Play area used by the calibration and GUI test tools
+TOOL_ROI = ROIConfig(crop=(450, 350, 850, 900))
+
+
+def measure_roi_savings(frame, roi, repeats=3):
+    """
+    Time bilateral filter and color conversions on the full frame vs the ROI
+
+    Returns:
+        Dict of stage -> (full_frame_ms, roi_ms)
+    """
+    full_timer = StageTimer()
+    roi_timer = StageTimer()
+    for _ in range(repeats):
+        for timer, source in ((full_timer, frame), (roi_timer, None)):
+            if source is None:
+                with timer.stage('crop/resize'):
+                    source, _ = roi.apply(frame)
+            with timer.stage('bilateral'):
+                filtered = cv2.bilateralFilter(source, d=9, sigmaColor=75, sigmaSpace=75)
+            with timer.stage('cvtColor HSV'):
+                cv2.cvtColor(filtered, cv2.COLOR_BGR2HSV)
+            with timer.stage('cvtColor LAB'):
+                cv2.cvtColor(filtered, cv2.COLOR_BGR2LAB)
+    return {stage: (full_timer.mean_ms(stage), roi_timer.mean_ms(stage))
+            for stage in roi_timer.counts}
+
+
+def format_roi_savings(savings):
+    """One-line summary of measure_roi_savings() output"""
+    parts = [f"{stage} {full:.1f}->{cropped:.1f} ms" for stage, (full, cropped) in savings.items()]
+    saved = sum(full - cropped for full, cropped in savings.values())
+    return f"{', '.join(parts)} | saved {saved:.1f} ms/frame"
@@ -0,0 +1,71 @@
+"""
+Adaptive detection rate for the camera threads
+Detection runs at a target rate, speeds up when the crop changes and slows down while it is static
+"""
+
+import cv2
+
+# Size of the thumbnail used to decide whether the scene changed
+THUMBNAIL_SIZE = (32, 24)
+
+
+def scene_thumbnail(frame):
+    """Tiny color summary of a BGR crop, cheap enough to compute on every frame"""
+    return cv2.resize(frame, THUMBNAIL_SIZE, interpolation=cv2.INTER_AREA)
+
+
+def changed_fraction(thumbnail, previous, pixel_threshold):
+    """Fraction of thumbnail pixels where any channel moved by more than pixel_threshold"""
+    difference = cv2.absdiff(thumbnail, previous).max(axis=2)
+    return cv2.countNonZero(cv2.threshold(difference, pixel_threshold, 255, cv2.THRESH_BINARY)[1]) / difference.size
+
+
+class AdaptiveScheduler:
+    """
+    Decides which decoded frames get a detection pass
+
+    Starts at target_fps. A frame whose thumbnail differs from the last detected
+    one on more than change_fraction of its pixels (by more than pixel_threshold
+    levels, so sensor noise is ignored) is detected immediately and the rate
+    jumps to max_fps. Every detection that finds the scene static halves the
+    rate, down to min_fps. Timestamps are in seconds.
+    """
+
+    def __init__(self, target_fps=8.0, min_fps=4.0, max_fps=25.0, pixel_threshold=20, change_fraction=0.005):
+        self.target_interval = 1.0 / target_fps
+        self.min_interval = 1.0 / max_fps
+        self.max_interval = 1.0 / min_fps
+        self.pixel_threshold = pixel_threshold
+        self.change_fraction = change_fraction
+        self.interval = self.target_interval
+        self.last_detection = None
+        self.last_thumbnail = None
+        self.detected = 0
+        self.skipped = 0
+
+    def reset(self):
+        """Forget the previous detection, the next frame is always detected at the target rate"""
+        self.interval = self.target_interval
+        self.last_detection = None
+        self.last_thumbnail = None
+
+    def should_detect(self, frame, timestamp):
+        """Return True if this crop should be detected, False to skip it"""
+        thumbnail = scene_thumbnail(frame)
+        if self.last_thumbnail is not None:
+            if changed_fraction(thumbnail, self.last_thumbnail, self.pixel_threshold) > self.change_fraction:
+                self.interval = self.min_interval
+            elif timestamp - self.last_detection < self.interval - 1e-6:
+                self.skipped += 1
+                return False
+            else:
+                # Static at the scheduled time, back off towards the slowest rate
+                self.interval = min(self.interval * 2, self.max_interval)
+
+        self.last_detection = timestamp
+        self.last_thumbnail = thumbnail
+        self.detected += 1
+        return True
+
+    def stats(self):
+        return {'detected': self.detected, 'skipped': self.skipped, 'fps': 1.0 / self.interval}
@@ -0,0 +1,168 @@
+"""
+Synthetic stick scenes for load-testing the vision path without cameras
+Scenes render moving colored sticks with sensor noise and lighting drift into numpy frames,
+and SyntheticCapture serves them in real time through the cv2.VideoCapture interface
+"""
+
+import time
+from dataclasses import dataclass
+from typing import Tuple
+
+import cv2
+import numpy as np
+
+SYNTHETIC_SCHEME = "synthetic://"
+NOISE_FRAMES = 8  # Precomputed noise patterns cycled over frames, drawing new noise per frame costs more than detection
+
+# Scenes registered by name, opened through "synthetic://<name>" sources
+SCENES = {}
+
+
+@dataclass
+class SceneConfig:
+    """Rendering parameters of one synthetic camera"""
+    width: int = 1920
+    height: int = 1080
+    fps: float = 25.0
+    sticks: int = 6
+    stick_size: Tuple[int, int] = (50, 180)  # (width, length) in pixels, 9000 px is above every area limit
+    speed: float = 40.0  # Stick drift in pixels per second
+    noise: int = 8  # Additive sensor noise per channel (0 = none)
+    lighting: float = 0.1  # Brightness swing around 1.0 (0.1 = +-10%)
+    lighting_period: float = 8.0  # Seconds per brightness cycle
+    appear_interval: float = 0.0  # Seconds between sticks entering the scene (0 = all at once)
+    background: int = 35  # Gray level of the empty play area
+    seed: int = 0
+
+
+class SyntheticScene:
+    """
+    Deterministic renderer: render(index) always returns the same frame for the same
+    config, so a scene can also be replayed frame by frame in benchmarks and tests
+    """
+
+    def __init__(self, config, color_table):
+        """
+        Args:
+            config: SceneConfig
+            color_table: Compiled ColorTable, each stick is painted in the middle of one color's HSV range
+        """
+        self.config = config
+        rng = np.random.default_rng(config.seed)
+        colors = []
+        for entry in color_table:
+            hsv = ((entry.hsv_lower.astype(int) + entry.hsv_upper.astype(int)) // 2).astype(np.uint8)
+            colors.append(tuple(int(c) for c in cv2.cvtColor(hsv.reshape(1, 1, 3), cv2.COLOR_HSV2BGR)[0, 0]))
+
+        self.sticks = []
+        for i in range(config.sticks):
+            angle = rng.uniform(0, 2 * np.pi)
+            self.sticks.append({
+                'bgr': colors[i % len(colors)],
+                'origin': rng.uniform((0.15, 0.15), (0.85, 0.85)) * (config.width, config.height),
+                'velocity': config.speed * np.array((np.cos(angle), np.sin(angle))),
+                'tilt': rng.uniform(-30, 30),
+            })
+        self.background = np.full((config.height, config.width, 3), config.background, dtype=np.uint8)
+        self.noise = [rng.integers(0, config.noise + 1, self.background.shape, dtype=np.uint8)
+                      for _ in range(NOISE_FRAMES)] if config.noise > 0 else []
+
+    def stick_center(self, stick, seconds):
+        """Drift with reflection on the frame borders"""
+        config = self.config
+        margin = max(config.stick_size) / 2
+        span = np.array((config.width, config.height)) - 2 * margin
+        position = (stick['origin'] - margin + stick['velocity'] * seconds) % (2 * span)
+        position = np.where(position > span, 2 * span - position, position)
+        return position + margin
+
+    def render(self, index, out=None):
+        """Frame number index as a BGR image (written into out when its shape matches)"""
+        config = self.config
+        seconds = index / config.fps
+        frame = out if out is not None and out.shape == self.background.shape else np.empty_like(self.background)
+        np.copyto(frame, self.background)
+
+        visible = len(self.sticks)
+        if config.appear_interval > 0:
+            visible = min(visible, 1 + int(seconds / config.appear_interval))
+        for stick in self.sticks[:visible]:
+            box = cv2.boxPoints((tuple(self.stick_center(stick, seconds)), config.stick_size, stick['tilt']))
+            cv2.fillConvexPoly(frame, box.astype(np.int32), stick['bgr'])
+
+        if config.lighting:
+            gain = 1.0 + config.lighting * np.sin(2 * np.pi * seconds / config.lighting_period)
+            cv2.convertScaleAbs(frame, frame, alpha=gain)
+        if self.noise:
+            cv2.add(frame, self.noise[index % len(self.noise)], frame)
+        return frame
+
+    def frames(self, count):
+        """Yield the first count frames"""
+        for index in range(count):
+            yield self.render(index)
+
+
+class SyntheticCapture:
+    """
+    cv2.VideoCapture stand-in serving a scene like a live camera
+
+    read() blocks until the next frame is due at the scene's frame rate and never
+    waits for the consumer, so a slow pipeline sees dropped frames exactly as it
+    would with an RTSP camera.
+    """
+
+    def __init__(self, scene):
+        self.scene = scene
+        self.index = 0
+        self.start_time = None
+        self.opened = True
+
+    def isOpened(self):
+        return self.opened
+
+    def read(self, image=None):
+        if not self.opened:
+            return False, None
+        now = time.monotonic()
+        if self.start_time is None:
+            self.start_time = now
+        due = self.start_time + self.index / self.scene.config.fps
+        if due > now:
+            time.sleep(due - now)
+        frame = self.scene.render(self.index, image)
+        self.index += 1
+        return True, frame
+
+    def get(self, prop_id):
+        if prop_id == cv2.CAP_PROP_FPS:
+            return self.scene.config.fps
+        if prop_id == cv2.CAP_PROP_FRAME_WIDTH:
+            return self.scene.config.width
+        if prop_id == cv2.CAP_PROP_FRAME_HEIGHT:
+            return self.scene.config.height
+        return 0.0
+
+    def set(self, prop_id, value):
+        return False
+
+    def release(self):
+        self.opened = False
+
+
+def register_scene(name, scene):
+    """Make a scene available as the "synthetic://<name>" source, returning that source string"""
+    SCENES[name] = scene
+    return SYNTHETIC_SCHEME + name
+
+
+def is_synthetic_source(source):
+    return isinstance(source, str) and source.startswith(SYNTHETIC_SCHEME)
+
+
+def open_synthetic(source):
+    """SyntheticCapture for a registered "synthetic://<name>" source"""
+    name = source[len(SYNTHETIC_SCHEME):]
+    if name not in SCENES:
+        raise ValueError(f"Unknown synthetic scene '{name}', register it with register_scene() first")
+    return SyntheticCapture(SCENES[name])
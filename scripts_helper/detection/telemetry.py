@@ -0,0 +1,120 @@
+"""
+Rate-limited detection telemetry for the camera threads
+Counters and histograms are updated in memory on every detection pass and printed as one
+summary line per flush interval, instead of a line per contour and per frame
+"""
+
+import bisect
+import time
+from collections import Counter
+
+# Upper edges of the object area histogram (crop pixels), the last bin is open-ended
+AREA_BIN_EDGES = (1000, 2500, 5000, 10000, 20000, 50000)
+# Objects per detection pass are counted exactly up to this value, the last bin is "or more"
+MAX_OBJECTS_BIN = 5
+
+
+def area_bin_labels():
+    """Human-readable labels matching the area histogram bins"""
+    return [f"<{edge / 1000:g}k" for edge in AREA_BIN_EDGES] + [f">={AREA_BIN_EDGES[-1] / 1000:g}k"]
+
+
+class EventSampler:
+    """Allows at most max_per_second events in each one-second window (0 = never)"""
+
+    def __init__(self, max_per_second, clock=time.monotonic):
+        self.max_per_second = max_per_second
+        self.clock = clock
+        self.window_start = None
+        self.window_count = 0
+        self.suppressed = 0
+
+    def allow(self):
+        if self.max_per_second <= 0:
+            return False
+        now = self.clock()
+        if self.window_start is None or now - self.window_start >= 1.0:
+            self.window_start = now
+            self.window_count = 0
+        if self.window_count < self.max_per_second:
+            self.window_count += 1
+            return True
+        self.suppressed += 1
+        return False
+
+
+class DetectionTelemetry:
+    """
+    In-memory detection statistics for one camera
+
+    record() is called once per detection pass and never writes to stdout unless
+    the debug sampler lets an event through. The accumulated window is printed
+    by flush(), which record() triggers every flush_interval seconds.
+    """
+
+    def __init__(self, camera_index, flush_interval=10.0, debug_events_per_second=0,
+                 clock=time.monotonic, output=print):
+        self.camera_index = camera_index
+        self.flush_interval = flush_interval
+        self.clock = clock
+        self.output = output
+        self.sampler = EventSampler(debug_events_per_second, clock)
+        self.last_flush = clock()
+        self.reset()
+
+    def reset(self):
+        """Start a new accumulation window"""
+        self.passes = 0
+        self.objects = 0
+        self.publishes = 0
+        self.color_hits = Counter()  # Passes in which each color was seen
+        self.area_histogram = [0] * (len(AREA_BIN_EDGES) + 1)
+        self.objects_histogram = [0] * (MAX_OBJECTS_BIN + 1)
+
+    def record(self, results, mode=""):
+        """Account for one detection pass (per-color results as returned by the detectors)"""
+        mode_prefix = f"{mode} " if mode else ""
+        pass_objects = 0
+        for color_name, objects in results:
+            if objects:
+                self.color_hits[color_name] += 1
+            for _, _, _, _, area in objects:
+                pass_objects += 1
+                self.area_histogram[bisect.bisect_right(AREA_BIN_EDGES, area)] += 1
+                if self.sampler.allow():
+                    self.output(f"Camera {self.camera_index} - {mode_prefix}Color: {color_name}, Area: {area}")
+        self.passes += 1
+        self.objects += pass_objects
+        self.objects_histogram[min(pass_objects, MAX_OBJECTS_BIN)] += 1
+
+        if self.clock() - self.last_flush >= self.flush_interval:
+            self.flush()
+
+    def record_publish(self):
+        self.publishes += 1
+
+    def snapshot(self):
+        """Current window as a plain dict (for logs or an MQTT stats payload)"""
+        return {
+            'camera': self.camera_index,
+            'passes': self.passes,
+            'objects': self.objects,
+            'publishes': self.publishes,
+            'color_hits': dict(self.color_hits),
+            'area_histogram': dict(zip(area_bin_labels(), self.area_histogram)),
+            'objects_per_pass': {(f"{count}+" if count == MAX_OBJECTS_BIN else str(count)): passes
+                                 for count, passes in enumerate(self.objects_histogram)},
+            'debug_suppressed': self.sampler.suppressed,
+        }
+
+    def flush(self):
+        """Print one summary line for the window and start a new one"""
+        now = self.clock()
+        elapsed = max(now - self.last_flush, 1e-9)
+        self.last_flush = now
+        if self.passes:
+            hits = ", ".join(f"{color} {count}" for color, count in self.color_hits.most_common()) or "none"
+            areas = " ".join(f"{label}:{count}" for label, count in zip(area_bin_labels(), self.area_histogram) if count)
+            self.output(f"Camera {self.camera_index} - {self.passes} passes ({self.passes / elapsed:.1f}/s), "
+                        f"{self.objects} objects, {self.publishes} publishes | hits: {hits} | areas: {areas or '-'}")
+        self.reset()
@@ -0,0 +1,78 @@
+"""
+Temporal debouncing of per-frame color detections
+Decides per color whether it is present from timestamped detection passes, independent
+of the camera frame rate and of how often detection actually runs
+"""
+
+import math
+
+
+class PresenceFilter:
+    """
+    Per-color presence with exponential decay over time
+
+    Every color keeps an evidence level in [0, 1]. A detection pass moves it toward 1
+    when the color was seen and toward 0 when it was not, weighted by the seconds since
+    the previous pass. A color becomes present at on_level and absent again at off_level
+    (hysteresis). With the default levels a color seen continuously is confirmed after
+    confirm_seconds at any pass rate. Each update is O(1) per color.
+    """
+
+    def __init__(self, colors, confirm_seconds=0.4, on_level=0.6, off_level=0.3, max_step=0.5):
+        """
+        Args:
+            colors: Color names to track
+            confirm_seconds: Continuous sighting needed before a color is present
+            on_level: Evidence level at which a color becomes present
+            off_level: Evidence level at which a present color is dropped again
+            max_step: Longest gap credited to one pass in seconds, so a pause or a
+                reconnect cannot confirm a color with a single sighting
+        """
+        self.time_constant = confirm_seconds / math.log(1.0 / (1.0 - on_level))
+        self.on_level = on_level - 1e-9  # Reached exactly after confirm_seconds, not one pass later
+        self.off_level = off_level
+        self.max_step = max_step
+        self.levels = {color: 0.0 for color in colors}
+        self.present = set()
+        self.last_timestamp = None
+
+    def reset(self):
+        """Forget all evidence (a new round)"""
+        for color in self.levels:
+            self.levels[color] = 0.0
+        self.present.clear()
+        self.last_timestamp = None
+
+    def update(self, seen, timestamp, first_step=0.04):
+        """
+        Apply one detection pass
+
+        Args:
+            seen: Colors detected in this pass (untracked names are ignored)
+            timestamp: Seconds of the pass (media time or monotonic clock)
+            first_step: Seconds credited to the first pass after a reset
+
+        Returns:
+            (appeared, disappeared) sets of colors whose presence changed in this pass
+        """
+        if self.last_timestamp is None:
+            step = first_step
+        else:
+            step = min(max(timestamp - self.last_timestamp, 0.0), self.max_step)
+        self.last_timestamp = timestamp
+
+        keep = math.exp(-step / self.time_constant)
+        gain = 1.0 - keep
+        appeared = set()
+        disappeared = set()
+        for color, level in self.levels.items():
+            level = level * keep + (gain if color in seen else 0.0)
+            self.levels[color] = level
+            if color in self.present:
+                if level <= self.off_level:
+                    self.present.discard(color)
+                    disappeared.add(color)
+            elif level >= self.on_level:
+                self.present.add(color)
+                appeared.add(color)
+        return appeared, disappeared
@@ -0,0 +1,199 @@
+#!/usr/bin/env python3
+"""
+Golden-output regression harness for the published camera scores
+
+Replays a manifest of labeled clips through the camera detection pipeline (see
+replay_benchmark.py) and compares, per clip, the timeline of unique-color sets and
+the FalconGrasp/camera/N scores against stored golden files. Any difference is
+reported as drift and makes the check fail, so detector rewrites can be accepted
+only when player scores are unchanged.
+
+Manifest (JSON), paths relative to the manifest:
+    {
+        "settings": {"scale": 1.0, "prefilter": "bilateral", ...},   # optional
+        "clips": [
+            {"name": "station1_round1", "path": "recordings/station1_round1.mp4",
+             "crop": [450, 370, 820, 900], "camera": 0}
+        ]
+    }
+
+Usage:
+    python golden_scores.py record manifest.json      # (re)write the golden files
+    python golden_scores.py check manifest.json -j 4  # compare, 4 clips in parallel
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import multiprocessing
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor
+
+import replay_benchmark
+from replay_benchmark import pipeline
+
+GOLDEN_DIR = "golden"  # Next to the manifest unless --golden-dir is given
+
+
+def default_settings():
+    """Detection settings of the live game, used when the manifest does not set them"""
+    return {
+        'scale': pipeline.ANALYSIS_SCALE,
+        'prefilter': pipeline.PREFILTER,
+        'blob_method': pipeline.BLOB_METHOD,
+        'enhanced': pipeline.USE_ENHANCED_DETECTION,
+        'lut': pipeline.USE_LUT_CLASSIFIER,
+        'mask_factor': pipeline.MASK_DOWNSAMPLE,
+        'every_frame': not (pipeline.ADAPTIVE_DETECTION or pipeline.USE_MOTION_GATE),
+    }
+
+
+def load_manifest(path):
+    """Read a manifest, resolving clip paths and filling in the default settings"""
+    with open(path, 'r') as f:
+        manifest = json.load(f)
+    base_dir = os.path.dirname(os.path.abspath(path))
+    settings = {**default_settings(), **manifest.get('settings', {})}
+    clips = []
+    for clip in manifest['clips']:
+        clips.append({
+            'name': clip.get('name') or os.path.splitext(os.path.basename(clip['path']))[0],
+            'path': os.path.join(base_dir, clip['path']),
+            'crop': clip.get('crop'),
+            'camera': clip.get('camera', 0),
+        })
+    return settings, clips
+
+
+def run_clip(clip, settings):
+    """
+    Replay one clip and return its timelines (runs in a worker process)
+
+    Returns:
+        Dict with the clip, settings, frame count, scores and colors, JSON round-tripped
+        so it compares equal to a golden file read back from disk
+    """
+    color_lut = replay_benchmark.configure_pipeline(**settings)
+    fps, frames = replay_benchmark.clip_frames(clip['path'])
+    crop = tuple(clip['crop']) if clip['crop'] else None
+    with contextlib.redirect_stdout(io.StringIO()):  # Publish and telemetry lines
+        result = replay_benchmark.replay(clip['path'], fps, frames, crop, clip['camera'], color_lut)
+    timeline = {
+        'clip': os.path.basename(clip['path']),
+        'crop': result['crop'],
+        'camera': clip['camera'],
+        'settings': settings,
+        'frames': result['frames'],
+        'scores': result['scores'],
+        'colors': result['colors'],
+    }
+    return json.loads(json.dumps(timeline))
+
+
+def run_clips(clips, settings, workers=1):
+    """Replay every clip, in a spawn process pool when workers > 1, results in manifest order"""
+    if workers <= 1:
+        return [run_clip(clip, settings) for clip in clips]
+    context = multiprocessing.get_context("spawn")
+    with ProcessPoolExecutor(max_workers=workers, mp_context=context) as pool:
+        return list(pool.map(run_clip, clips, [settings] * len(clips)))
+
+
+def compare_timelines(golden, current):
+    """
+    Differences between a golden timeline and a fresh one
+
+    Returns:
+        List of human-readable drift messages, empty when the outputs are identical
+    """
+    drift = []
+    if golden['settings'] != current['settings']:
+        drift.append(f"settings changed: golden {golden['settings']} vs current {current['settings']} "
+                     f"(re-record if intended)")
+    if golden['frames'] != current['frames']:
+        drift.append(f"frame count: golden {golden['frames']} vs current {current['frames']}")
+    for key in ('scores', 'colors'):
+        expected, actual = golden[key], current[key]
+        for index, (a, b) in enumerate(zip(expected, actual)):
+            if a != b:
+                drift.append(f"{key} differ at entry {index}: golden {a} vs current {b}")
+                break
+        else:
+            if len(expected) != len(actual):
+                extra = expected[len(actual):] or actual[len(expected):]
+                drift.append(f"{key}: golden has {len(expected)} entries, current {len(actual)} "
+                             f"(first extra: {extra[0]})")
+    return drift
+
+
+def golden_path(golden_dir, clip):
+    return os.path.join(golden_dir, f"{clip['name']}.json")
+
+
+def record(clips, settings, golden_dir, workers=1):
+    os.makedirs(golden_dir, exist_ok=True)
+    for clip, timeline in zip(clips, run_clips(clips, settings, workers)):
+        with open(golden_path(golden_dir, clip), 'w') as f:
+            json.dump(timeline, f, indent=2)
+        print(f"💾 {clip['name']}: {len(timeline['scores'])} scores, {len(timeline['colors'])} color changes")
+    return 0
+
+
+def check(clips, settings, golden_dir, workers=1):
+    goldens = {}
+    for clip in clips:
+        path = golden_path(golden_dir, clip)
+        if not os.path.exists(path):
+            print(f"❌ {clip['name']}: no golden file at {path}, run 'record' first")
+            return 1
+        with open(path, 'r') as f:
+            goldens[clip['name']] = json.load(f)
+
+    failed = 0
+    for clip, timeline in zip(clips, run_clips(clips, settings, workers)):
+        drift = compare_timelines(goldens[clip['name']], timeline)
+        if drift:
+            failed += 1
+            print(f"❌ {clip['name']}: score drift")
+            for message in drift:
+                print(f"   {message}")
+        else:
+            print(f"✅ {clip['name']}: {len(timeline['scores'])} scores unchanged")
+    print(f"\n{len(clips) - failed}/{len(clips)} clips match their golden output")
+    return 1 if failed else 0
+
+
+def main():
+    """Main function with command line interface"""
+    parser = argparse.ArgumentParser(description='Record or check golden score timelines for labeled clips')
+    parser.add_argument('command', choices=['record', 'check'])
+    parser.add_argument('manifest', help='JSON manifest of labeled clips')
+    parser.add_argument('--golden-dir', help=f"Golden files directory (default: '{GOLDEN_DIR}' next to the manifest)")
+    parser.add_argument('-j', '--workers', type=int, default=os.cpu_count() or 1,
+                        help='Clips replayed in parallel (process pool)')
+    parser.add_argument('--only', nargs='+', metavar='NAME', help='Restrict to these clip names')
+    args = parser.parse_args()
+
+    try:
+        settings, clips = load_manifest(args.manifest)
+    except (OSError, ValueError, KeyError) as e:
+        print(f"❌ Cannot read manifest {args.manifest}: {e}")
+        return 1
+    if args.only:
+        clips = [clip for clip in clips if clip['name'] in args.only]
+    golden_dir = args.golden_dir or os.path.join(os.path.dirname(os.path.abspath(args.manifest)), GOLDEN_DIR)
+    workers = max(1, min(args.workers, len(clips)))
+
+    try:
+        if args.command == 'record':
+            return record(clips, settings, golden_dir, workers)
+        return check(clips, settings, golden_dir, workers)
+    except IOError as e:
+        print(f"❌ {e}")
+        return 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
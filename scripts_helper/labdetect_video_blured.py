@@ -4,10 +4,25 @@ import numpy as np
 import os
 from datetime import datetime
 from PyQt5.QtWidgets import (QApplication, QMainWindow, QLabel, QSlider, QVBoxLayout, 
-                             QHBoxLayout, QWidget, QPushButton, QGroupBox, QGridLayout, QSizePolicy)
+                             QHBoxLayout, QWidget, QPushButton, QGroupBox, QGridLayout, QSizePolicy,
+                             QInputDialog)
 from PyQt5.QtCore import Qt
 from PyQt5.QtGui import QImage, QPixmap, QFont
 
+from detection.blobs import get_blob_finder
+from detection.calibration import CALIBRATION_FILE, DEFAULT_PROFILE, CalibrationStore
+from detection.color_table import ColorTable
+from detection.limits_file import LIMITS_FILE, latest_ranges
+from detection.roi import TOOL_ROI, format_roi_savings, measure_roi_savings
+
+# Print a one-off full-frame vs ROI timing on the first frame (three extra full-frame bilateral passes)
+REPORT_ROI_SAVINGS = False
+
+# Blob extraction: "contours" or "components" (connectedComponentsWithStats, see detection/blobs.py)
+BLOB_METHOD = "contours"
+STICK_MIN_AREA = 500  # Minimum area for a stick
+STICK_MIN_ASPECT = 2.0  # Stick-like shapes are at least this elongated
+
 # PINKHSV LIMITS: PINK 
         #    H Lower: 148, H Upper: 165
             # S Lower: 34, S Upper: 133
@@ -111,6 +126,7 @@ class ColorDetectionApp(QMainWindow):
         self.timer = self.startTimer(40)  # 1000 ms / 25 FPS = 40 ms
         self.is_paused = False
         self.paused_frame = None  # Store the paused frame for live updates
+        self.roi_reported = False
         
         # Stick detection and counting variables - Using calibrated values from your data
         # LAB ranges converted to OpenCV format: L*2.55, A+127, B+127 (to handle 0-255 range)
@@ -230,7 +246,15 @@ class ColorDetectionApp(QMainWindow):
         self.detected_sticks = {}  # Store detected stick counts
         self.total_sticks = 0
         
-        # Try to load calibrated ranges from file on startup
+        # Color mapping for visualization - Updated for your colors
+        self.color_bgr_map = {
+            'pink': (203, 192, 255), 'purple': (128, 0, 128), 'light_green': (144, 238, 144),
+            'blue': (255, 0, 0), 'yellow': (0, 255, 255), 'red': (0, 0, 255),
+            'dark_green': (0, 100, 0), 'cyan': (255, 255, 0)
+        }
+        
+        # Compile the default ranges, then try to load calibrated ranges from file on startup
+        self.compile_color_table()
         self.load_calibrated_ranges_from_file()
 
         # Connect slider value changes to the update method
@@ -740,6 +764,13 @@ class ColorDetectionApp(QMainWindow):
         
         # Apply enhanced filtering pipeline for better detection
         if ret:
+            if REPORT_ROI_SAVINGS and not self.roi_reported:
+                print(f"ROI timing: {format_roi_savings(measure_roi_savings(self.image, TOOL_ROI))}")
+                self.roi_reported = True
+
+            # 0. Crop to the shared play area so every filter below only touches the ROI
+            self.image, _ = TOOL_ROI.apply(self.image)
+
             # 1. Gaussian blur for initial noise reduction
             self.image = cv2.GaussianBlur(self.image, (5, 5), 0)
             
@@ -817,6 +848,29 @@ class ColorDetectionApp(QMainWindow):
         self.display_image(self.mask_label, mask)
         self.display_image(self.result_label, result)
 
+    def compile_color_table(self):
+        """Rebuild the compiled color table after the stick color ranges change"""
+        self.color_table = ColorTable(self.stick_colors, self.color_bgr_map, kernel_size=5)
+
+    def slider_bounds(self):
+        """Current slider bounds as (hsv_lower, hsv_upper, lab_lower, lab_upper), L scaled to OpenCV's 0-255"""
+        hsv_lower = np.array([self.h_lower_slider.value(), self.s_lower_slider.value(), self.v_lower_slider.value()])
+        hsv_upper = np.array([self.h_upper_slider.value(), self.s_upper_slider.value(), self.v_upper_slider.value()])
+        lab_lower = np.array([int(self.l_lower_slider.value() * 2.55), self.a_lower_slider.value(), self.b_lower_slider.value()])
+        lab_upper = np.array([int(self.l_upper_slider.value() * 2.55), self.a_upper_slider.value(), self.b_upper_slider.value()])
+        return hsv_lower, hsv_upper, lab_lower, lab_upper
+
+    @staticmethod
+    def range_mask(hsv_image, lab_image, method_id, hsv_lower, hsv_upper, lab_lower, lab_upper):
+        """Mask of one set of bounds for the selected method (0 = LAB only, 1 = HSV only, 2 = hybrid)"""
+        if method_id == 0:  # LAB only
+            return cv2.inRange(lab_image, lab_lower, lab_upper)
+        if method_id == 1:  # HSV only
+            return cv2.inRange(hsv_image, hsv_lower, hsv_upper)
+        # Hybrid HSV+LAB: combine masks (intersection for more precise detection)
+        return cv2.bitwise_and(cv2.inRange(lab_image, lab_lower, lab_upper),
+                               cv2.inRange(hsv_image, hsv_lower, hsv_upper))
+
     def hybrid_stick_detection(self, frame):
         """Perform hybrid HSV+LAB stick detection and counting"""
         method_id = self.detection_method_group.checkedId()
@@ -828,129 +882,46 @@ class ColorDetectionApp(QMainWindow):
         combined_mask = np.zeros(frame.shape[:2], dtype=np.uint8)
         result_frame = frame.copy()
         stick_counts = {}
-        
-        # Color mapping for visualization - Updated for your colors
-        color_bgr_map = {
-            'pink': (203, 192, 255), 'purple': (128, 0, 128), 'light_green': (144, 238, 144),
-            'blue': (255, 0, 0), 'yellow': (0, 255, 255), 'red': (0, 0, 255),
-            'dark_green': (0, 100, 0), 'cyan': (255, 255, 0)
-        }
-        
-        for color_name, ranges in self.stick_colors.items():
-            color_mask = np.zeros(frame.shape[:2], dtype=np.uint8)
-            
-            if method_id == 0:  # LAB only
-                # Use current slider values for LAB only mode
-                if hasattr(self, 'l_lower_slider'):
-                    l_lower = int(self.l_lower_slider.value() * 2.55)
-                    l_upper = int(self.l_upper_slider.value() * 2.55)
-                    a_lower = self.a_lower_slider.value()
-                    a_upper = self.a_upper_slider.value()
-                    b_lower = self.b_lower_slider.value()
-                    b_upper = self.b_upper_slider.value()
-                    
-                    lab_lower = np.array([l_lower, a_lower, b_lower])
-                    lab_upper = np.array([l_upper, a_upper, b_upper])
-                    color_mask = cv2.inRange(lab_image, lab_lower, lab_upper)
-                else:
-                    # Fallback to predefined ranges if sliders not available
-                    lab_lower = np.array(ranges['lab'][0])
-                    lab_upper = np.array(ranges['lab'][1])
-                    color_mask = cv2.inRange(lab_image, lab_lower, lab_upper)
-                
-            elif method_id == 1:  # HSV only
-                # Use current slider values for HSV only mode
-                if hasattr(self, 'h_lower_slider'):
-                    h_lower = self.h_lower_slider.value()
-                    h_upper = self.h_upper_slider.value()
-                    s_lower = self.s_lower_slider.value()
-                    s_upper = self.s_upper_slider.value()
-                    v_lower = self.v_lower_slider.value()
-                    v_upper = self.v_upper_slider.value()
-                    
-                    hsv_lower = np.array([h_lower, s_lower, v_lower])
-                    hsv_upper = np.array([h_upper, s_upper, v_upper])
-                    color_mask = cv2.inRange(hsv_image, hsv_lower, hsv_upper)
-                else:
-                    # Fallback to predefined ranges if sliders not available
-                    hsv_lower = np.array(ranges['hsv'][0])
-                    hsv_upper = np.array(ranges['hsv'][1])
-                    color_mask = cv2.inRange(hsv_image, hsv_lower, hsv_upper)
-                
-            elif method_id == 2:  # Hybrid HSV+LAB
-                # Get current slider values for fine-tuning
-                if hasattr(self, 'l_lower_slider'):
-                    l_lower = int(self.l_lower_slider.value() * 2.55)
-                    l_upper = int(self.l_upper_slider.value() * 2.55)
-                    a_lower = self.a_lower_slider.value()
-                    a_upper = self.a_upper_slider.value()
-                    b_lower = self.b_lower_slider.value()
-                    b_upper = self.b_upper_slider.value()
-                    
-                    h_lower = self.h_lower_slider.value()
-                    h_upper = self.h_upper_slider.value()
-                    s_lower = self.s_lower_slider.value()
-                    s_upper = self.s_upper_slider.value()
-                    v_lower = self.v_lower_slider.value()
-                    v_upper = self.v_upper_slider.value()
-                    
-                    # Create masks from both color spaces
-                    lab_mask = cv2.inRange(lab_image, 
-                                         np.array([l_lower, a_lower, b_lower]),
-                                         np.array([l_upper, a_upper, b_upper]))
-                    hsv_mask = cv2.inRange(hsv_image,
-                                         np.array([h_lower, s_lower, v_lower]),
-                                         np.array([h_upper, s_upper, v_upper]))
-                    
-                    # Combine masks (intersection for more precise detection)
-                    color_mask = cv2.bitwise_and(lab_mask, hsv_mask)
-                else:
-                    # Fallback to predefined ranges
-                    lab_lower = np.array(ranges['lab'][0])
-                    lab_upper = np.array(ranges['lab'][1])
-                    hsv_lower = np.array(ranges['hsv'][0])
-                    hsv_upper = np.array(ranges['hsv'][1])
-                    
-                    lab_mask = cv2.inRange(lab_image, lab_lower, lab_upper)
-                    hsv_mask = cv2.inRange(hsv_image, hsv_lower, hsv_upper)
-                    color_mask = cv2.bitwise_and(lab_mask, hsv_mask)
-            
-            # Apply enhanced morphological operations to clean up the mask
-            kernel_small = cv2.getStructuringElement(cv2.MORPH_ELLIPSE, (3, 3))
-            kernel_large = cv2.getStructuringElement(cv2.MORPH_ELLIPSE, (5, 5))
-            
-            # Remove small noise (like reflections)
-            color_mask = cv2.morphologyEx(color_mask, cv2.MORPH_OPEN, kernel_small, iterations=2)
-            # Fill small gaps
-            color_mask = cv2.morphologyEx(color_mask, cv2.MORPH_CLOSE, kernel_large, iterations=1)
-            # Final cleanup
-            color_mask = cv2.medianBlur(color_mask, 3)
-            
-            # Find and count sticks (contours) for this color
-            contours, _ = cv2.findContours(color_mask, cv2.RETR_EXTERNAL, cv2.CHAIN_APPROX_SIMPLE)
+
+        # The sliders apply the same bounds to every color, so read them once and
+        # clean up that single mask once per frame instead of once per color
+        find_blobs = get_blob_finder(BLOB_METHOD)
+        shared_sticks = None
+        if hasattr(self, 'h_lower_slider') and hasattr(self, 'l_lower_slider'):
+            combined_mask = self.clean_mask(self.range_mask(hsv_image, lab_image, method_id, *self.slider_bounds()))
+            shared_sticks = find_blobs(combined_mask, STICK_MIN_AREA, min_aspect=STICK_MIN_ASPECT)
+        
+        for entry in self.color_table:
+            if shared_sticks is not None:
+                sticks = shared_sticks
+            else:
+                # Fallback to the compiled ranges if sliders not available
+                color_mask = self.clean_mask(self.range_mask(hsv_image, lab_image, method_id, entry.hsv_lower,
+                                                             entry.hsv_upper, entry.lab_lower, entry.lab_upper))
+                sticks = find_blobs(color_mask, STICK_MIN_AREA, min_aspect=STICK_MIN_ASPECT)
+                combined_mask = cv2.bitwise_or(combined_mask, color_mask)
             
-            stick_count = 0
-            for contour in contours:
-                area = cv2.contourArea(contour)
-                if area > 500:  # Minimum area for a stick
-                    # Calculate aspect ratio to filter stick-like shapes
-                    x, y, w, h = cv2.boundingRect(contour)
-                    aspect_ratio = max(w, h) / min(w, h)
-                    
-                    if aspect_ratio > 2.0:  # Stick-like shape
-                        stick_count += 1
-                        
-                        # Draw bounding box and label on result frame
-                        color_bgr = color_bgr_map.get(color_name, (255, 255, 255))
-                        cv2.rectangle(result_frame, (x, y), (x + w, y + h), color_bgr, 2)
-                        cv2.putText(result_frame, f"{color_name}", (x, y - 10),
-                                   cv2.FONT_HERSHEY_SIMPLEX, 0.6, color_bgr, 2)
+            # Area and stick-like aspect ratio are already filtered
+            for x, y, w, h, area in sticks:
+                # Draw bounding box and label on result frame
+                color_bgr = entry.display_bgr
+                cv2.rectangle(result_frame, (x, y), (x + w, y + h), color_bgr, 2)
+                cv2.putText(result_frame, f"{entry.name}", (x, y - 10),
+                           cv2.FONT_HERSHEY_SIMPLEX, 0.6, color_bgr, 2)
             
-            stick_counts[color_name] = stick_count
-            combined_mask = cv2.bitwise_or(combined_mask, color_mask)
+            stick_counts[entry.name] = len(sticks)
         
         return combined_mask, result_frame, stick_counts
 
+    def clean_mask(self, color_mask):
+        """Apply enhanced morphological operations to clean up the mask"""
+        # Remove small noise (like reflections)
+        color_mask = cv2.morphologyEx(color_mask, cv2.MORPH_OPEN, self.color_table.kernel(size=3), iterations=2)
+        # Fill small gaps
+        color_mask = cv2.morphologyEx(color_mask, cv2.MORPH_CLOSE, self.color_table.kernel(), iterations=1)
+        # Final cleanup
+        return cv2.medianBlur(color_mask, 3)
+
     def update_stick_counts(self, stick_counts):
         """Update the stick counting displays - emphasizing color count"""
         total_objects = sum(stick_counts.values())
@@ -1134,6 +1105,10 @@ DETECTION RESULTS:
         lab_limits = f"L Lower: {l_lower}, L Upper: {l_upper}, A Lower: {a_lower_actual}, A Upper: {a_upper_actual}, B Lower: {b_lower_actual}, B Upper: {b_upper_actual}\n"
         with open("lab_limits.txt", "a") as file:
             file.write(lab_limits)
+
+        # And as one color of a lighting profile (L scaled to 0-255, A and B as the raw slider values)
+        self.save_to_calibration_profile(((h_lower, s_lower, v_lower), (h_upper, s_upper, v_upper)),
+                                         ((int(l_lower * 2.55), a_lower, b_lower), (int(l_upper * 2.55), a_upper, b_upper)))
         
         print(f"All limits saved successfully!")
         print(f"- Combined file: all_detection_limits.txt")
@@ -1154,76 +1129,60 @@ DETECTION RESULTS:
         else:
             return "No detection results available"
 
+    def save_to_calibration_profile(self, hsv_limits, lab_limits):
+        """Save the slider bounds as one color of a calibration profile, which the game can hot reload"""
+        store = CalibrationStore(CALIBRATION_FILE)
+        try:
+            profiles = store.profile_names()
+            active = store.active_profile() or DEFAULT_PROFILE
+        except (ValueError, OSError) as e:
+            print(f"Calibration profiles not saved, cannot read {CALIBRATION_FILE}: {e}")
+            return
+        colors = list(self.stick_colors)
+        color, ok = QInputDialog.getItem(self, "Save Calibration Profile", "Stick color:", colors, 0, True)
+        if not ok or not color.strip():
+            return
+        profiles = profiles or [active]
+        profile, ok = QInputDialog.getItem(self, "Save Calibration Profile", "Lighting profile:", profiles,
+                                           profiles.index(active) if active in profiles else 0, True)
+        if not ok or not profile.strip():
+            return
+
+        color = color.strip().lower().replace(' ', '_')
+        ranges = {'hsv': hsv_limits, 'lab': lab_limits}
+        version = store.save_color(profile.strip(), color, ranges, base_colors=self.stick_colors)
+        self.stick_colors[color] = ranges
+        self.compile_color_table()
+        print(f"- Calibration profile: '{profile.strip()}' / {color} in {CALIBRATION_FILE} (version {version})")
+
+    def load_calibration_profile(self):
+        """Load the active profile of the calibration store, False when there is none"""
+        store = CalibrationStore(CALIBRATION_FILE)
+        if not store.exists():
+            return False
+        try:
+            name, version, colors = store.profile()
+        except (KeyError, ValueError, OSError) as e:
+            print(f"Calibration profile not loaded: {e}")
+            return False
+        self.stick_colors = colors
+        self.compile_color_table()
+        print(f"Loaded calibration profile '{name}' (version {version}) from {CALIBRATION_FILE}:")
+        for color in colors.keys():
+            print(f"  - {color.replace('_', ' ').title()}")
+        return True
+
     def load_calibrated_ranges_from_file(self):
-        """Load calibrated color ranges from the all_detection_limits.txt file"""
+        """Load calibrated color ranges from the active calibration profile, else from the all_detection_limits.txt file"""
+        if self.load_calibration_profile():
+            return True
         try:
-            with open("all_detection_limits.txt", "r") as file:
-                content = file.read()
-                
-            # Parse the file and extract the latest ranges for each color
-            sessions = content.split("========================================")
-            color_ranges = {}
-            
-            for session in sessions:
-                if "DETECTION SESSION:" in session and "HSV LIMITS:" in session:
-                    lines = session.strip().split('\n')
-                    
-                    # Extract color name (last line before separator)
-                    color_name = None
-                    for line in reversed(lines):
-                        if line.strip() and not line.startswith("DETECTION") and not line.startswith("HSV") and not line.startswith("LAB") and "Lower:" not in line and "Upper:" not in line and "No detection" not in line:
-                            color_name = line.strip().lower().replace(' ', '_')
-                            break
-                    
-                    if color_name:
-                        # Extract HSV values
-                        hsv_values = {}
-                        lab_values = {}
-                        
-                        for line in lines:
-                            if "H Lower:" in line:
-                                parts = line.split(',')
-                                hsv_values['h_lower'] = int(parts[0].split(':')[1].strip())
-                                hsv_values['h_upper'] = int(parts[1].split(':')[1].strip())
-                            elif "S Lower:" in line:
-                                parts = line.split(',')
-                                hsv_values['s_lower'] = int(parts[0].split(':')[1].strip())
-                                hsv_values['s_upper'] = int(parts[1].split(':')[1].strip())
-                            elif "V Lower:" in line:
-                                parts = line.split(',')
-                                hsv_values['v_lower'] = int(parts[0].split(':')[1].strip())
-                                hsv_values['v_upper'] = int(parts[1].split(':')[1].strip())
-                            elif "L Lower:" in line:
-                                parts = line.split(',')
-                                lab_values['l_lower'] = int(parts[0].split(':')[1].strip())
-                                lab_values['l_upper'] = int(parts[1].split(':')[1].strip())
-                            elif "A Lower:" in line:
-                                parts = line.split(',')
-                                lab_values['a_lower'] = int(parts[0].split(':')[1].strip())
-                                lab_values['a_upper'] = int(parts[1].split(':')[1].strip())
-                            elif "B Lower:" in line:
-                                parts = line.split(',')
-                                lab_values['b_lower'] = int(parts[0].split(':')[1].strip())
-                                lab_values['b_upper'] = int(parts[1].split(':')[1].strip())
-                        
-                        if len(hsv_values) == 6 and len(lab_values) == 6:
-                            # Convert LAB A,B values back to 0-255 range for OpenCV
-                            lab_a_lower = lab_values['a_lower'] + 127
-                            lab_a_upper = lab_values['a_upper'] + 127
-                            lab_b_lower = lab_values['b_lower'] + 127
-                            lab_b_upper = lab_values['b_upper'] + 127
-                            lab_l_lower = int(lab_values['l_lower'] * 2.55)
-                            lab_l_upper = int(lab_values['l_upper'] * 2.55)
-                            
-                            color_ranges[color_name] = {
-                                'hsv': ((hsv_values['h_lower'], hsv_values['s_lower'], hsv_values['v_lower']),
-                                       (hsv_values['h_upper'], hsv_values['s_upper'], hsv_values['v_upper'])),
-                                'lab': ((lab_l_lower, lab_a_lower, lab_b_lower),
-                                       (lab_l_upper, lab_a_upper, lab_b_upper))
-                            }
+            # Latest complete ranges per color, indexed once and re-read only when the file changes
+            color_ranges = latest_ranges(LIMITS_FILE)
             
             if color_ranges:
                 self.stick_colors = color_ranges
+                self.compile_color_table()
                 print(f"Loaded {len(color_ranges)} calibrated color ranges from file:")
                 for color in color_ranges.keys():
                     print(f"  - {color.replace('_', ' ').title()}")
@@ -1248,7 +1207,8 @@ DETECTION RESULTS:
                 print("Error: Could not read frame to get dimensions.")
                 return
             
-            # Apply bilateral filter for consistency
+            # Apply the same ROI crop and bilateral filter as the processed frames
+            frame, _ = TOOL_ROI.apply(frame)
             frame = cv2.bilateralFilter(frame, d=9, sigmaColor=75, sigmaSpace=75)
             self.frame_height, self.frame_width = frame.shape[:2]
             
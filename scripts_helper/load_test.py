@@ -0,0 +1,151 @@
+#!/usr/bin/env python3
+"""
+Load test for the camera detection pipeline with synthetic cameras
+
+Registers one synthetic scene per camera (detection/synthetic.py) and runs them through
+VideoCaptureManager exactly like RTSP cameras: grabber threads, frame rings, scheduler,
+motion gate, detection and scoring. Scenes are served in real time, so when detection
+falls behind the frame rings drop frames. The sweep mode raises the camera count per
+resolution until the drop rate exceeds the limit, giving the largest setup one host sustains.
+
+Usage:
+    python load_test.py --cameras 5 --resolution 1920x1080 --duration 20
+    python load_test.py --sweep 1 2 4 6 8 --resolution 1280x720 1920x1080
+    python load_test.py --cameras 3 --crop 450 370 820 900 --backend batch
+"""
+
+import argparse
+import sys
+import time
+
+import pyCatch1_2025 as pipeline
+from detection.synthetic import SceneConfig, SyntheticScene, register_scene
+
+WARMUP_SECONDS = 2.0  # Excluded from the counts (thread start-up, first full detection passes)
+
+
+class CountingClient:
+    """Stands in for the MQTT client, only counts publishes"""
+
+    def __init__(self):
+        self.published = 0
+
+    def publish(self, topic, payload, *args, **kwargs):
+        self.published += 1
+
+
+def parse_resolution(text):
+    width, height = (int(v) for v in text.lower().split('x'))
+    return width, height
+
+
+def run_load(cameras, width, height, duration, crop=None, **scene_options):
+    """
+    Run cameras synthetic cameras at width x height for duration seconds (after warm-up)
+
+    Returns:
+        Dict with per-camera {'published', 'dropped', 'processed', 'detected'} counts over the
+        measured window, the overall drop rate and processed frames per second per camera
+    """
+    # detected_colors is sized for the five stations, the load test may run more cameras
+    while len(pipeline.detected_colors) < cameras:
+        pipeline.detected_colors.append(set())
+
+    sources = [register_scene(f"load{index}", SyntheticScene(SceneConfig(width=width, height=height, seed=index,
+                                                                         **scene_options), pipeline.color_table))
+               for index in range(cameras)]
+    crops = [crop or (0, 0, width, height)] * cameras
+    manager = pipeline.VideoCaptureManager(sources, crops, CountingClient())
+    try:
+        manager.start_all()
+        for thread in manager.camera_threads:
+            thread.start_detection()
+
+        time.sleep(WARMUP_SECONDS)
+        before = [thread.frame_stats() for thread in manager.camera_threads]
+        time.sleep(duration)
+        after = [thread.frame_stats() for thread in manager.camera_threads]
+    finally:
+        manager.stop_all()
+        # detected_colors is module state, a later run (or test) must not start with these colors
+        for thread in manager.camera_threads:
+            thread.stop_detection()
+
+    per_camera = []
+    for start, end in zip(before, after):
+        per_camera.append({key: end.get(key, 0) - start.get(key, 0)
+                           for key in ('published', 'dropped', 'processed', 'detected')})
+    published = sum(camera['published'] for camera in per_camera)
+    dropped = sum(camera['dropped'] for camera in per_camera)
+    return {
+        'cameras': cameras,
+        'resolution': (width, height),
+        'per_camera': per_camera,
+        'drop_rate': dropped / published if published else 0.0,
+        'processed_fps': sum(camera['processed'] for camera in per_camera) / duration / cameras,
+    }
+
+
+def print_result(result):
+    width, height = result['resolution']
+    print(f"\n📷 {result['cameras']} camera(s) at {width}x{height}: "
+          f"drop rate {result['drop_rate']:.1%}, {result['processed_fps']:.1f} processed fps per camera")
+    for index, camera in enumerate(result['per_camera']):
+        print(f"  Camera {index}: published {camera['published']}, processed {camera['processed']}, "
+              f"dropped {camera['dropped']}, detection passes {camera['detected']}")
+
+
+def main():
+    """Main function with command line interface"""
+    parser = argparse.ArgumentParser(description='Load-test detection with synthetic cameras')
+    parser.add_argument('--cameras', type=int, default=5, help='Number of synthetic cameras')
+    parser.add_argument('--sweep', type=int, nargs='+', metavar='N',
+                        help='Camera counts to try in order, per resolution, until frames drop')
+    parser.add_argument('--resolution', nargs='+', default=['1920x1080'], help='WIDTHxHEIGHT, several for a sweep')
+    parser.add_argument('--crop', type=int, nargs=4, metavar=('X0', 'Y0', 'X1', 'Y1'),
+                        help='Play-area crop, full frame if omitted')
+    parser.add_argument('--duration', type=float, default=10.0, help='Measured seconds per run')
+    parser.add_argument('--max-drop', type=float, default=0.01, help='Highest drop rate that counts as sustained')
+    parser.add_argument('--fps', type=float, default=25.0, help='Frame rate of every synthetic camera')
+    parser.add_argument('--sticks', type=int, default=6, help='Sticks per scene')
+    parser.add_argument('--stick-size', type=int, nargs=2, default=(50, 180), metavar=('W', 'L'))
+    parser.add_argument('--speed', type=float, default=40.0, help='Stick drift in pixels per second')
+    parser.add_argument('--noise', type=int, default=8, help='Sensor noise per channel')
+    parser.add_argument('--lighting', type=float, default=0.1, help='Brightness swing (0.1 = +-10%%)')
+    parser.add_argument('--backend', choices=('thread', 'process', 'batch'), default=pipeline.DETECTION_BACKEND,
+                        help='Where detection runs (DETECTION_BACKEND)')
+    args = parser.parse_args()
+
+    pipeline.DETECTION_BACKEND = args.backend
+    pipeline.DISPLAY_FRAMES = False
+    pipeline.REPORT_ROI_SAVINGS = False
+    pipeline.USE_FRAME_GRABBER = True  # Drops are counted by the frame rings
+    scene_options = dict(fps=args.fps, sticks=args.sticks, stick_size=tuple(args.stick_size),
+                         speed=args.speed, noise=args.noise, lighting=args.lighting)
+    crop = tuple(args.crop) if args.crop else None
+
+    try:
+        resolutions = [parse_resolution(text) for text in args.resolution]
+    except ValueError:
+        parser.error("resolutions must look like 1920x1080")
+
+    summary = []
+    for width, height in resolutions:
+        sustained = 0
+        for cameras in args.sweep or [args.cameras]:
+            result = run_load(cameras, width, height, args.duration, crop, **scene_options)
+            print_result(result)
+            if result['drop_rate'] > args.max_drop:
+                break
+            sustained = cameras
+        summary.append((width, height, sustained))
+
+    print("\n📊 Sustained without dropping more than "
+          f"{args.max_drop:.1%} of frames at {args.fps:g} fps:")
+    for width, height, sustained in summary:
+        print(f"  {width}x{height}: {sustained} camera(s)" if sustained else f"  {width}x{height}: none")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,148 @@
+#!/usr/bin/env python3
+"""
+Prefilter benchmark for the stick detector
+
+Runs every denoise stage from detection/prefilter.py on the same recorded clip frames
+and reports, per filter:
+- per-frame cost of the filter alone and of the whole detection
+- how often the detected color set matches the bilateral baseline
+- whether the published score sequence is identical to the baseline
+
+Usage:
+    python prefilter_benchmark.py recording.mp4 [more.mp4 ...] --crop 450 370 820 900
+"""
+
+import argparse
+import sys
+import time
+
+import cv2
+import numpy as np
+
+from detection.color_detector import enhanced_detections, standard_detections
+from detection.prefilter import BASELINE_PREFILTER, PREFILTERS, get_prefilter
+from detection.roi import ROIConfig
+from detection.temporal import PresenceFilter
+from pyCatch1_2025 import HIT_THRESHOLD_SECONDS, calibrated_colors, color_table
+
+CLIP_FPS = 25  # Frame timestamps for the presence filter, every frame of the clip is detected
+
+
+def read_clip(path, roi, max_frames=None):
+    """Yield cropped analysis frames from a recorded clip"""
+    cap = cv2.VideoCapture(path)
+    if not cap.isOpened():
+        raise IOError(f"Cannot open clip: {path}")
+    count = 0
+    try:
+        while max_frames is None or count < max_frames:
+            ret, frame = cap.read()
+            if not ret:
+                break
+            analysis_frame, _ = roi.apply(frame)
+            count += 1
+            yield analysis_frame
+    finally:
+        cap.release()
+
+
+def detect(filtered_frame, use_enhanced, scale):
+    """Colors and object boxes found on an already filtered frame"""
+    hsv_frame = cv2.cvtColor(filtered_frame, cv2.COLOR_BGR2HSV)
+    if use_enhanced:
+        lab_frame = cv2.cvtColor(filtered_frame, cv2.COLOR_BGR2LAB)
+        return enhanced_detections(hsv_frame, lab_frame, color_table, scale)
+    return standard_detections(hsv_frame, color_table, scale)
+
+
+class ScoreReplay:
+    """Replays the camera thread's presence/publish rule over a sequence of detections"""
+
+    def __init__(self):
+        self.presence = PresenceFilter(calibrated_colors, HIT_THRESHOLD_SECONDS)
+        self.detected = set()
+        self.published = []  # (frame_index, score)
+
+    def update(self, frame_index, results):
+        seen = {color_name for color_name, objects in results if objects}
+        appeared, _ = self.presence.update(seen, frame_index / CLIP_FPS, first_step=1.0 / CLIP_FPS)
+        if not appeared <= self.detected:
+            self.detected.update(appeared)
+            self.published.append((frame_index, len(self.detected) * 10))
+
+
+def benchmark_clip(path, roi, filter_names, use_enhanced=False, max_frames=None):
+    """
+    Run all filters over one clip
+
+    Returns:
+        Dict of filter name -> {'filter_ns': [...], 'total_ns': [...], 'color_sets': [...], 'scores': [...]}
+    """
+    results = {name: {'filter_ns': [], 'total_ns': [], 'color_sets': [], 'replay': ScoreReplay()}
+               for name in filter_names}
+    filters = {name: get_prefilter(name) for name in filter_names}
+
+    for frame_index, frame in enumerate(read_clip(path, roi, max_frames)):
+        for name in filter_names:
+            entry = results[name]
+            start = time.perf_counter_ns()
+            filtered = filters[name](frame)
+            filtered_at = time.perf_counter_ns()
+            detections = detect(filtered, use_enhanced, roi.scale)
+            done = time.perf_counter_ns()
+
+            entry['filter_ns'].append(filtered_at - start)
+            entry['total_ns'].append(done - start)
+            entry['color_sets'].append(frozenset(color for color, objects in detections if objects))
+            entry['replay'].update(frame_index, detections)
+
+    for entry in results.values():
+        entry['scores'] = entry.pop('replay').published
+    return results
+
+
+def print_report(path, results):
+    baseline = results[BASELINE_PREFILTER]
+    frames = len(baseline['color_sets'])
+    print(f"\n📼 {path} - {frames} frames (baseline: {BASELINE_PREFILTER})")
+    print(f"{'filter':<16}{'filter ms':>11}{'p95 ms':>9}{'total ms':>10}{'color agree':>13}{'scores':>12}")
+    for name, entry in results.items():
+        filter_ms = np.array(entry['filter_ns']) / 1e6
+        total_ms = np.array(entry['total_ns']) / 1e6
+        agree = sum(a == b for a, b in zip(entry['color_sets'], baseline['color_sets']))
+        same_scores = entry['scores'] == baseline['scores']
+        print(f"{name:<16}{filter_ms.mean():>11.2f}{np.percentile(filter_ms, 95):>9.2f}{total_ms.mean():>10.2f}"
+              f"{100.0 * agree / max(frames, 1):>12.1f}%{'identical' if same_scores else 'DIFFERENT':>12}")
+        if not same_scores:
+            print(f"{'':<16}baseline {baseline['scores']}")
+            print(f"{'':<16}{name:<8} {entry['scores']}")
+
+
+def main():
+    """Main function with command line interface"""
+    parser = argparse.ArgumentParser(description='Compare denoise prefilters against the bilateral baseline')
+    parser.add_argument('clips', nargs='+', help='Recorded clips (.mp4, .avi, ...)')
+    parser.add_argument('--crop', type=int, nargs=4, metavar=('X0', 'Y0', 'X1', 'Y1'),
+                        help='Play-area crop, full frame if omitted')
+    parser.add_argument('--scale', type=float, default=1.0, help='Analysis scale (as ANALYSIS_SCALE)')
+    parser.add_argument('--filters', nargs='+', default=list(PREFILTERS), choices=list(PREFILTERS),
+                        help='Filters to compare (the baseline is always included)')
+    parser.add_argument('--enhanced', action='store_true', help='Use HSV+LAB enhanced detection')
+    parser.add_argument('--max-frames', type=int, help='Stop after this many frames per clip')
+    args = parser.parse_args()
+
+    filter_names = [BASELINE_PREFILTER] + [name for name in args.filters if name != BASELINE_PREFILTER]
+    roi = ROIConfig(crop=tuple(args.crop) if args.crop else None, scale=args.scale)
+
+    for path in args.clips:
+        try:
+            results = benchmark_clip(path, roi, filter_names, args.enhanced, args.max_frames)
+        except IOError as e:
+            print(f"❌ {e}")
+            return 1
+        print_report(path, results)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
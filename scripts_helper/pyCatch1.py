@@ -1,10 +1,13 @@
 import sys
 import cv2
-import numpy as np
 import threading
 import time
 import paho.mqtt.client as mqtt
 
+from detection.color_table import ColorTable
+from detection.telemetry import DetectionTelemetry
+from detection.temporal import PresenceFilter
+
 # Define color ranges for detection
 colors = {
     "red": ((166, 166, 0), (179, 255, 255)),
@@ -19,6 +22,17 @@ colors = {
     "black": ((102, 0, 0), (160, 255, 43))
 }
 
+# Bounds compiled once instead of on every frame
+color_table = ColorTable.from_hsv_ranges(colors)
+
+# Detections are counted in memory and summarized every TELEMETRY_FLUSH_SECONDS,
+# DEBUG_EVENTS_PER_SECOND > 0 also prints sampled individual detections
+TELEMETRY_FLUSH_SECONDS = 10.0
+DEBUG_EVENTS_PER_SECOND = 0
+
+# Continuous sighting a color needs before it is scored (was 10 frames at 25 fps)
+HIT_THRESHOLD_SECONDS = 0.4
+
 detected_colors = [set() for _ in range(4)]
 color_detection_counts = {color: 0 for color in colors.keys()}
 
@@ -35,7 +49,8 @@ class CameraThread(threading.Thread):
         self.frame_count = 0
         self.detecting = False  # Flag to control detection
         self.mqtt_client = mqtt_client  # MQTT client instance
-        self.color_detection_counters = {color: 0 for color in colors.keys()}
+        self.presence = PresenceFilter(colors.keys(), HIT_THRESHOLD_SECONDS)  # Confirms colors over time
+        self.telemetry = DetectionTelemetry(camera_index, TELEMETRY_FLUSH_SECONDS, DEBUG_EVENTS_PER_SECOND)
 
     def run(self):
         self.running = True
@@ -69,35 +84,33 @@ class CameraThread(threading.Thread):
 
     def detect_custom_colors(self, frame):
         hsv_frame = cv2.cvtColor(frame, cv2.COLOR_BGR2HSV)
+        results = []
 
-        for color_name, (lower, upper) in colors.items():
-            mask = cv2.inRange(hsv_frame, np.array(lower), np.array(upper))
+        for entry in color_table:
+            color_name = entry.name
+            mask = cv2.inRange(hsv_frame, entry.hsv_lower, entry.hsv_upper)
             contours, _ = cv2.findContours(mask, cv2.RETR_EXTERNAL, cv2.CHAIN_APPROX_SIMPLE)
-            detected = False  # Flag to check if the color was detected in this frame
+            objects = []
 
             for contour in contours:
                 area = cv2.contourArea(contour)
                 if area < 5000:
                     continue
                 else:
-                    print(f"Camera {self.camera_index} - Color: {color_name}, Area: {area}")
-                    detected_colors[self.camera_index].add(color_name)
-                    detected = True  # Set detected flag to True
+                    objects.append((*cv2.boundingRect(contour), area))
                     break
+            results.append((color_name, objects))
 
-            # Update the detection counter
-            if detected:
-                self.color_detection_counters[color_name] += 1
-            else:
-                self.color_detection_counters[color_name] = max(0, self.color_detection_counters[color_name] - 1)  # Decrease if not detected
+        # Publish only when the presence filter scores a new color
+        seen = {color_name for color_name, objects in results if objects}
+        appeared, _ = self.presence.update(seen, time.monotonic())
+        if not appeared <= detected_colors[self.camera_index]:
+            detected_colors[self.camera_index].update(appeared)
+            self.publish_color_count()  # Publish the count of detected colors
+            self.telemetry.record_publish()
 
-            # Publish the color count if detected in the last 10 frames
-            if self.color_detection_counters[color_name] >= 10:
-                self.publish_color_count()  # Publish the count of detected colors
-                self.color_detection_counters[color_name] = 0  # Reset the counter after publishing
+        self.telemetry.record(results)
 
-        if detected_colors:
-            print(f"Camera {self.camera_index} Detected colors: {detected_colors[self.camera_index]}")
     def publish_color_count(self):
         num_colors = len(detected_colors[self.camera_index])*10
         try:
@@ -122,11 +135,13 @@ class CameraThread(threading.Thread):
 
     def start_detection(self):
         self.detecting = True
+        self.presence.reset()
 
     def stop_detection(self):
         self.detecting = False
         # Clear detected colors when stopping detection
         detected_colors[self.camera_index].clear()
+        self.telemetry.flush()
         print(f"Camera {self.camera_index} detection stopped. Cleared detected colors.")
 
 
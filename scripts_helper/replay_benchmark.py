@@ -0,0 +1,349 @@
+#!/usr/bin/env python3
+"""
+Headless replay benchmark for the camera detection pipeline
+
+Replays recorded clips (or synthetic frames) through CameraThread.process_frame as fast
+as possible, with the same scheduler, motion gate and scoring as the live game, and
+reports per clip:
+- throughput (fps and ms per frame) and the number of detection passes
+- per-frame latency percentiles of every pipeline stage (prefilter, cvtColor, inRange,
+  morphology, blobs, ...)
+- peak resident memory
+- the score sequence the camera would have published over MQTT, and when its set of
+  unique colors changed
+
+With --compare-mask-downsample every clip is replayed once per mask factor (MASK_DOWNSAMPLE)
+and compared with full-resolution masks: morphology and blob cost, box overlap and area
+error of the detections, and whether the published scores are unchanged.
+
+No camera, display or MQTT broker is needed.
+
+Usage:
+    python replay_benchmark.py recording.mp4 [more.mp4 ...] --crop 450 370 820 900
+    python replay_benchmark.py --synthetic 500 --json results.json
+    python replay_benchmark.py --synthetic 500 --compare-mask-downsample
+"""
+
+import argparse
+import itertools
+import json
+import resource
+import sys
+import time
+
+import cv2
+
+import pyCatch1_2025 as pipeline
+from detection.blobs import BLOB_METHODS
+from detection.color_detector import MASK_FACTORS, find_color_detections
+from detection.lut import ColorLUT
+from detection.prefilter import PREFILTERS
+from detection.profiling import StageTimer
+from detection.roi import ROIConfig
+from detection.synthetic import SceneConfig, SyntheticScene
+
+SYNTHETIC_FPS = 25
+SYNTHETIC_SIZE = (1280, 720)  # (width, height)
+PERCENTILES = (50, 95, 99)
+
+
+class RecordingClient:
+    """Stands in for the MQTT client and keeps every publish with the media time it happened at"""
+
+    def __init__(self):
+        self.media_time = 0.0
+        self.messages = []  # (media_time, topic, payload)
+
+    def publish(self, topic, payload, *args, **kwargs):
+        self.messages.append((round(self.media_time, 3), topic, payload))
+
+
+def clip_frames(path, max_frames=None):
+    """Open a recorded clip, returning (fps, frame iterator)"""
+    cap = cv2.VideoCapture(path)
+    if not cap.isOpened():
+        raise IOError(f"Cannot open clip: {path}")
+    fps = cap.get(cv2.CAP_PROP_FPS) or SYNTHETIC_FPS
+
+    def frames():
+        count = 0
+        try:
+            while max_frames is None or count < max_frames:
+                ret, frame = cap.read()
+                if not ret:
+                    break
+                count += 1
+                yield frame
+        finally:
+            cap.release()
+
+    return fps, frames()
+
+
+def synthetic_frames(count, size=SYNTHETIC_SIZE, seed=0):
+    """
+    Frames with sticks of every calibrated color, see detection/synthetic.py
+
+    Sticks enter one after another and drift, so the scheduler, the motion gate
+    and the scoring all see realistic changes.
+    """
+    width, height = size
+    config = SceneConfig(width=width, height=height, fps=SYNTHETIC_FPS, sticks=len(pipeline.color_table),
+                         appear_interval=2.0, seed=seed)
+    return SyntheticScene(config, pipeline.color_table).frames(count)
+
+
+def configure_pipeline(scale, prefilter, blob_method, enhanced=False, lut=False, every_frame=False, mask_factor=1):
+    """
+    Set the module flags the live game reads, for a headless run (no display or ROI report output)
+
+    Returns:
+        The shared ColorLUT when lut is set, otherwise None
+    """
+    pipeline.DISPLAY_FRAMES = False
+    pipeline.REPORT_ROI_SAVINGS = False
+    pipeline.DETECTION_BACKEND = "thread"
+    pipeline.ANALYSIS_SCALE = scale
+    pipeline.PREFILTER = prefilter
+    pipeline.BLOB_METHOD = blob_method
+    pipeline.MASK_DOWNSAMPLE = mask_factor
+    pipeline.USE_ENHANCED_DETECTION = enhanced
+    if every_frame:
+        pipeline.ADAPTIVE_DETECTION = False
+        pipeline.USE_MOTION_GATE = False
+    return ColorLUT(pipeline.color_table, use_lab=enhanced, packed=pipeline.LUT_PACKED) if lut else None
+
+
+def replay(name, fps, frames, crop, camera_index=0, color_lut=None, viewer=False):
+    """
+    Run every frame through a CameraThread without its capture loop
+
+    With viewer set the thread behaves as if display windows were open (display copy
+    and overlays), without creating any window
+
+    Returns:
+        Dict with frames, seconds, fps, per-stage stats, peak memory, the published scores
+        and the unique color timeline
+    """
+    frames = iter(frames)
+    first = next(frames, None)
+    if first is None:
+        raise IOError(f"No frames in {name}")
+    if crop is None:
+        crop = (0, 0, first.shape[1], first.shape[0])
+    frames = itertools.chain([first], frames)
+
+    client = RecordingClient()
+    thread = pipeline.CameraThread(name, camera_index, crop, client, color_lut=color_lut)
+    thread.fps = fps
+    thread.is_video_file = True
+    thread.viewer_attached = viewer
+    timer = StageTimer(keep_samples=True)
+    thread.stage_timer = timer
+    thread.start_detection()
+
+    count = 0
+    colors = []  # (media_time, sorted unique colors) whenever the set changes
+    started = time.perf_counter()
+    while True:
+        with timer.stage("decode"):
+            frame = next(frames, None)
+        if frame is None:
+            break
+        client.media_time = count / fps
+        with timer.stage("process_frame"):
+            thread.process_frame(frame, client.media_time)
+        timer.end_frame()
+        detected = sorted(pipeline.detected_colors[camera_index])
+        if not colors or colors[-1][1] != detected:
+            colors.append((round(client.media_time, 3), detected))
+        count += 1
+    seconds = time.perf_counter() - started
+    thread.telemetry.flush()
+    thread.close_process_detector()
+    pipeline.detected_colors[camera_index].clear()
+
+    stages = {}
+    for stage in timer.counts:
+        stages[stage] = {
+            'frames': len(timer.samples_ns[stage]),
+            'mean_ms': timer.totals_ns[stage] / max(len(timer.samples_ns[stage]), 1) / 1e6,
+            **{f"p{p}_ms": value for p, value in zip(PERCENTILES, timer.percentiles_ms(stage, PERCENTILES))},
+        }
+    return {
+        'clip': name,
+        'frames': count,
+        'seconds': seconds,
+        'fps': count / seconds if seconds else 0.0,
+        'crop': list(crop),
+        'frame_stats': thread.frame_stats(),
+        'display_mb_per_s': thread.display.bytes_copied / 1e6 / seconds if seconds else 0.0,
+        'stages': stages,
+        'peak_rss_mb': resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024,  # KB on Linux
+        'scores': [(media_time, payload) for media_time, _, payload in client.messages],
+        'colors': colors,
+    }
+
+
+def print_report(result):
+    print(f"\n📼 {result['clip']} - {result['frames']} frames in {result['seconds']:.2f}s, crop {result['crop']}")
+    print(f"  throughput: {result['fps']:.1f} fps ({1000.0 / max(result['fps'], 1e-9):.2f} ms/frame)")
+    stats = result['frame_stats']
+    if 'skipped' in stats:
+        print(f"  detection passes: {stats['detected']}, skipped: {stats['skipped']}")
+    if 'gate_checks' in stats:
+        print(f"  motion gate hit rate: {stats['gate_hit_rate']:.1%}")
+    print(f"  {'stage':<15}{'frames':>8}{'mean ms':>10}" + "".join(f"{f'p{p} ms':>9}" for p in PERCENTILES))
+    for stage, entry in result['stages'].items():
+        print(f"  {stage:<15}{entry['frames']:>8}{entry['mean_ms']:>10.3f}"
+              + "".join(f"{entry[f'p{p}_ms']:>9.3f}" for p in PERCENTILES))
+    print(f"  display copies: {result['display_mb_per_s']:.1f} MB/s "
+          f"({stats['display_frames']} frames, viewer {'attached' if stats['display_frames'] else 'not attached'})")
+    print(f"  peak RSS: {result['peak_rss_mb']:.1f} MB")
+    scores = ", ".join(f"{score}@{media_time:.2f}s" for media_time, score in result['scores']) or "none"
+    print(f"  scores: {scores}")
+
+
+def box_iou(a, b):
+    """Intersection over union of two (x, y, w, h) boxes"""
+    width = min(a[0] + a[2], b[0] + b[2]) - max(a[0], b[0])
+    height = min(a[1] + a[3], b[1] + b[3]) - max(a[1], b[1])
+    if width <= 0 or height <= 0:
+        return 0.0
+    overlap = width * height
+    return overlap / (a[2] * a[3] + b[2] * b[3] - overlap)
+
+
+def mask_accuracy(frames, crop, mask_factor, color_lut=None, sample_every=5):
+    """
+    Detections with shrunk masks against full-resolution masks on every sample_every-th frame
+
+    Returns:
+        Dict with the mean IoU of each reference box with its best match of the same color,
+        the mean relative area error of those matches, and boxes missed or added
+    """
+    roi = ROIConfig(crop=tuple(crop) if crop else None, scale=pipeline.ANALYSIS_SCALE)
+    settings = dict(use_enhanced=pipeline.USE_ENHANCED_DETECTION, color_lut=color_lut, scale=roi.scale,
+                    prefilter=pipeline.PREFILTER, blob_method=pipeline.BLOB_METHOD)
+    ious, area_errors = [], []
+    missed = added = 0
+    for frame in itertools.islice(frames, 0, None, sample_every):
+        analysis_frame, _ = roi.apply(frame)
+        reference = find_color_detections(analysis_frame, pipeline.color_table, **settings)
+        shrunk = find_color_detections(analysis_frame, pipeline.color_table, mask_factor=mask_factor, **settings)
+        for (_, expected), (_, found) in zip(reference, shrunk):
+            added += max(len(found) - len(expected), 0)
+            for box in expected:
+                match = max(found, key=lambda other: box_iou(box[:4], other[:4]), default=None)
+                if match is None or box_iou(box[:4], match[:4]) == 0.0:
+                    missed += 1
+                    continue
+                ious.append(box_iou(box[:4], match[:4]))
+                area_errors.append(abs(match[4] - box[4]) / box[4])
+    return {
+        'mean_iou': sum(ious) / len(ious) if ious else 1.0,
+        'mean_area_error': sum(area_errors) / len(area_errors) if area_errors else 0.0,
+        'missed': missed,
+        'added': added,
+    }
+
+
+def compare_mask_factors(name, make_frames, fps, crop, color_lut=None):
+    """Replay a clip once per mask factor and print cost and accuracy against factor 1"""
+    rows = []
+    for factor in MASK_FACTORS:
+        pipeline.MASK_DOWNSAMPLE = factor
+        result = replay(name, fps, make_frames(), crop, color_lut=color_lut)
+        result['mask_factor'] = factor
+        result['accuracy'] = mask_accuracy(make_frames(), crop, factor, color_lut)
+        rows.append(result)
+    pipeline.MASK_DOWNSAMPLE = 1
+
+    baseline = rows[0]
+    print(f"\n🔬 {name} - mask downsampling against full-resolution masks")
+    print(f"  {'factor':>6}{'fps':>8}{'morph ms':>10}{'blobs ms':>10}{'IoU':>7}{'area err':>10}"
+          f"{'missed':>8}{'added':>7}  scores")
+    for result in rows:
+        stages, accuracy = result['stages'], result['accuracy']
+        same_scores = [score for _, score in result['scores']] == [score for _, score in baseline['scores']]
+        print(f"  {result['mask_factor']:>6}{result['fps']:>8.1f}"
+              f"{stages.get('morphology', {}).get('mean_ms', 0.0):>10.3f}"
+              f"{stages.get('blobs', {}).get('mean_ms', 0.0):>10.3f}"
+              f"{accuracy['mean_iou']:>7.3f}{accuracy['mean_area_error']:>10.1%}"
+              f"{accuracy['missed']:>8}{accuracy['added']:>7}  {'same' if same_scores else 'CHANGED'}")
+    return rows
+
+
+def main():
+    """Main function with command line interface"""
+    parser = argparse.ArgumentParser(description='Replay clips through the camera detection pipeline headlessly')
+    parser.add_argument('clips', nargs='*', help='Recorded clips (.mp4, .avi, ...)')
+    parser.add_argument('--synthetic', type=int, metavar='FRAMES', help='Also replay this many synthetic frames')
+    parser.add_argument('--crop', type=int, nargs=4, metavar=('X0', 'Y0', 'X1', 'Y1'),
+                        help='Play-area crop, full frame if omitted')
+    parser.add_argument('--scale', type=float, default=pipeline.ANALYSIS_SCALE, help='Analysis scale')
+    parser.add_argument('--prefilter', default=pipeline.PREFILTER, choices=list(PREFILTERS))
+    parser.add_argument('--blob-method', default=pipeline.BLOB_METHOD, choices=list(BLOB_METHODS))
+    parser.add_argument('--enhanced', action='store_true', help='Use HSV+LAB enhanced detection')
+    parser.add_argument('--lut', action='store_true', help='Use the LUT color classifier')
+    parser.add_argument('--mask-downsample', type=int, default=pipeline.MASK_DOWNSAMPLE, choices=MASK_FACTORS,
+                        help='Run morphology and blob extraction on masks shrunk by this factor')
+    parser.add_argument('--compare-mask-downsample', action='store_true',
+                        help='Replay every clip at each mask factor and compare cost and accuracy')
+    parser.add_argument('--every-frame', action='store_true',
+                        help='Detect on every frame (no adaptive rate, no motion gate)')
+    parser.add_argument('--viewer', action='store_true',
+                        help='Draw display overlays as if a viewer was attached (no window is opened)')
+    parser.add_argument('--max-frames', type=int, help='Stop after this many frames per clip')
+    parser.add_argument('--json', metavar='PATH', help='Also write the results as JSON')
+    args = parser.parse_args()
+
+    if not args.clips and not args.synthetic:
+        parser.error("give at least one clip or --synthetic FRAMES")
+
+    color_lut = configure_pipeline(args.scale, args.prefilter, args.blob_method, args.enhanced, args.lut,
+                                   args.every_frame, args.mask_downsample)
+    crop = tuple(args.crop) if args.crop else None
+
+    if args.compare_mask_downsample:
+        results = []
+        if args.synthetic:
+            results += compare_mask_factors("synthetic", lambda: synthetic_frames(args.synthetic), SYNTHETIC_FPS,
+                                            crop, color_lut)
+        for path in args.clips:
+            try:
+                fps, _ = clip_frames(path, 1)
+                results += compare_mask_factors(path, lambda: clip_frames(path, args.max_frames)[1], fps, crop,
+                                                color_lut)
+            except IOError as e:
+                print(f"❌ {e}")
+                return 1
+        if args.json:
+            with open(args.json, 'w') as f:
+                json.dump(results, f, indent=2)
+            print(f"\n💾 Results written to {args.json}")
+        return 0
+
+    results = []
+    if args.synthetic:
+        results.append(replay("synthetic", SYNTHETIC_FPS, synthetic_frames(args.synthetic), crop, color_lut=color_lut,
+                              viewer=args.viewer))
+        print_report(results[-1])
+    for path in args.clips:
+        try:
+            fps, frames = clip_frames(path, args.max_frames)
+            results.append(replay(path, fps, frames, crop, color_lut=color_lut, viewer=args.viewer))
+        except IOError as e:
+            print(f"❌ {e}")
+            return 1
+        print_report(results[-1])
+
+    if args.json:
+        with open(args.json, 'w') as f:
+            json.dump(results, f, indent=2)
+        print(f"\n💾 Results written to {args.json}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
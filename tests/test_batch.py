@@ -0,0 +1,139 @@
+#!/usr/bin/env python3
+"""
+Test script for batched multi-camera detection (detection/batch.py)
+"""
+
+import sys
+import os
+import threading
+
+import cv2
+
+# Add scripts_helper directory to path for imports
+sys.path.append(os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "scripts_helper"))
+
+from detection.batch import BatchDetector, StackedFrames, detect_stacked
+from detection.color_detector import standard_detections
+from detection.prefilter import get_prefilter
+from detection.synthetic import SceneConfig, SyntheticScene
+import pyCatch1_2025 as pipeline
+from pyCatch1_2025 import color_table
+from replay_benchmark import RecordingClient
+
+
+def camera_crops():
+    """Three crops of different sizes with every calibrated color visible"""
+    crops = []
+    for seed, (width, height) in enumerate([(640, 480), (480, 560), (560, 400)]):
+        scene = SyntheticScene(SceneConfig(width=width, height=height, sticks=4, speed=0.0,
+                                           seed=seed), color_table)
+        crops.append(scene.render(0))
+    return crops
+
+
+def colors(results):
+    return [(name, len(objects)) for name, objects in results]
+
+
+def test_layout():
+    """Adding a slot keeps what is already in the others, slots never overlap"""
+    frames = StackedFrames(gap_rows=4)
+    frames.layout(0, (10, 20, 3))
+    frames.view(0)[:] = 7
+    frames.layout(1, (5, 30, 3))
+    assert frames.stack.shape == (28, 30, 3)  # Slots start on multiples of 4 rows
+    assert (frames.view(0) == 7).all() and (frames.view(1) == 0).all()
+    assert frames.fits(1, (5, 30, 3)) and not frames.fits(1, (6, 30, 3))
+
+
+def test_same_detections():
+    """The stacked pass finds the same objects per camera as separate passes, also on shrunk masks"""
+    crops = camera_crops()
+    frames = StackedFrames()
+    for key, crop in enumerate(crops):
+        frames.layout(key, crop.shape)
+        frames.view(key)[:] = crop
+    for mask_factor in (1, 2):
+        batched = detect_stacked(frames, range(len(crops)), color_table, mask_factor=mask_factor)
+        for key, crop in enumerate(crops):
+            hsv_frame = cv2.cvtColor(get_prefilter("bilateral")(crop), cv2.COLOR_BGR2HSV)
+            expected = standard_detections(hsv_frame, color_table, mask_factor=mask_factor)
+            assert colors(batched[key]) == colors(expected), (mask_factor, key)
+            assert any(objects for _, objects in expected)
+
+
+def test_thread_delivers():
+    """Crops submitted by several cameras are detected in one tick and delivered to each"""
+    crops = camera_crops()
+    batch = BatchDetector(color_table, wait_seconds=1.0, expected=lambda: len(crops))
+    delivered = {}
+    done = threading.Event()
+
+    def deliver(key):
+        def store(results):
+            delivered[key] = results
+            if len(delivered) == len(crops):
+                done.set()
+        return store
+
+    for key, crop in enumerate(crops):
+        assert batch.submit(key, crop, deliver(key))
+    assert not batch.submit(0, crops[0], deliver(0))  # One crop in flight per camera
+    batch.start()
+    try:
+        assert done.wait(10.0)
+    finally:
+        batch.stop()
+        batch.join()
+    assert batch.ticks == 1 and batch.crops == len(crops)
+    assert all(any(objects for _, objects in delivered[key]) for key in delivered)
+
+
+class HeldBatch:
+    """Stands in for BatchDetector and keeps each deliver callback until the test calls it"""
+
+    def __init__(self):
+        self.delivers = []
+
+    def submit(self, key, crop, deliver):
+        self.delivers.append(deliver)
+        return True
+
+
+def test_late_results_dropped():
+    """Results of a crop submitted before start_detection are never applied to the new request"""
+    crop = camera_crops()[0]
+    pipeline.DISPLAY_FRAMES = False
+    thread = pipeline.CameraThread("synthetic", 0, (0, 0, 640, 480), RecordingClient())
+    thread.batch = HeldBatch()
+    thread.start_detection()
+    try:
+        thread.detect_batched(crop, 0, 0, 0.0)
+        thread.start_detection()  # New round while the first crop is still in the batch
+        thread.detect_batched(crop, 0, 0, 1.0)
+        old_deliver, new_deliver = thread.batch.delivers
+        old_results, new_results = [('blue', [(0, 0, 10, 50, 400)])], [('blue', [(200, 100, 10, 50, 400)])]
+
+        old_deliver(old_results)
+        thread.apply_batch_results()
+        assert thread.last_detections is None and thread.batch_request is not None
+
+        new_deliver(new_results)
+        thread.apply_batch_results()
+        assert thread.last_detections[0] is new_results and thread.batch_request is None
+    finally:
+        thread.stop_detection()
+
+
+def main():
+    """Main function"""
+    test_layout()
+    test_same_detections()
+    test_thread_delivers()
+    test_late_results_dropped()
+    print("✅ Batch detection tests passed")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,133 @@
+#!/usr/bin/env python3
+"""
+Test script for the contour and connected-component blob finders
+"""
+
+import sys
+import os
+
+import cv2
+import numpy as np
+
+# Add scripts_helper directory to path for imports
+sys.path.append(os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "scripts_helper"))
+
+from detection.blobs import component_blobs, contour_blobs, get_blob_finder
+from detection.color_detector import downsample_mask, standard_detections
+from detection.color_table import ColorTable
+
+
+def make_mask():
+    """Sticks, a square, a thin line and specks"""
+    mask = np.zeros((300, 400), dtype=np.uint8)
+    mask[20:220, 30:70] = 255  # Vertical stick, 40x200
+    mask[250:280, 100:300] = 255  # Horizontal stick, 200x30
+    cv2.ellipse(mask, (250, 120), (25, 80), 30, 0, 360, 255, -1)  # Tilted stick
+    mask[100:160, 320:380] = 255  # Square, 60x60
+    mask[10:14, 100:390] = 255  # Thin line, 290x4
+    mask[200:203, 200:203] = 255  # Speck
+    return mask
+
+
+def boxes(blobs):
+    return sorted(blob[:4] for blob in blobs)
+
+
+def test_same_boxes_for_same_filters():
+    """Both methods keep the same blobs with the same boxes for area and aspect ratio rules"""
+    mask = make_mask()
+    for kwargs in ({'area_min': 500}, {'area_min': 1500, 'area_max': 7000},
+                   {'area_min': 500, 'min_aspect': 2.0}, {'area_min': 100, 'max_aspect': 10}):
+        contours = contour_blobs(mask, **kwargs)
+        components = component_blobs(mask, **kwargs)
+        assert boxes(contours) == boxes(components), kwargs
+        assert len(contours) > 0
+
+
+def test_component_area_matches_contour_area():
+    """Component areas equal contourArea for solid blobs, a hole and a blob inside it are the known differences"""
+    mask = make_mask()
+    contours, components = sorted(contour_blobs(mask)), sorted(component_blobs(mask))
+    assert [blob[:4] for blob in contours] == [blob[:4] for blob in components]
+    for contour, component in zip(contours, components):
+        assert abs(contour[4] - component[4]) <= 0.5, (contour, component)
+    assert (30, 20, 40, 200, 39 * 199) in components  # The vertical stick, 8000 pixels
+
+    # A 10x10 hole is left out with half its border, the blob inside it is reported on its own
+    mask = np.zeros((300, 100), dtype=np.uint8)
+    mask[20:220, 30:70] = 255
+    mask[100:110, 45:55] = 0
+    mask[104:106, 49:51] = 255
+    (_, _, _, _, contour_area), = contour_blobs(mask)
+    (_, _, _, _, component_area), (_, _, _, _, inner_area) = component_blobs(mask)
+    assert contour_area == 39 * 199
+    assert component_area == contour_area - 100 - 40 / 2 and inner_area == 1
+
+
+def test_standard_detections_match():
+    """Full HSV detection gives the same objects with either method"""
+    table = ColorTable({'blue': {'hsv': ((104, 155, 146), (119, 255, 255))},
+                        'yellow': {'hsv': ((21, 81, 144), (42, 255, 255))}})
+    hsv = np.zeros((300, 400, 3), dtype=np.uint8)
+    hsv[20:220, 30:70] = (110, 200, 200)
+    hsv[40:260, 200:250] = (30, 200, 200)
+    hsv[250:270, 300:310] = (30, 200, 200)  # Too small for the standard area limit
+    contours = standard_detections(hsv, table, blob_method="contours")
+    components = standard_detections(hsv, table, blob_method="components")
+    assert [(name, boxes(objects)) for name, objects in contours] == \
+        [(name, boxes(objects)) for name, objects in components]
+    assert [len(objects) for _, objects in components] == [1, 1]
+
+
+def test_downsample_mask_majority():
+    """A shrunk pixel is set when at least half of its block is set"""
+    mask = np.zeros((8, 8), dtype=np.uint8)
+    mask[0:2, 0:2] = 255  # Full block
+    mask[0:2, 2] = 255  # Half block
+    mask[2, 0] = 255  # Quarter block stays unset
+    mask[4:8, 4:7] = 255  # Three quarters of a 4x4 block
+    assert downsample_mask(mask, 2)[:2, :2].tolist() == [[255, 255], [0, 0]]
+    assert downsample_mask(mask, 4).tolist() == [[0, 0], [0, 255]]
+    assert downsample_mask(mask, 1) is mask
+
+
+def test_downsampled_detections_match():
+    """Shrunk masks keep the same objects, boxes within two blocks and areas within the edge blocks"""
+    table = ColorTable({'blue': {'hsv': ((104, 155, 146), (119, 255, 255))},
+                        'yellow': {'hsv': ((21, 81, 144), (42, 255, 255))}})
+    hsv = np.zeros((300, 400, 3), dtype=np.uint8)
+    hsv[21:221, 31:71] = (110, 200, 200)
+    hsv[41:261, 201:251] = (30, 200, 200)
+    hsv[250:270, 300:340] = (30, 200, 200)  # 800 px, below the standard area limit at every factor
+    reference = standard_detections(hsv, table, blob_method="components")
+    for factor in (2, 4):
+        shrunk = standard_detections(hsv, table, blob_method="components", mask_factor=factor)
+        assert [len(objects) for _, objects in shrunk] == [1, 1], factor
+        for (_, (expected,)), (_, (found,)) in zip(reference, shrunk):
+            assert all(abs(a - b) <= 2 * factor for a, b in zip(expected[:4], found[:4])), (factor, expected, found)
+            # Edge blocks are kept or dropped whole: at most half a perimeter of blocks off
+            assert abs(found[4] - expected[4]) <= (expected[2] + expected[3]) * factor
+
+
+def test_unknown_blob_method_rejected():
+    try:
+        get_blob_finder("hough")
+    except ValueError:
+        return
+    raise AssertionError("unknown blob method was accepted")
+
+
+def main():
+    """Main function"""
+    test_same_boxes_for_same_filters()
+    test_component_area_matches_contour_area()
+    test_standard_detections_match()
+    test_downsample_mask_majority()
+    test_downsampled_detections_match()
+    test_unknown_blob_method_rejected()
+    print("✅ Blob finder tests passed")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
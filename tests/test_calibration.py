@@ -0,0 +1,138 @@
+#!/usr/bin/env python3
+"""
+Test script for calibration profiles and their hot reload (detection/calibration.py)
+"""
+
+import sys
+import os
+import json
+import tempfile
+
+# Add scripts_helper directory to path for imports
+sys.path.append(os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "scripts_helper"))
+
+import replay_benchmark
+from detection.calibration import CalibrationStore, colors_from_json
+from pyCatch1_2025 import calibrated_colors
+
+pipeline = replay_benchmark.pipeline
+
+PINK = {'hsv': ((149, 30, 115), (170, 185, 255)), 'lab': ((38, 153, 108), (255, 188, 132)),
+        'area_min': 100.0, 'area_max': 50000.0}
+BLUE = {'hsv': ((104, 155, 146), (119, 255, 255))}
+
+
+def temporary_store():
+    return CalibrationStore(os.path.join(tempfile.mkdtemp(), "calibration_profiles.json"))
+
+
+def test_round_trip():
+    """Saved colors load back as the same tuples, every write bumps the version"""
+    store = temporary_store()
+    assert not store.exists() and store.profile_names() == []
+    assert store.save_profile("evening", {'pink': PINK, 'blue': BLUE}) == 1
+    assert store.save_profile("daylight", {'blue': BLUE}) == 2
+    assert store.active_profile() == "evening"  # The first profile becomes the active one
+    name, version, colors = store.profile()
+    assert (name, version) == ("evening", 1)
+    assert colors == {'pink': PINK, 'blue': BLUE}
+    assert store.activate("daylight") == 3 and store.profile()[:2] == ("daylight", 2)
+    assert not os.path.exists(store.path + ".tmp")  # Written through a replaced temporary file
+
+
+def test_save_color_keeps_others():
+    """Saving one color keeps the other colors and the color's own area limits"""
+    store = temporary_store()
+    store.save_profile("evening", {'pink': PINK, 'blue': BLUE})
+    darker = {'hsv': ((150, 40, 90), (170, 185, 255)), 'lab': ((30, 150, 100), (255, 190, 135))}
+    store.save_color("evening", "pink", darker)
+    _, version, colors = store.profile("evening")
+    assert version == 2 and colors['blue'] == BLUE
+    assert colors['pink'] == {**darker, 'area_min': 100.0, 'area_max': 50000.0}
+
+    # A new profile starts from the caller's colors
+    store.save_color("night", "blue", darker, base_colors={'pink': PINK})
+    assert sorted(store.profile("night")[2]) == ['blue', 'pink']
+
+
+def test_invalid_profiles_rejected():
+    """Malformed colors are never written, unknown profiles raise KeyError"""
+    store = temporary_store()
+    for colors in ({}, {'pink': {'lab': PINK['lab']}}, {'pink': {'hsv': ((0, 0, 0), (180, 300, 255))}},
+                   {'pink': {'hsv': ((0, 0), (180, 255))}}):
+        try:
+            store.save_profile("bad", colors)
+        except ValueError:
+            continue
+        raise AssertionError(f"invalid colors were saved: {colors}")
+    assert not store.exists()
+    for colors in ({'pink': {'hsv': "pink"}}, {'pink': "hsv"}, {'pink': ["hsv"]}, {'pink': None},
+                   {'pink': {'hsv': PINK['hsv'], 'area_min': [100]}}):
+        try:
+            colors_from_json(colors)
+        except ValueError:
+            continue
+        raise AssertionError(f"invalid JSON colors were accepted: {colors}")
+    store.save_profile("evening", {'pink': PINK})
+    try:
+        store.profile("night")
+    except KeyError:
+        return
+    raise AssertionError("unknown profile was loaded")
+
+
+def test_hot_reload():
+    """A reloaded profile reaches the cameras before their next frame, a bad one keeps the current"""
+    store = temporary_store()
+    store.save_profile("daylight", calibrated_colors)
+    reduced = {name: calibrated_colors[name] for name in list(calibrated_colors)[:2]}
+    store.save_profile("night", reduced)
+
+    pipeline.DISPLAY_FRAMES = False
+    pipeline.REPORT_ROI_SAVINGS = False
+    pipeline.CALIBRATION_FILE = store.path
+    client = replay_benchmark.RecordingClient()
+    try:
+        manager = pipeline.VideoCaptureManager(["synthetic"], [(0, 0, 480, 360)], client)
+    finally:
+        pipeline.CALIBRATION_FILE = "calibration_profiles.json"
+    thread = manager.camera_threads[0]
+    thread.start_detection()
+    try:
+        assert manager.calibration == ("daylight", 1)
+        frames = replay_benchmark.synthetic_frames(20, size=(480, 360))
+        for timestamp, frame in enumerate(frames):
+            thread.process_frame(frame, timestamp * 0.1)
+            if timestamp == 9:
+                old_table = thread.color_table
+                manager.request_calibration("night")
+                manager.update_calibration()
+                assert thread.color_table is old_table  # Swapped by the camera thread, not the caller
+            elif timestamp == 10:
+                assert thread.color_table.names == list(reduced) and thread.color_table is not old_table
+                assert set(thread.presence.levels) == set(reduced)
+        status = [json.loads(payload) for _, topic, payload in client.messages
+                  if topic == "FalconGrasp/calibration/status"]
+        assert status == [{'profile': "night", 'version': 2}]
+
+        manager.request_calibration("missing")
+        manager.update_calibration()
+        assert manager.calibration == ("night", 2)
+        last = json.loads(client.messages[-1][2])
+        assert last['profile'] == "night" and "missing" in last['error']
+    finally:
+        thread.stop_detection()  # Clears the camera's detected colors for the tests that follow
+
+
+def main():
+    """Main function"""
+    test_round_trip()
+    test_save_color_keeps_others()
+    test_invalid_profiles_rejected()
+    test_hot_reload()
+    print("✅ Calibration profile tests passed")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,128 @@
+#!/usr/bin/env python3
+"""
+Test script for the capture layer (local video file and an unreachable RTSP stand-in)
+"""
+
+import sys
+import os
+import tempfile
+import threading
+import time
+
+import cv2
+import numpy as np
+
+# Add scripts_helper directory to path for imports
+sys.path.append(os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "scripts_helper"))
+
+from detection import capture
+from detection.capture import FFMPEG_OPTIONS_VARIABLE, Backoff, CaptureConfig, open_capture, stream_url
+from detection.frame_grabber import FrameGrabber
+
+# Nothing listens on port 1, FFmpeg gets "connection refused" straight away
+UNREACHABLE_STREAM = "rtsp://127.0.0.1:1"
+
+
+def write_clip(path, frames=10, size=(160, 120)):
+    writer = cv2.VideoWriter(path, cv2.VideoWriter_fourcc(*'mp4v'), 25, size)
+    for index in range(frames):
+        writer.write(np.full((size[1], size[0], 3), index * 20, dtype=np.uint8))
+    writer.release()
+
+
+def test_options():
+    """FFmpeg option string, open parameters and substream URLs"""
+    config = CaptureConfig(rtsp_transport="tcp", low_latency=True, hw_acceleration=True, open_timeout=2.0)
+    assert config.ffmpeg_options() == "rtsp_transport;tcp|fflags;nobuffer|flags;low_delay"
+    assert CaptureConfig().ffmpeg_options() == ""
+    params = config.open_params()
+    assert params[params.index(cv2.CAP_PROP_OPEN_TIMEOUT_MSEC) + 1] == 2000
+
+    assert stream_url("rtsp://admin:pw@10.0.0.2:554", "Streaming/Channels/102") == \
+        "rtsp://admin:pw@10.0.0.2:554/Streaming/Channels/102"
+    assert stream_url("rtsp://10.0.0.2:554/live", "sub") == "rtsp://10.0.0.2:554/live"
+    assert stream_url("clip.mp4", "sub") == "clip.mp4"
+
+
+def test_backoff():
+    """Delays double up to the maximum and start over after a success"""
+    backoff = Backoff(0.5, 3.0)
+    assert [backoff.next_delay() for _ in range(5)] == [0.5, 1.0, 2.0, 3.0, 3.0]
+    backoff.reset()
+    assert backoff.next_delay() == 0.5
+
+
+def test_open_local_file():
+    """A configured capture (FFmpeg, hardware decode if any, small buffer) reads a local file"""
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "clip.mp4")
+        write_clip(path)
+        config = CaptureConfig(backend="ffmpeg", buffer_size=1, hw_acceleration=True, read_timeout=2.0)
+        cap = open_capture(path, config)
+        assert cap.isOpened()
+        frames = 0
+        while True:
+            ret, frame = cap.read()
+            if not ret:
+                break
+            assert frame.shape == (120, 160, 3)
+            frames += 1
+        cap.release()
+        assert frames == 10
+
+
+def test_reconnect_backoff():
+    """An unreachable stream is retried with growing delays, not in a tight loop"""
+    config = CaptureConfig(backend="ffmpeg", rtsp_transport="tcp", low_latency=True, open_timeout=1.0)
+    grabber = FrameGrabber(UNREACHABLE_STREAM, 0, capture_config=config, backoff=Backoff(0.2, 1.0))
+    grabber.start()
+    time.sleep(1.3)  # Waits of 0.2, 0.4 and 0.8 s fit at most 3 reopen attempts
+    grabber.stop()
+    grabber.join(timeout=2)
+    assert not grabber.is_alive(), "stop() did not interrupt the reconnect wait"
+    assert 1 <= grabber.reconnects <= 3, grabber.reconnects
+    assert FFMPEG_OPTIONS_VARIABLE not in os.environ  # Set for each open only
+
+
+def test_parallel_opens_keep_own_options():
+    """Cameras opening at the same time each see their own FFmpeg options, none are left behind"""
+    seen = []
+    real_capture = capture.cv2.VideoCapture
+
+    def recording_capture(source, *args):
+        options = os.environ.get(FFMPEG_OPTIONS_VARIABLE)
+        time.sleep(0.01)  # Give another thread the chance to change the environment
+        seen.append((source, options, os.environ.get(FFMPEG_OPTIONS_VARIABLE)))
+        return real_capture()
+
+    configs = {f"rtsp://10.0.0.{index}:554/live": CaptureConfig(rtsp_transport=transport, low_latency=index % 2 == 0)
+               for index, transport in enumerate(["tcp", "udp", None, "tcp", None, "udp"])}
+    capture.cv2.VideoCapture = recording_capture
+    try:
+        threads = [threading.Thread(target=open_capture, args=item) for item in configs.items()]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+    finally:
+        capture.cv2.VideoCapture = real_capture
+    assert len(seen) == len(configs)
+    for source, before, after in seen:
+        expected = configs[source].ffmpeg_options() or None
+        assert before == after == expected, (source, before, after)
+    assert FFMPEG_OPTIONS_VARIABLE not in os.environ
+
+
+def main():
+    """Main function"""
+    test_options()
+    test_backoff()
+    test_open_local_file()
+    test_reconnect_backoff()
+    test_parallel_opens_keep_own_options()
+    print("✅ Capture tests passed")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,123 @@
+#!/usr/bin/env python3
+"""
+Test script to verify the LUT color classifier matches the per-color inRange masks
+"""
+
+import sys
+import os
+
+import cv2
+import numpy as np
+
+# Add scripts_helper directory to path for imports
+sys.path.append(os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "scripts_helper"))
+
+from detection.color_detector import enhanced_detections, lut_detections
+from detection.color_table import ColorTable
+from detection.lut import ColorLUT
+from detection.synthetic import SceneConfig, SyntheticScene
+from pyCatch1_2025 import color_table
+
+# Two non-overlapping colors so every pixel has exactly one expected label
+TEST_COLORS = {
+    'blue': {
+        'hsv': ((106, 70, 187), (129, 233, 255)),
+        'lab': ((int(43*2.55), 1+127, -65+127), (int(84*2.55), 27+127, -25+127)),
+        'area_min': 100, 'area_max': 50000
+    },
+    'yellow': {
+        'hsv': ((19, 82, 179), (32, 255, 255)),
+        'lab': ((int(50*2.55), -69+127, 54+127), (int(100*2.55), 128+127, 128+127)),
+        'area_min': 100, 'area_max': 50000
+    },
+}
+
+
+def random_frame(seed=0):
+    rng = np.random.default_rng(seed)
+    return rng.integers(0, 256, (120, 160, 3), dtype=np.uint8)
+
+
+def expected_labels(frame, use_lab):
+    hsv = cv2.cvtColor(frame, cv2.COLOR_BGR2HSV)
+    lab = cv2.cvtColor(frame, cv2.COLOR_BGR2LAB)
+    labels = np.zeros(frame.shape[:2], dtype=np.uint8)
+    for label, ranges in enumerate(TEST_COLORS.values(), start=1):
+        mask = cv2.inRange(hsv, np.array(ranges['hsv'][0]), np.array(ranges['hsv'][1]))
+        if use_lab:
+            mask &= cv2.inRange(lab, np.array(ranges['lab'][0]), np.array(ranges['lab'][1]))
+        labels[mask > 0] = label
+    return labels
+
+
+def test_lut_matches_inrange_hsv():
+    """Exact (8-bit) HSV table must reproduce inRange pixel for pixel"""
+    frame = random_frame()
+    lut = ColorLUT(ColorTable(TEST_COLORS))
+    assert np.array_equal(lut.classify(frame), expected_labels(frame, use_lab=False))
+
+
+def test_lut_matches_inrange_hybrid():
+    """Exact (8-bit) HSV+LAB table must reproduce the hybrid intersection"""
+    frame = random_frame(1)
+    lut = ColorLUT(ColorTable(TEST_COLORS), use_lab=True)
+    assert np.array_equal(lut.classify(frame), expected_labels(frame, use_lab=True))
+
+
+def test_lut_counts_and_masks():
+    """Label counts and per-label masks line up with the label image"""
+    hsv = np.zeros((10, 10, 3), dtype=np.uint8)
+    hsv[:, :5] = (115, 150, 220)    # Inside the blue HSV range
+    hsv[:, 5:] = (25, 200, 230)     # Inside the yellow HSV range
+    frame = cv2.cvtColor(hsv, cv2.COLOR_HSV2BGR)
+    lut = ColorLUT(ColorTable(TEST_COLORS))
+    labels = lut.classify(frame)
+    counts = lut.label_counts(labels)
+    assert counts.tolist() == [0, 50, 50]
+    assert int(np.count_nonzero(lut.mask(labels, 1))) == 50
+
+
+def test_packed_matches_inrange_with_overlap():
+    """A packed table keeps every color's own mask, also where two ranges overlap"""
+    overlapping = dict(TEST_COLORS)
+    overlapping['wide_blue'] = {'hsv': ((100, 50, 150), (135, 255, 255)),
+                                'lab': ((0, 0, 0), (255, 255, 255)), 'area_min': 100, 'area_max': 50000}
+    frame = random_frame(2)
+    table = ColorTable(overlapping)
+    lut = ColorLUT(table, use_lab=True, packed=True)
+    bitmask = lut.classify(frame)
+    assert bitmask.dtype == np.uint16
+    hsv = cv2.cvtColor(frame, cv2.COLOR_BGR2HSV)
+    lab = cv2.cvtColor(frame, cv2.COLOR_BGR2LAB)
+    mask = np.empty(frame.shape[:2], dtype=np.uint8)
+    counts = lut.label_counts(bitmask)
+    for entry in table:
+        expected = cv2.inRange(hsv, entry.hsv_lower, entry.hsv_upper) & cv2.inRange(lab, entry.lab_lower, entry.lab_upper)
+        assert np.array_equal(lut.mask(bitmask, entry.label, out=mask), expected), entry.name
+        assert counts[entry.label] == np.count_nonzero(expected)
+    assert np.count_nonzero(lut.mask(bitmask, 1) & lut.mask(bitmask, 3)) > 0  # The overlap really is there
+
+
+def test_packed_detections_match_enhanced():
+    """LUT detections on a packed classification equal the per-color enhanced detections"""
+    frame = SyntheticScene(SceneConfig(width=640, height=480, sticks=6, seed=3), color_table).render(0)
+    lut = ColorLUT(color_table, use_lab=True, packed=True)
+    expected = enhanced_detections(cv2.cvtColor(frame, cv2.COLOR_BGR2HSV), cv2.cvtColor(frame, cv2.COLOR_BGR2LAB),
+                                   color_table)
+    assert lut_detections(lut.classify(frame), lut, color_table, use_enhanced=True) == expected
+    assert any(objects for _, objects in expected)
+
+
+def main():
+    """Main function"""
+    test_lut_matches_inrange_hsv()
+    test_lut_matches_inrange_hybrid()
+    test_lut_counts_and_masks()
+    test_packed_matches_inrange_with_overlap()
+    test_packed_detections_match_enhanced()
+    print("✅ Color LUT tests passed")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,67 @@
+#!/usr/bin/env python3
+"""
+Test script for the compiled color table shared by the detectors
+"""
+
+import sys
+import os
+
+import numpy as np
+
+# Add scripts_helper directory to path for imports
+sys.path.append(os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "scripts_helper"))
+
+from detection.color_table import DEFAULT_DISPLAY_BGR, ColorTable
+
+TEST_COLORS = {
+    'blue': {
+        'hsv': ((106, 70, 187), (129, 233, 255)),
+        'lab': ((int(43*2.55), 1+127, -65+127), (int(84*2.55), 27+127, -25+127)),
+        'area_min': 100, 'area_max': 50000
+    },
+    'yellow': {
+        'hsv': ((19, 82, 179), (32, 255, 255)),
+        'lab': ((int(50*2.55), -69+127, 54+127), (int(100*2.55), 128+127, 128+127)),
+    },
+}
+
+
+def test_entries_compiled_in_table_order():
+    table = ColorTable(TEST_COLORS, {'blue': (255, 0, 0)}, area_min=700, area_max=9000)
+    assert table.names == ['blue', 'yellow']
+    blue, yellow = table.entries
+    assert (blue.label, yellow.label) == (1, 2)
+    assert np.array_equal(blue.hsv_lower, [106, 70, 187])
+    assert np.array_equal(yellow.lab_upper, [254, 255, 255])
+    # Own limits win, missing ones fall back to the table defaults
+    assert (blue.area_min, blue.area_max) == (100, 50000)
+    assert (yellow.area_min, yellow.area_max) == (700, 9000)
+    assert blue.display_bgr == (255, 0, 0)
+    assert table['yellow'].display_bgr == DEFAULT_DISPLAY_BGR
+
+
+def test_kernels_built_once_per_scale():
+    table = ColorTable(TEST_COLORS)
+    assert table.kernel() is table.kernel()
+    assert table.kernel().shape == (9, 9)
+    assert table.kernel(0.5).shape == (5, 5)
+    assert table.kernel(size=3).shape == (3, 3)
+
+
+def test_hsv_only_ranges():
+    table = ColorTable.from_hsv_ranges({'red': ((166, 166, 0), (179, 255, 255))})
+    assert table['red'].lab_lower is None
+    assert np.array_equal(table['red'].hsv_upper, [179, 255, 255])
+
+
+def main():
+    """Main function"""
+    test_entries_compiled_in_table_order()
+    test_kernels_built_once_per_scale()
+    test_hsv_only_ranges()
+    print("✅ Color table tests passed")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
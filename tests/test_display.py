@@ -0,0 +1,88 @@
+#!/usr/bin/env python3
+"""
+Test script for the double-buffered display path and the mosaic view (no window is opened)
+"""
+
+import sys
+import os
+
+import numpy as np
+
+# Add scripts_helper directory to path for imports
+sys.path.append(os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "scripts_helper"))
+
+import replay_benchmark
+from detection.display import DisplayBuffer, MosaicView
+
+
+def test_double_buffer():
+    """The viewer sees the last swapped frame, the writer never reuses the buffer being shown"""
+    display = DisplayBuffer()
+    with display.front() as frame:
+        assert frame is None
+
+    first = np.full((4, 6, 3), 1, dtype=np.uint8)
+    back = display.back(first)
+    assert back is not first and np.array_equal(back, first)
+    display.swap()
+
+    second_back = display.back(np.full((4, 6, 3), 2, dtype=np.uint8))
+    assert second_back is not back
+    with display.front() as frame:
+        assert frame is back and frame[0, 0, 0] == 1
+    display.swap()
+    with display.front() as frame:
+        assert frame[0, 0, 0] == 2
+
+    # Buffers are reused, not reallocated per frame
+    assert display.back(first) is back
+    assert display.stats() == {'display_frames': 2, 'display_bytes': 3 * first.nbytes}
+
+
+def test_mosaic_tiles():
+    """Each camera is downscaled into its own tile, tiles without new frames are left alone"""
+    displays = [DisplayBuffer() for _ in range(5)]
+    mosaic = MosaicView(len(displays), tile_size=(64, 36), columns=3)
+    assert mosaic.canvas.shape == (72, 192, 3)
+
+    for index, display in enumerate(displays[:4]):
+        display.back(np.full((360, 640, 3), 10 * (index + 1), dtype=np.uint8))
+        display.swap()
+    canvas = mosaic.render(displays)
+    assert canvas[0, 0, 0] == 10 and canvas[0, 64, 0] == 20 and canvas[36, 0, 0] == 40
+    assert canvas[36:72, 64:128].max() > 0  # Camera 4 still shows its waiting label
+
+    mosaic.tiles[0][:] = 0
+    mosaic.render(displays)
+    assert canvas[0, 0, 0] == 0  # Unchanged camera, tile not redrawn
+
+
+def test_no_copies_without_viewer():
+    """Without a viewer no frame is copied, with one every frame is copied exactly once"""
+    replay_benchmark.pipeline.DISPLAY_FRAMES = False
+    replay_benchmark.pipeline.REPORT_ROI_SAVINGS = False
+    size = (320, 240)
+    frame_bytes = size[0] * size[1] * 3
+
+    headless = replay_benchmark.replay("synthetic", replay_benchmark.SYNTHETIC_FPS,
+                                       replay_benchmark.synthetic_frames(20, size=size), None)
+    assert headless['frame_stats']['display_bytes'] == 0
+
+    viewed = replay_benchmark.replay("synthetic", replay_benchmark.SYNTHETIC_FPS,
+                                     replay_benchmark.synthetic_frames(20, size=size), None, viewer=True)
+    assert viewed['frame_stats']['display_frames'] == 20
+    assert viewed['frame_stats']['display_bytes'] == 20 * frame_bytes
+    assert viewed['scores'] == headless['scores']
+
+
+def main():
+    """Main function"""
+    test_double_buffer()
+    test_mosaic_tiles()
+    test_no_copies_without_viewer()
+    print("✅ Display buffer tests passed")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,193 @@
+#!/usr/bin/env python3
+"""
+Test script for the decoupled frame grabber and its frame ring (detection/frame_grabber.py)
+"""
+
+import sys
+import os
+import time
+
+import numpy as np
+
+# Add scripts_helper directory to path for imports
+sys.path.append(os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "scripts_helper"))
+
+from detection.capture import Backoff
+from detection.frame_grabber import FrameGrabber, FrameRing
+
+SHAPE = (120, 160, 3)
+
+
+class FakeCapture:
+    """Stands in for cv2.VideoCapture: numbered frames decoded into the buffer it is given"""
+
+    def __init__(self, frames=None, first=1):
+        self.frames = frames  # Frames before read() fails, None = never fails
+        self.next_value = first
+        self.released = False
+
+    def isOpened(self):
+        return not self.released
+
+    def read(self, image=None):
+        if self.frames is not None and self.frames <= 0:
+            return False, None
+        if self.frames is not None:
+            self.frames -= 1
+        if image is None or image.shape != SHAPE:
+            image = np.empty(SHAPE, dtype=np.uint8)
+        # Decode in two halves, a reader on the same buffer would see a torn frame
+        half = SHAPE[0] // 2
+        image[:half] = self.next_value % 256
+        time.sleep(0.0005)
+        image[half:] = self.next_value % 256
+        self.next_value += 1
+        return True, image
+
+    def release(self):
+        self.released = True
+
+
+class FakeGrabber(FrameGrabber):
+    """FrameGrabber opening the given fake captures in order"""
+
+    def __init__(self, captures, **kwargs):
+        super().__init__("fake://camera", 0, **kwargs)
+        self.captures = list(captures)
+        self.opened = []
+
+    def open_capture(self):
+        cap = self.captures.pop(0)
+        self.opened.append(cap)
+        return cap
+
+
+class RecordingBackoff(Backoff):
+    def __init__(self, *args):
+        super().__init__(*args)
+        self.delays = []
+
+    def next_delay(self):
+        delay = super().next_delay()
+        self.delays.append(delay)
+        return delay
+
+
+def frame_of(value):
+    return np.full(SHAPE, value, dtype=np.uint8)
+
+
+def wait_until(condition, seconds=5.0):
+    deadline = time.monotonic() + seconds
+    while not condition() and time.monotonic() < deadline:
+        time.sleep(0.005)
+    return condition()
+
+
+def test_latest_frame_wins():
+    """The reader gets the newest frame, unread ones are counted as dropped"""
+    ring = FrameRing()
+    for value in (1, 2, 3):
+        ring.publish(frame_of(value))
+    frame, sequence = ring.latest(timeout=0.0)
+    assert sequence == 3 and frame[0, 0, 0] == 3
+    assert ring.stats() == {'published': 3, 'dropped': 2, 'processed': 1}
+
+    # Nothing new: the reader times out instead of getting the same frame twice
+    frame, sequence = ring.latest(timeout=0.01)
+    assert frame is None and sequence == 3
+
+    ring.publish(frame_of(4))
+    assert ring.latest(timeout=0.0)[0][0, 0, 0] == 4
+    assert ring.stats() == {'published': 4, 'dropped': 2, 'processed': 2}
+
+    ring.close()
+    start = time.monotonic()
+    assert ring.latest(timeout=5.0) == (None, 4)  # A closed ring never blocks the reader
+    assert time.monotonic() - start < 1.0
+
+
+def test_reader_slot_never_written():
+    """The writer's slot is never the frame the reader holds, while the reader is slow or fast"""
+    ring = FrameRing()
+    held = None
+    for step in range(60):
+        slot = ring.write_slot()
+        assert held is None or slot is not held
+        if slot is None:
+            slot = np.empty(SHAPE, dtype=np.uint8)
+        slot[:] = step
+        ring.publish(slot)
+        if step % 3 == 0:  # The reader takes every third frame only
+            held, _ = ring.latest(timeout=0.0)
+            assert held[0, 0, 0] == step
+        assert held is None or held.min() == held.max()  # Untouched by the writes since
+
+    # The three buffers rotate, no frame is copied or allocated once they exist
+    assert len({id(slot) for slot in ring.slots}) == FrameRing.SLOTS
+
+
+def test_grabber_frames_never_torn():
+    """Frames taken while the grabber keeps decoding are whole and counted as published"""
+    grabber = FakeGrabber([FakeCapture()])
+    grabber.start()
+    try:
+        taken = 0
+        while taken < 50:
+            frame, _ = grabber.ring.latest(timeout=2.0)
+            assert frame is not None
+            assert frame.min() == frame.max()  # Never the slot being decoded into
+            taken += 1
+            time.sleep(0.002)  # Slower than the decoder, frames are dropped
+    finally:
+        grabber.stop()
+        grabber.join(timeout=2)
+    stats = grabber.ring.stats()
+    assert stats['processed'] == taken and stats['dropped'] > 0
+    assert stats['published'] == stats['dropped'] + stats['processed'] + grabber.ring.fresh
+
+
+def test_reconnect_with_backoff():
+    """A failing stream is reopened after growing delays, which reset once frames flow again"""
+    captures = [FakeCapture(frames=2), FakeCapture(frames=0), FakeCapture(frames=0), FakeCapture(first=100)]
+    backoff = RecordingBackoff(0.01, 0.04)
+    grabber = FakeGrabber(captures, backoff=backoff)
+    grabber.start()
+    try:
+        assert wait_until(lambda: grabber.ring.sequence >= 10)
+    finally:
+        grabber.stop()
+        grabber.join(timeout=2)
+    assert not grabber.is_alive()
+    assert backoff.delays == [0.01, 0.02, 0.04]
+    assert grabber.reconnects == 3 and backoff.failures == 0
+    assert all(cap.released for cap in grabber.opened)
+    frame, _ = grabber.ring.latest(timeout=0.0)
+    assert frame is None or frame[0, 0, 0] >= 100  # Frames after the reconnect come from the new capture
+
+
+def test_stop_cuts_reconnect_wait():
+    """stop() during a long reconnect delay ends the grabber right away"""
+    grabber = FakeGrabber([FakeCapture(frames=0)], backoff=Backoff(30.0, 30.0))
+    grabber.start()
+    time.sleep(0.05)
+    start = time.monotonic()
+    grabber.stop()
+    grabber.join(timeout=2)
+    assert not grabber.is_alive() and time.monotonic() - start < 1.0
+    assert grabber.reconnects == 0 and grabber.ring.closed
+
+
+def main():
+    """Main function"""
+    test_latest_frame_wins()
+    test_reader_slot_never_written()
+    test_grabber_frames_never_torn()
+    test_reconnect_with_backoff()
+    test_stop_cuts_reconnect_wait()
+    print("✅ Frame grabber tests passed")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,74 @@
+#!/usr/bin/env python3
+"""
+Test script for the golden score regression harness (synthetic clip, no camera or MQTT broker)
+"""
+
+import sys
+import os
+import json
+import tempfile
+
+import cv2
+
+# Add scripts_helper directory to path for imports
+sys.path.append(os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "scripts_helper"))
+
+import golden_scores
+import replay_benchmark
+
+
+def write_synthetic_clip(path, frames=100, size=(480, 360)):
+    writer = cv2.VideoWriter(path, cv2.VideoWriter_fourcc(*'mp4v'), replay_benchmark.SYNTHETIC_FPS, size)
+    for frame in replay_benchmark.synthetic_frames(frames, size=size):
+        writer.write(frame)
+    writer.release()
+
+
+def test_compare_timelines():
+    """Identical timelines have no drift, a changed score or a missing entry is reported"""
+    golden = {'settings': {'scale': 1.0}, 'frames': 10,
+              'scores': [[0.4, 10], [0.8, 20]], 'colors': [[0.0, []], [0.04, ['blue']]]}
+    assert golden_scores.compare_timelines(golden, json.loads(json.dumps(golden))) == []
+
+    changed = json.loads(json.dumps(golden))
+    changed['scores'][1] = [0.8, 30]
+    assert "scores differ at entry 1" in golden_scores.compare_timelines(golden, changed)[0]
+
+    shorter = json.loads(json.dumps(golden))
+    shorter['colors'].pop()
+    assert "colors: golden has 2 entries, current 1" in golden_scores.compare_timelines(golden, shorter)[0]
+
+
+def test_record_then_check():
+    """A recorded golden file matches a parallel re-run and fails once it is tampered with"""
+    with tempfile.TemporaryDirectory() as tmp:
+        write_synthetic_clip(os.path.join(tmp, "synthetic.mp4"))
+        manifest = os.path.join(tmp, "manifest.json")
+        with open(manifest, 'w') as f:
+            json.dump({'clips': [{'name': 'a', 'path': 'synthetic.mp4'},
+                                 {'name': 'b', 'path': 'synthetic.mp4', 'camera': 1}]}, f)
+        settings, clips = golden_scores.load_manifest(manifest)
+        golden_dir = os.path.join(tmp, golden_scores.GOLDEN_DIR)
+
+        assert golden_scores.record(clips, settings, golden_dir) == 0
+        with open(os.path.join(golden_dir, "a.json")) as f:
+            golden = json.load(f)
+        assert golden['scores'] and golden['colors'][-1][1]
+        assert golden_scores.check(clips, settings, golden_dir, workers=2) == 0
+
+        golden['scores'][0][1] += 10
+        with open(os.path.join(golden_dir, "a.json"), 'w') as f:
+            json.dump(golden, f)
+        assert golden_scores.check(clips, settings, golden_dir) == 1
+
+
+def main():
+    """Main function"""
+    test_compare_timelines()
+    test_record_then_check()
+    print("✅ Golden score tests passed")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,108 @@
+#!/usr/bin/env python3
+"""
+Test script for the stream health state machine (fake clock, synthetic and unreachable streams)
+"""
+
+import sys
+import os
+import time
+
+import numpy as np
+
+# Add scripts_helper directory to path for imports
+sys.path.append(os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "scripts_helper"))
+
+from detection.capture import Backoff, CaptureConfig
+from detection.color_table import ColorTable
+from detection.frame_grabber import FrameGrabber
+from detection.health import CONNECTING, DEGRADED, OFFLINE, STREAMING, StreamHealth, frame_signature
+from detection.synthetic import SceneConfig, SyntheticScene, register_scene
+
+TEST_TABLE = ColorTable({'blue': {'hsv': ((104, 155, 146), (119, 255, 255))}})
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_state_machine():
+    """Frames, failures, stale frames and the watchdog drive the documented transitions"""
+    clock = FakeClock()
+    changes = []
+    health = StreamHealth(0, stall_seconds=3.0, offline_failures=3,
+                          on_change=lambda h: changes.append(h.state), clock=clock)
+    assert health.state == CONNECTING
+
+    frame = np.zeros((120, 160, 3), dtype=np.uint8)
+    assert not health.frame(frame_signature(frame))
+    assert health.state == STREAMING
+
+    # The same frame over and over: stalled after stall_seconds
+    clock.now = 1.0
+    assert not health.frame(frame_signature(frame))
+    clock.now = 4.5
+    assert health.frame(frame_signature(frame))
+    assert health.state == DEGRADED
+
+    frame[0, 0] = 1
+    assert not health.frame(frame_signature(frame))
+    assert health.state == STREAMING
+
+    # No frames at all: the watchdog degrades, failed reconnects end offline
+    clock.now = 8.0
+    health.check()
+    assert health.state == DEGRADED
+    for _ in range(3):
+        health.failure()
+    assert health.state == OFFLINE
+    assert health.snapshot()['last_frame_age'] == 3.5
+
+    frame[0, 0] = 2
+    health.frame(frame_signature(frame))
+    assert changes == [STREAMING, DEGRADED, STREAMING, DEGRADED, OFFLINE, STREAMING]
+
+
+def test_unreachable_stream_goes_offline():
+    """A camera that never answers ends offline and is retried with backoff, not in a tight loop"""
+    health = StreamHealth(0, offline_failures=3)
+    config = CaptureConfig(backend="ffmpeg", open_timeout=1.0)
+    grabber = FrameGrabber("rtsp://127.0.0.1:1", 0, capture_config=config, backoff=Backoff(0.05, 0.4),
+                           health=health)
+    grabber.start()
+    time.sleep(1.0)
+    grabber.stop()
+    grabber.join(timeout=2)
+    assert health.state == OFFLINE
+    assert health.reconnects <= 5, health.reconnects
+
+
+def test_frozen_stream_is_reconnected():
+    """A source repeating the same frame is degraded and reopened"""
+    scene = SyntheticScene(SceneConfig(width=160, height=120, fps=50, speed=0.0, noise=0, lighting=0.0),
+                           TEST_TABLE)
+    states = []
+    health = StreamHealth(0, stall_seconds=0.3, on_change=lambda h: states.append(h.state))
+    grabber = FrameGrabber(register_scene("frozen", scene), 0, backoff=Backoff(0.05, 0.05), health=health)
+    grabber.start()
+    time.sleep(1.0)
+    grabber.stop()
+    grabber.join(timeout=2)
+    assert states[:2] == [STREAMING, DEGRADED]
+    assert health.reconnects >= 1
+
+
+def main():
+    """Main function"""
+    test_state_machine()
+    test_unreachable_stream_goes_offline()
+    test_frozen_stream_is_reconnected()
+    print("✅ Stream health tests passed")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,118 @@
+#!/usr/bin/env python3
+"""
+Test script for the indexed all_detection_limits.txt reader (detection/limits_file.py)
+"""
+
+import sys
+import os
+import tempfile
+
+# Add scripts_helper directory to path for imports
+sys.path.append(os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "scripts_helper"))
+
+from detection.limits_file import LimitsIndex, latest_ranges
+
+
+def session(color, h=(149, 170), l=(15, 100), a=(26, 61), lab_lines=True):
+    """One session as the calibration tools append it (A and B around 0, L in percent)"""
+    lab = f"""LAB LIMITS:
+L Lower: {l[0]}, L Upper: {l[1]}
+A Lower: {a[0]}, A Upper: {a[1]}
+B Lower: -19, B Upper: 5
+""" if lab_lines else ""
+    return f"""
+========================================
+DETECTION SESSION: 2025-09-18 16:38:14
+Detection Method: Hybrid HSV+LAB
+Total Sticks Detected: 1
+========================================
+
+HSV LIMITS:
+H Lower: {h[0]}, H Upper: {h[1]}
+S Lower: 30, S Upper: 185
+V Lower: 115, V Upper: 255
+
+{lab}
+DETECTION RESULTS:
+{color}
+
+========================================
+
+"""
+
+
+def write(path, *sessions, mode="a"):
+    with open(path, mode) as file:
+        file.write("".join(sessions))
+
+
+def temporary_file():
+    return os.path.join(tempfile.mkdtemp(), "all_detection_limits.txt")
+
+
+def test_latest_per_color():
+    """The newest session of each color wins, sessions without a color are skipped"""
+    path = temporary_file()
+    write(path, session("Pink: 1", h=(140, 160)), session("Light Green: 2"), session("No sticks detected"),
+          session("Pink: 1", h=(149, 170)))
+    ranges = LimitsIndex(path).latest_ranges()
+    assert list(ranges) == ["pink", "light_green"]
+    assert ranges["pink"] == {'hsv': ((149, 30, 115), (170, 185, 255)),
+                              'lab': ((38, 153, 108), (254, 188, 132))}  # int(100 * 2.55) as before
+    assert ranges["light_green"]['hsv'][0][0] == 149
+
+
+def test_cached_and_incremental():
+    """An unchanged file is not read again, appended sessions are read from the previous end"""
+    path = temporary_file()
+    write(path, *[session(f"Color {index}: 1") for index in range(200)])
+    index = LimitsIndex(path)
+    assert len(index.latest_ranges()) == 200
+    scanned, parsed = index.scanned_bytes, index.parsed_sessions
+    index.latest_ranges()["color_0"]['hsv'] = None  # Callers get their own dicts
+    assert index.latest_ranges()["color_0"]['hsv'] is not None
+    assert (index.scanned_bytes, index.parsed_sessions) == (scanned, parsed)
+
+    write(path, session("Color 7: 1", h=(10, 20)))
+    ranges = index.latest_ranges()
+    assert ranges["color_7"]['hsv'] == ((10, 30, 115), (20, 185, 255))
+    assert index.scanned_bytes - scanned < 3 * len(session("Color 7: 1"))  # Last two sessions only
+    assert len(index.offsets) == 201
+
+
+def test_incomplete_session_falls_back():
+    """A session missing a limit line does not replace the color's older complete one"""
+    path = temporary_file()
+    write(path, session("Pink: 1", h=(140, 160)), session("Pink: 1", lab_lines=False))
+    assert LimitsIndex(path).latest_ranges()["pink"]['hsv'][0][0] == 140
+
+
+def test_rewritten_file_reindexed():
+    """A truncated or replaced file is indexed again from the start"""
+    path = temporary_file()
+    write(path, session("Pink: 1"), session("Blue: 1"))
+    index = LimitsIndex(path)
+    assert sorted(index.latest_ranges()) == ["blue", "pink"]
+    write(path, session("Yellow: 1"), mode="w")
+    assert list(index.latest_ranges()) == ["yellow"]
+    assert list(latest_ranges(path)) == ["yellow"]
+    os.remove(path)
+    try:
+        latest_ranges(path)
+    except FileNotFoundError:
+        return
+    raise AssertionError("missing file was read")
+
+
+def main():
+    """Main function"""
+    test_latest_per_color()
+    test_cached_and_incremental()
+    test_incomplete_session_falls_back()
+    test_rewritten_file_reindexed()
+    print("✅ Limits file reader tests passed")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
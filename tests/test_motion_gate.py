@@ -0,0 +1,72 @@
+#!/usr/bin/env python3
+"""
+Test script for the motion gate in front of color detection
+"""
+
+import sys
+import os
+
+import numpy as np
+
+# Add scripts_helper directory to path for imports
+sys.path.append(os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "scripts_helper"))
+
+from detection.motion_gate import MotionGate, merge_detections
+
+
+def noisy_frame(seed, shape=(320, 240, 3)):
+    """Dark background with a few levels of sensor noise"""
+    rng = np.random.default_rng(seed)
+    return (40 + rng.integers(0, 8, shape)).astype(np.uint8)
+
+
+def test_noise_only_reuses_previous_results():
+    gate = MotionGate(grid=(8, 8))
+    assert gate.check(noisy_frame(0)) == (0, 0, 240, 320)  # No reference yet
+    for seed in range(1, 6):
+        assert gate.check(noisy_frame(seed)) is None
+    assert gate.stats()['gate_hit_rate'] == 5 / 6
+
+
+def test_local_change_gives_partial_region():
+    gate = MotionGate(grid=(8, 8))
+    gate.check(noisy_frame(0))
+    frame = noisy_frame(1)
+    frame[20:60, 20:40] = (0, 220, 255)  # A stick appears in the top-left corner
+    x_start, y_start, x_end, y_end = gate.check(frame)
+    assert (x_start, y_start) == (0, 0)
+    assert 40 <= x_end < 240 and 60 <= y_end < 320
+
+
+def test_region_grows_over_touching_objects():
+    gate = MotionGate(grid=(8, 8))
+    gate.check(noisy_frame(0))
+    frame = noisy_frame(1)
+    frame[20:60, 20:40] = (0, 220, 255)
+    x_start, y_start, x_end, y_end = gate.check(frame, previous_boxes=[(50, 50, 20, 200)])
+    assert y_end >= 250  # The previous object is fully inside the region
+
+
+def test_merge_keeps_objects_outside_region():
+    previous = [('blue', [(10, 10, 20, 20, 400), (150, 150, 20, 20, 400)]), ('yellow', [])]
+    fresh = [('blue', []), ('yellow', [(5, 5, 10, 10, 100)])]
+    merged = merge_detections(previous, fresh, (0, 0, 100, 100))
+    assert merged == [('blue', [(150, 150, 20, 20, 400)]), ('yellow', [(5, 5, 10, 10, 100)])]
+
+    # Region given in half-resolution analysis pixels, boxes in crop pixels
+    merged = merge_detections(previous, fresh, (50, 50, 100, 100), scale=0.5)
+    assert merged == [('blue', [(10, 10, 20, 20, 400)]), ('yellow', [(105, 105, 10, 10, 100)])]
+
+
+def main():
+    """Main function"""
+    test_noise_only_reuses_previous_results()
+    test_local_change_gives_partial_region()
+    test_region_grows_over_touching_objects()
+    test_merge_keeps_objects_outside_region()
+    print("✅ Motion gate tests passed")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,58 @@
+#!/usr/bin/env python3
+"""
+Test script for the selectable denoise prefilters
+"""
+
+import sys
+import os
+
+import cv2
+import numpy as np
+
+# Add scripts_helper directory to path for imports
+sys.path.append(os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "scripts_helper"))
+
+from detection.prefilter import PREFILTERS, get_prefilter
+
+
+def random_frame(seed=0, shape=(121, 161, 3)):
+    rng = np.random.default_rng(seed)
+    return rng.integers(0, 256, shape, dtype=np.uint8)
+
+
+def test_prefilters_keep_frame_shape():
+    """Every filter (including the half-resolution ones) returns the input shape, odd sizes too"""
+    frame = random_frame()
+    for name in PREFILTERS:
+        filtered = get_prefilter(name)(frame)
+        assert filtered.shape == frame.shape, name
+        assert filtered.dtype == np.uint8, name
+
+
+def test_bilateral_is_original_pipeline():
+    """The baseline must stay bit-identical to the filter the colors were calibrated with"""
+    frame = random_frame(1)
+    expected = cv2.bilateralFilter(frame, d=9, sigmaColor=75, sigmaSpace=75)
+    assert np.array_equal(get_prefilter("bilateral")(frame), expected)
+    assert get_prefilter("none")(frame) is frame
+
+
+def test_unknown_prefilter_rejected():
+    try:
+        get_prefilter("sharpen")
+    except ValueError:
+        return
+    raise AssertionError("unknown prefilter name was accepted")
+
+
+def main():
+    """Main function"""
+    test_prefilters_keep_frame_shape()
+    test_bilateral_is_original_pipeline()
+    test_unknown_prefilter_rejected()
+    print("✅ Prefilter tests passed")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,78 @@
+#!/usr/bin/env python3
+"""
+Test script for the multiprocessing detection backend (detection/process_backend.py)
+"""
+
+import sys
+import os
+import time
+
+import numpy as np
+
+# Add scripts_helper directory to path for imports
+sys.path.append(os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "scripts_helper"))
+
+from detection.color_detector import find_color_detections
+from detection.process_backend import ProcessDetector
+from detection.synthetic import SceneConfig, SyntheticScene
+from pyCatch1_2025 import calibrated_colors, color_table
+
+SIZE = (320, 240)
+
+
+def scene_frames():
+    """Two different crops with sticks of several colors"""
+    return [SyntheticScene(SceneConfig(width=SIZE[0], height=SIZE[1], sticks=4, speed=0.0, seed=seed),
+                           color_table).render(0) for seed in (0, 1)]
+
+
+def colors(results):
+    return [(name, len(objects)) for name, objects in results]
+
+
+def test_worker_matches_inline_detection():
+    """The worker process finds the same objects as detecting in the calling thread"""
+    first, second = scene_frames()
+    detector = ProcessDetector(0, first.shape, calibrated_colors, timeout=30.0)
+    try:
+        for frame in (first, second):
+            expected = find_color_detections(frame, color_table)
+            assert colors(detector.detect(frame)) == colors(expected)
+            assert any(objects for _, objects in expected)
+    finally:
+        detector.close()
+
+
+def test_timed_out_frame_not_overwritten():
+    """While the worker is still on a timed-out frame its shared slot is left alone"""
+    first, second = scene_frames()
+    detector = ProcessDetector(0, first.shape, calibrated_colors, timeout=0.001)
+    try:
+        # The worker is still starting up, it cannot answer within a millisecond
+        assert detector.detect(first) is None
+        assert detector.detect(second) is None
+        assert detector.skipped == 1
+        assert np.array_equal(detector.frame, first)
+
+        # Once the late answer is in, the slot is reused for the next frame
+        deadline = time.monotonic() + 30.0
+        while detector.pending is not None and time.monotonic() < deadline:
+            detector.wait_result(0.5)
+        assert detector.pending is None
+        detector.timeout = 30.0
+        assert colors(detector.detect(second)) == colors(find_color_detections(second, color_table))
+        assert np.array_equal(detector.frame, second)
+    finally:
+        detector.close()
+
+
+def main():
+    """Main function"""
+    test_worker_matches_inline_detection()
+    test_timed_out_frame_not_overwritten()
+    print("✅ Process backend tests passed")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,93 @@
+#!/usr/bin/env python3
+"""
+Test script for publish-on-change score messages (detection/publisher.py)
+"""
+
+import sys
+import os
+import json
+
+# Add scripts_helper directory to path for imports
+sys.path.append(os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "scripts_helper"))
+
+import replay_benchmark
+from detection.publisher import ScorePublisher
+
+
+def make_publisher(coalesce_seconds=0.2):
+    sent = []
+    publisher = ScorePublisher(lambda score, colors, timestamp: sent.append((score, timestamp)), coalesce_seconds)
+    return publisher, sent
+
+
+def test_only_changes():
+    """Repeating the same score sends nothing"""
+    publisher, sent = make_publisher()
+    for step in range(10):
+        publisher.update(20, ["blue", "red"], step * 1.0)
+    assert sent == [(20, 0.0)]
+    assert publisher.stats()['scores_unchanged'] == 9
+
+
+def test_coalescing():
+    """A burst of changes goes out as the first one plus the newest at the end of the window"""
+    publisher, sent = make_publisher(0.2)
+    publisher.update(10, ["blue"], 1.00)
+    publisher.update(20, [], 1.04)
+    publisher.update(30, [], 1.08)
+    publisher.poll(1.12)
+    assert sent == [(10, 1.00)]
+    publisher.poll(1.20)
+    assert sent == [(10, 1.00), (30, 1.08)]
+    assert publisher.stats()['scores_coalesced'] == 1
+
+    # A change that is undone within the window is never sent
+    publisher.update(40, [], 1.25)
+    publisher.update(30, [], 1.30)
+    publisher.poll(2.0)
+    assert sent[-1] == (30, 1.08) and len(sent) == 2
+
+
+def test_flush_and_reset():
+    """flush() sends a held score at once, a new round announces its first score again"""
+    publisher, sent = make_publisher(0.2)
+    publisher.update(10, [], 0.0)
+    publisher.update(20, [], 0.1)
+    publisher.flush()
+    assert sent == [(10, 0.0), (20, 0.1)]
+    publisher.reset()
+    publisher.update(20, [], 5.0)
+    assert sent[-1] == (20, 5.0)
+
+
+def test_json_payload():
+    """With SCORE_PAYLOAD = "json" the camera sends the score, the color set and the media time"""
+    pipeline = replay_benchmark.pipeline
+    pipeline.DISPLAY_FRAMES = False
+    pipeline.REPORT_ROI_SAVINGS = False
+    pipeline.SCORE_PAYLOAD = "json"
+    try:
+        result = replay_benchmark.replay("synthetic", replay_benchmark.SYNTHETIC_FPS,
+                                         replay_benchmark.synthetic_frames(150, size=(480, 360)), None)
+    finally:
+        pipeline.SCORE_PAYLOAD = "int"
+    messages = [json.loads(payload) for _, payload in result['scores']]
+    assert messages
+    scores = [message['score'] for message in messages]
+    assert scores == sorted(set(scores)), "a score was sent twice"
+    last = messages[-1]
+    assert last['score'] == 10 * len(last['colors']) and 'media_time' in last and 'sent_time' in last
+
+
+def main():
+    """Main function"""
+    test_only_changes()
+    test_coalescing()
+    test_flush_and_reset()
+    test_json_payload()
+    print("✅ Score publisher tests passed")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,95 @@
+#!/usr/bin/env python3
+"""
+Test script for the adaptive detection scheduler
+"""
+
+import sys
+import os
+import tempfile
+import time
+
+import cv2
+import numpy as np
+
+# Add scripts_helper directory to path for imports
+sys.path.append(os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "scripts_helper"))
+
+import replay_benchmark
+from detection.scheduler import AdaptiveScheduler
+
+FRAME_INTERVAL = 1.0 / 25  # Camera frame rate
+
+
+def static_run(scheduler, frame, start, frames):
+    """Feed the same frame at 25 fps, return the timestamps that were detected"""
+    detected = []
+    for i in range(frames):
+        timestamp = start + i * FRAME_INTERVAL
+        if scheduler.should_detect(frame, timestamp):
+            detected.append(timestamp)
+    return detected
+
+
+def test_static_scene_backs_off_to_min_rate():
+    """A static crop is detected less and less often, never slower than min_fps"""
+    scheduler = AdaptiveScheduler(target_fps=8, min_fps=4, max_fps=25)
+    frame = np.full((60, 80, 3), 40, dtype=np.uint8)
+    detected = static_run(scheduler, frame, 0.0, 100)
+    gaps = np.diff(detected)
+    assert gaps.max() <= 0.25 + FRAME_INTERVAL  # Rounded up to the next frame
+    assert len(detected) < 100 / 4
+    assert scheduler.detected + scheduler.skipped == 100
+
+
+def test_scene_change_detected_immediately():
+    """A changed crop is detected on the very next frame and the rate jumps to max_fps"""
+    scheduler = AdaptiveScheduler(target_fps=8, min_fps=4, max_fps=25)
+    frame = np.full((60, 80, 3), 40, dtype=np.uint8)
+    static_run(scheduler, frame, 0.0, 50)
+
+    changed = frame.copy()
+    changed[10:50, 20:40] = (255, 0, 0)  # A stick appears
+    assert scheduler.should_detect(changed, 50 * FRAME_INTERVAL)
+    assert abs(scheduler.stats()['fps'] - 25) < 1e-6
+
+
+def test_grabber_media_time():
+    """With the frame grabber, hit timing runs on the clip's own frame rate (25 fps, not 30)"""
+    pipeline = replay_benchmark.pipeline
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "clip.mp4")
+        writer = cv2.VideoWriter(path, cv2.VideoWriter_fourcc(*'mp4v'), 25, (160, 120))
+        for frame in replay_benchmark.synthetic_frames(10, size=(160, 120)):
+            writer.write(frame)
+        writer.release()
+
+        thread = pipeline.CameraThread(path, 0, (0, 0, 160, 120), replay_benchmark.RecordingClient())
+        timestamps = []
+        thread.process_frame = lambda frame, timestamp: timestamps.append(timestamp)
+        thread.playback_speed_multiplier = 5.0
+        assert pipeline.USE_FRAME_GRABBER and thread.is_video_file
+        thread.start()
+        try:
+            deadline = time.monotonic() + 5.0
+            while len(timestamps) < 5 and time.monotonic() < deadline:
+                time.sleep(0.02)
+        finally:
+            thread.stop()
+            thread.join(timeout=2)
+    assert len(timestamps) >= 5
+    assert thread.fps == 25
+    assert all(abs(t * 25 - round(t * 25)) < 1e-6 for t in timestamps)  # sequence / 25
+    assert abs(thread.frame_timestamp(50) - 2.0) < 1e-9
+
+
+def main():
+    """Main function"""
+    test_static_scene_backs_off_to_min_rate()
+    test_scene_change_detected_immediately()
+    test_grabber_media_time()
+    print("✅ Scheduler tests passed")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
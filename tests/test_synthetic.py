@@ -0,0 +1,111 @@
+#!/usr/bin/env python3
+"""
+Test script for the synthetic scene generator and the synthetic camera load test
+"""
+
+import sys
+import os
+import time
+
+import cv2
+import numpy as np
+
+# Add scripts_helper directory to path for imports
+sys.path.append(os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "scripts_helper"))
+
+from detection.color_detector import standard_detections
+from detection.color_table import ColorTable
+from detection.frame_grabber import open_capture
+from detection.synthetic import SceneConfig, SyntheticScene, register_scene
+
+TEST_TABLE = ColorTable({
+    'blue': {'hsv': ((104, 155, 146), (119, 255, 255))},
+    'yellow': {'hsv': ((21, 81, 144), (42, 255, 255))},
+    'red': {'hsv': ((166, 166, 100), (179, 255, 255))},
+})
+
+
+def test_render_is_deterministic():
+    """The same config renders the same frames, sticks move between frames"""
+    config = SceneConfig(width=320, height=240, sticks=3, seed=4)
+    first = SyntheticScene(config, TEST_TABLE)
+    second = SyntheticScene(config, TEST_TABLE)
+    assert np.array_equal(first.render(10), second.render(10))
+    assert not np.array_equal(first.render(10), first.render(30))
+    assert first.render(0).shape == (240, 320, 3)
+
+
+def test_sticks_are_detected():
+    """Every stick is painted inside its color's range and found by the standard detector"""
+    config = SceneConfig(width=640, height=480, sticks=3, lighting=0.0, seed=1)
+    frame = SyntheticScene(config, TEST_TABLE).render(0)
+    results = standard_detections(cv2.cvtColor(frame, cv2.COLOR_BGR2HSV), TEST_TABLE)
+    assert [len(objects) for _, objects in results] == [1, 1, 1]
+
+
+def test_appear_interval():
+    """Sticks enter one at a time"""
+    config = SceneConfig(width=640, height=480, fps=25, sticks=3, lighting=0.0, noise=0, appear_interval=1.0)
+    scene = SyntheticScene(config, TEST_TABLE)
+    counts = []
+    for index in (0, 25, 50):
+        hsv = cv2.cvtColor(scene.render(index), cv2.COLOR_BGR2HSV)
+        counts.append(sum(len(objects) for _, objects in standard_detections(hsv, TEST_TABLE)))
+    assert counts == [1, 2, 3]
+
+
+def test_capture_paces_frames():
+    """A registered scene opens like a camera and serves frames at its frame rate"""
+    source = register_scene("test", SyntheticScene(SceneConfig(width=160, height=120, fps=50), TEST_TABLE))
+    cap = open_capture(source)
+    assert cap.isOpened() and cap.get(cv2.CAP_PROP_FPS) == 50
+    start = time.monotonic()
+    for _ in range(11):
+        ret, frame = cap.read()
+        assert ret and frame.shape == (120, 160, 3)
+    assert time.monotonic() - start >= 10 / 50 - 0.01
+    cap.release()
+
+    try:
+        open_capture("synthetic://missing")
+    except ValueError:
+        return
+    raise AssertionError("unknown synthetic scene was accepted")
+
+
+def test_load_run():
+    """One small synthetic camera runs through VideoCaptureManager and is counted"""
+    import load_test
+    load_test.pipeline.DISPLAY_FRAMES = False
+    load_test.pipeline.REPORT_ROI_SAVINGS = False
+    result = load_test.run_load(1, 320, 240, 1.0, fps=10.0)
+    camera = result['per_camera'][0]
+    assert camera['published'] > 0 and camera['processed'] > 0
+    assert 0.0 <= result['drop_rate'] <= 1.0
+    assert not any(load_test.pipeline.detected_colors)  # Nothing left over for the next round
+
+
+def test_new_round_starts_without_colors():
+    """start_detection drops the colors a camera kept from the previous round or replay"""
+    import load_test
+    pipeline = load_test.pipeline
+    thread = pipeline.CameraThread("synthetic", 3, (0, 0, 320, 240), load_test.CountingClient())
+    pipeline.detected_colors[3].update({"blue", "red"})
+    thread.start_detection()
+    assert pipeline.detected_colors[3] == set()
+
+
+def main():
+    """Main function"""
+    test_render_is_deterministic()
+    test_sticks_are_detected()
+    test_appear_interval()
+    test_capture_paces_frames()
+    test_load_run()
+    test_new_round_starts_without_colors()
+    print("✅ Synthetic scene tests passed")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
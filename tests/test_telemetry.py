@@ -0,0 +1,68 @@
+#!/usr/bin/env python3
+"""
+Test script for the rate-limited detection telemetry
+"""
+
+import sys
+import os
+
+# Add scripts_helper directory to path for imports
+sys.path.append(os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "scripts_helper"))
+
+from detection.telemetry import DetectionTelemetry
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+RESULTS = [('blue', [(0, 0, 40, 200, 8000.0), (60, 0, 40, 200, 6000.0)]), ('red', []), ('green', [(0, 0, 10, 10, 1200.0)])]
+
+
+def test_counts_without_output_until_flush():
+    """Passes are only counted in memory, one summary line is printed per flush interval"""
+    clock, lines = FakeClock(), []
+    telemetry = DetectionTelemetry(0, flush_interval=10.0, clock=clock, output=lines.append)
+    for i in range(100):
+        clock.now = i * 0.04
+        telemetry.record(RESULTS)
+    assert lines == []
+
+    snapshot = telemetry.snapshot()
+    assert snapshot['passes'] == 100 and snapshot['objects'] == 300
+    assert snapshot['color_hits'] == {'blue': 100, 'green': 100}
+    assert snapshot['area_histogram']['<10k'] == 200 and snapshot['area_histogram']['<2.5k'] == 100
+    assert snapshot['objects_per_pass']['3'] == 100
+
+    clock.now = 10.0
+    telemetry.record(RESULTS)
+    assert len(lines) == 1 and "101 passes" in lines[0]
+    assert telemetry.passes == 0  # New window after the flush
+
+
+def test_debug_events_are_sampled():
+    """Debug mode prints at most the configured number of detections per second"""
+    clock, lines = FakeClock(), []
+    telemetry = DetectionTelemetry(1, flush_interval=60.0, debug_events_per_second=5, clock=clock, output=lines.append)
+    for i in range(50):  # Two seconds at 25 passes per second, 3 objects each
+        clock.now = i * 0.04
+        telemetry.record(RESULTS)
+    assert len(lines) == 10
+    assert all(line.startswith("Camera 1 - Color:") for line in lines)
+    assert telemetry.sampler.suppressed == 150 - 10
+
+
+def main():
+    """Main function"""
+    test_counts_without_output_until_flush()
+    test_debug_events_are_sampled()
+    print("✅ Telemetry tests passed")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,84 @@
+#!/usr/bin/env python3
+"""
+Test script for the temporal presence filter (detection/temporal.py)
+"""
+
+import sys
+import os
+
+# Add scripts_helper directory to path for imports
+sys.path.append(os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "scripts_helper"))
+
+from detection.temporal import PresenceFilter
+
+COLORS = ("red", "blue", "green")
+
+
+def confirm_time(fps, confirm_seconds=0.4):
+    """Media time at which a continuously seen color is confirmed at a given pass rate"""
+    presence = PresenceFilter(COLORS, confirm_seconds)
+    for index in range(1000):
+        timestamp = index / fps
+        appeared, _ = presence.update({"red"}, timestamp, first_step=1.0 / fps)
+        if appeared:
+            assert appeared == {"red"}
+            return timestamp + 1.0 / fps  # The pass covers the interval ending at its timestamp
+    raise AssertionError("never confirmed")
+
+
+def test_rate_independent():
+    """The same sighting duration confirms a color at 25, 10 and 5 passes per second"""
+    for fps in (25, 10, 5):
+        assert abs(confirm_time(fps) - 0.4) < 1e-6, (fps, confirm_time(fps))
+    assert abs(confirm_time(25, confirm_seconds=1.0) - 1.0) < 1e-6
+
+
+def test_changes_only():
+    """Presence is reported once when it appears and once when it goes, not on every pass"""
+    presence = PresenceFilter(COLORS, 0.4)
+    changes = []
+    for index in range(100):
+        seen = {"blue"} if index < 50 else set()
+        appeared, disappeared = presence.update(seen, index / 25)
+        if appeared or disappeared:
+            changes.append((index, appeared, disappeared))
+    assert [(appeared, disappeared) for _, appeared, disappeared in changes] == [({"blue"}, set()), (set(), {"blue"})]
+    assert changes[0][0] == 9  # 10 frames at 25 fps
+
+
+def test_flicker_and_noise():
+    """A stick missed every third frame is still confirmed, a one-frame blip never is"""
+    presence = PresenceFilter(COLORS, 0.4)
+    confirmed = set()
+    for index in range(50):
+        seen = {"green"} if index % 3 else set()
+        if index == 10:
+            seen.add("red")
+        confirmed |= presence.update(seen, index / 25)[0]
+    assert confirmed == {"green"}
+
+
+def test_gap_and_reset():
+    """A long gap credits at most max_step, reset forgets everything"""
+    presence = PresenceFilter(COLORS, 0.4, max_step=0.2)
+    presence.update({"red"}, 0.0)
+    appeared, _ = presence.update({"red"}, 5.0)
+    assert not appeared
+    presence.update({"red"}, 5.2)
+    assert presence.present == {"red"}
+    presence.reset()
+    assert presence.present == set() and presence.levels["red"] == 0.0
+
+
+def main():
+    """Main function"""
+    test_rate_independent()
+    test_changes_only()
+    test_flicker_and_noise()
+    test_gap_and_reset()
+    print("✅ Presence filter tests passed")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())